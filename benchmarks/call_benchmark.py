@@ -0,0 +1,59 @@
+"""
+Per-call overhead of executing the same call many times, as the loop of a
+script or a cached command line does.
+
+    echo x
+
+"compiled" runs the call through Call.eval, which reuses the compiled
+call; "resolved" resolves the plan of the call and the application on
+every execution, as Call.eval did before calls were compiled.
+
+    python benchmarks/call_benchmark.py [executions]
+"""
+import os
+import sys
+import time
+from collections import deque
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+    )
+
+from applications import execute_application  # noqa: E402
+from call_evaluator import command_substitution  # noqa: E402
+from commands import Call, Invocation  # noqa: E402
+
+EXECUTIONS = 100_000
+COMMAND = "echo x"
+
+
+def compiled(call, out):
+    call.eval(out)
+
+
+def resolved(call, out):
+    application, args, file_output = call.plan.resolve(command_substitution)
+    execute_application(
+        Invocation(call.raw_command, application, args, file_output),
+        out,
+        False,
+        )
+
+
+def report(name, execute, executions):
+    call = Call(COMMAND)
+    out = deque(maxlen=1)
+    execute(call, out)
+    start = time.perf_counter()
+    for _ in range(executions):
+        execute(call, out)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<9} {elapsed:6.3f} s, "
+          f"{elapsed / executions * 1e6:5.2f} us/call, output {out[0]!r}")
+
+
+if __name__ == "__main__":
+    executions = int(sys.argv[1]) if len(sys.argv) > 1 else EXECUTIONS
+    print(f"{executions} executions of {COMMAND}")
+    report("compiled", compiled, executions)
+    report("resolved", resolved, executions)
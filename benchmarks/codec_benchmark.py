@@ -0,0 +1,70 @@
+"""
+The cost of decoding and encoding text in throughput-bound pipes, written
+to stdout (here /dev/null) by the shell's Output:
+
+    cat big.txt | cat | cat
+    cat big.txt | grep INFO | uniq
+    cat big.txt | sort
+
+The calls of a pipe pass bytes, which are decoded only by the
+applications which need text, and written to stdout as they are. They
+are compared with decoding the file as it is read and encoding it again,
+the codec work of every byte read when pipes passed text.
+
+    python benchmarks/codec_benchmark.py [lines]
+"""
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+    )
+
+from application_interface import decode, encode  # noqa: E402
+from commands import Call  # noqa: E402
+from executors import sequential  # noqa: E402
+from output import Output  # noqa: E402
+
+LINES = 1_000_000
+LINE = "{level} request {i:09} served in {ms:2} ms, café\n"
+PIPES = [
+    ["cat {file}", "cat", "cat"],
+    ["cat {file}", "grep INFO", "uniq"],
+    ["cat {file}", "sort"],
+]
+
+
+def write_file(file_name, lines):
+    with open(file_name, "w") as f:
+        for i in range(lines):
+            level = "ERROR" if i % 100 == 0 else "INFO "
+            f.write(LINE.format(level=level, i=i, ms=i % 97))
+
+
+def text(calls):
+    """the calls, the output of the first decoded and encoded again"""
+    stream = map(encode, map(decode, calls[0].stream()))
+    return sequential(calls[1:], stream)
+
+
+def report(name, executor, file_name, pipe):
+    calls = [Call(call.format(file=file_name)) for call in pipe]
+    with open(os.devnull, "w") as stdout:
+        start = time.perf_counter()
+        Output(stdout).write_stream(executor(calls))
+        seconds = time.perf_counter() - start
+    cmdline = " | ".join(pipe).format(file="big.txt")
+    print(f"{name:<6} {seconds:8.2f} s  {cmdline}")
+
+
+if __name__ == "__main__":
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else LINES
+    with tempfile.TemporaryDirectory() as directory:
+        file_name = os.path.join(directory, "big.txt")
+        write_file(file_name, lines)
+        print(f"{lines} lines")
+        for pipe in PIPES:
+            report("bytes", sequential, file_name, pipe)
+            report("text", text, file_name, pipe)
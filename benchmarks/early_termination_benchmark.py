@@ -0,0 +1,53 @@
+"""
+Latency of a pipe which needs only the start of a large file, with every
+pipe executor:
+
+    cat huge.log | grep ERROR | head -n 5
+
+head stops reading after five lines, which stops the calls before it, so
+the latency does not depend on the size of the file. The same pipe with
+tail, which reads the whole file, is timed for comparison.
+
+    python benchmarks/early_termination_benchmark.py [lines]
+"""
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+    )
+
+from commands import Call  # noqa: E402
+from executors import EXECUTORS  # noqa: E402
+
+LINES = 2_000_000
+
+
+def write_file(file_name, lines):
+    with open(file_name, "w") as f:
+        for i in range(lines):
+            level = "ERROR" if i % 100 == 0 else "INFO"
+            f.write(f"{level} request {i:09}\n")
+
+
+def report(name, file_name, last):
+    calls = [
+        Call(f"cat {file_name}"), Call("grep ERROR"), Call(f"{last} -n 5")
+    ]
+    start = time.perf_counter()
+    b"".join(map(bytes, EXECUTORS[name](calls)))
+    seconds = time.perf_counter() - start
+    print(f"{name:<10} {last:<4} {seconds * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else LINES
+    with tempfile.TemporaryDirectory() as directory:
+        file_name = os.path.join(directory, "huge.log")
+        write_file(file_name, lines)
+        print(f"{lines} lines, {os.path.getsize(file_name) >> 20} MiB")
+        for name in EXECUTORS:
+            for last in ["head", "tail"]:
+                report(name, file_name, last)
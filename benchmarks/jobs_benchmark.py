@@ -0,0 +1,66 @@
+"""
+Time taken by several long commands run one after the other, and run as
+background jobs which are then waited for.
+
+    find DIR -name '*.log' > found_1.txt; sort big.txt | uniq > sorted_1.txt
+    ...
+
+    find DIR -name '*.log' > found_1.txt & sort big.txt | uniq > ... & wait
+
+The jobs run in threads, so pure Python work still takes turns on the
+interpreter lock, while reading files and the worker processes of pipes
+(PYSHELL_PIPE_EXECUTOR=processes) overlap.
+
+    python benchmarks/jobs_benchmark.py [jobs]
+"""
+import os
+import sys
+import time
+import tempfile
+from collections import deque
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+    )
+
+from command_evaluator import compile_command_line  # noqa: E402
+from settings import JOB_WORKERS, PIPE_EXECUTOR  # noqa: E402
+
+JOBS = 4
+LINES = 200_000
+FILES = 2_000
+
+
+def write_files(directory):
+    with open(os.path.join(directory, "big.txt"), "w") as f:
+        for i in range(LINES):
+            f.write(f"INFO request {i * 7919 % LINES:09} served\n")
+    for i in range(FILES):
+        subdirectory = os.path.join(directory, "tree", str(i % 50))
+        os.makedirs(subdirectory, exist_ok=True)
+        open(os.path.join(subdirectory, f"{i}.log"), "w").close()
+
+
+def commands(directory, jobs):
+    for i in range(jobs):
+        if i % 2:
+            yield f"sort {directory}/big.txt | uniq > {directory}/sorted_{i}"
+        else:
+            yield (f"find {directory}/tree -name '*.log' > "
+                   f"{directory}/found_{i}")
+
+
+def report(name, cmdline):
+    start = time.perf_counter()
+    compile_command_line(cmdline).eval(deque())
+    print(f"{name:<10} {time.perf_counter() - start:6.2f} s")
+
+
+if __name__ == "__main__":
+    jobs = int(sys.argv[1]) if len(sys.argv) > 1 else JOBS
+    print(f"{jobs} commands, {JOB_WORKERS} job workers, "
+          f"{PIPE_EXECUTOR} pipes")
+    with tempfile.TemporaryDirectory() as directory:
+        write_files(directory)
+        report("sequenced", "; ".join(commands(directory, jobs)))
+        report("jobs", " & ".join(commands(directory, jobs)) + " & wait")
@@ -0,0 +1,63 @@
+"""
+Throughput of a six-call text pipe whose calls work on lines:
+
+    cat big.txt | grep INFO | cut -b 1-32 | uniq | sort -r | head -n 100
+
+Calls which work on lines pass their output as Lines, lists of lines
+which the next call reads without splitting them. This is compared with
+joining the output of every call into bytes, which the next call splits
+into lines again.
+
+    python benchmarks/line_vector_benchmark.py [lines]
+"""
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+    )
+
+from commands import Call  # noqa: E402
+from executors import sequential  # noqa: E402
+
+LINES = 1_000_000
+LINE = "{level} request {i:09} served in {ms:2} ms\n"
+CALLS = [
+    "cat {file}", "grep INFO", "cut -b 1-32", "uniq", "sort -r", "head -n 100"
+]
+
+
+def write_file(file_name, lines):
+    with open(file_name, "w") as f:
+        for i in range(lines):
+            level = "ERROR" if i % 100 == 0 else "INFO "
+            f.write(LINE.format(level=level, i=i // 3, ms=i % 97))
+
+
+def joined(calls):
+    """the calls, the output of each joined into bytes"""
+    stream = None
+    for call in calls:
+        stream = map(bytes, call.stream(stream))
+    return stream
+
+
+def report(name, executor, file_name, lines):
+    calls = [Call(call.format(file=file_name)) for call in CALLS]
+    start = time.perf_counter()
+    size = sum(len(bytes(chunk)) for chunk in executor(calls))
+    seconds = time.perf_counter() - start
+    print(f"{name:<6} {seconds:8.2f} s {lines / seconds / 1e6:8.2f} M lines/s"
+          f" {size} bytes of output")
+
+
+if __name__ == "__main__":
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else LINES
+    with tempfile.TemporaryDirectory() as directory:
+        file_name = os.path.join(directory, "big.txt")
+        write_file(file_name, lines)
+        print(" | ".join(CALLS).format(file="big.txt"))
+        report("lines", sequential, file_name, lines)
+        report("bytes", joined, file_name, lines)
@@ -0,0 +1,43 @@
+"""
+Memory held by the commands of a large script, measured with tracemalloc.
+
+Every line of a generated script is parsed and the commands are kept, as
+they would be by the plan caches.
+
+    python benchmarks/memory_benchmark.py [lines]
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+    )
+
+from command_evaluator import parse  # noqa: E402
+
+LINES = 10_000
+TEMPLATES = [
+    "echo {i}",
+    "cat logs/app-{i}.log | grep ERROR | cut -b 1-20 > errors-{i}.txt",
+    "sort 'data/{i}.csv' | uniq | head -n 10",
+    "< in-{i}.txt tail -n 5; ls dir{i}; cat *.txt",
+    "echo \"`cat name-{i}.txt`\" | cut -b 1-3",
+]
+
+
+def script(lines):
+    return [
+        TEMPLATES[i % len(TEMPLATES)].format(i=i) for i in range(lines)
+    ]
+
+
+if __name__ == "__main__":
+    lines = script(int(sys.argv[1]) if len(sys.argv) > 1 else LINES)
+    parse("echo")  # load the parser outside of the measured region
+    tracemalloc.start()
+    commands = [parse(line) for line in lines]
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{len(lines)} lines: {size / 1024:.0f} KiB held, "
+          f"{size / len(lines):.0f} bytes/line, peak {peak / 1024:.0f} KiB")
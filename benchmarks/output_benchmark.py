@@ -0,0 +1,61 @@
+"""
+Time to write the output of a pipe of ten million lines:
+
+    cat big.txt | cat
+
+through the shell's Output, which encodes the output into large writes
+to the binary buffer of stdout, and with print() per chunk of output, as
+the shell did before. Output is written to os.devnull, which is not a
+terminal.
+
+    python benchmarks/output_benchmark.py [lines]
+"""
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+    )
+
+from commands import Call  # noqa: E402
+from executors import sequential  # noqa: E402
+from output import Output  # noqa: E402
+
+LINES = 10_000_000
+
+
+def write_file(file_name, lines):
+    with open(file_name, "w") as f:
+        for i in range(lines):
+            f.write(f"line {i:09} of the file\n")
+
+
+def sink(chunks, stdout):
+    Output(stdout).write_stream(chunks)
+
+
+def print_chunks(chunks, stdout):
+    for chunk in chunks:
+        print(chunk.decode(), end="", file=stdout)
+    stdout.flush()
+
+
+def report(name, write, file_name):
+    calls = [Call(f"cat {file_name}"), Call("cat")]
+    with open(os.devnull, "w") as stdout:
+        start = time.perf_counter()
+        write(sequential(calls), stdout)
+        seconds = time.perf_counter() - start
+    print(f"{name:<8} {seconds:8.2f} s")
+
+
+if __name__ == "__main__":
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else LINES
+    with tempfile.TemporaryDirectory() as directory:
+        file_name = os.path.join(directory, "big.txt")
+        write_file(file_name, lines)
+        print(f"{lines} lines")
+        report("sink", sink, file_name)
+        report("print", print_chunks, file_name)
@@ -0,0 +1,96 @@
+"""
+Parse throughput of a 50-stage pipeline.
+
+Compares the earlier two-stage paths, which parse the command line, rebuild
+the text of every call and parse each call again (first with Earley parsers
+built per call, then with shared LALR parsers), with the single pass parser
+which builds the Calls, Pipes and Seq while parsing. The grammars of the
+two-stage paths are kept in benchmarks/grammars.
+
+    python benchmarks/parser_benchmark.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+    )
+
+from lark import Lark, Token  # noqa: E402
+from parser import LALR_OPTIONS  # noqa: E402
+from command_evaluator import parse  # noqa: E402
+
+STAGES = 50
+PIPELINE = " | ".join(["cat 'file.txt' \"a`echo b`c\" > out"] * STAGES)
+TWO_STAGE_GRAMMARS = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "grammars"
+    )
+QUOTES = {"single_quoted": "'", "double_quoted": '"', "backquoted": "`"}
+
+
+def _grammar(name):
+    with open(os.path.join(TWO_STAGE_GRAMMARS, name)) as f:
+        return f.read()
+
+
+def _text(node):
+    """the text of a node of the command level parse tree"""
+    if isinstance(node, Token):
+        return str(node)
+    text = "".join(_text(child) for child in node.children)
+    quote = QUOTES.get(node.data, "")
+    return quote + text + quote
+
+
+def _two_stage(command_parser, call_parser):
+    tree = command_parser.parse(PIPELINE)
+    for call in tree.find_data("call"):
+        call_tree = call_parser.parse(_text(call).strip())
+        for argument in call_tree.find_data("argument"):
+            "".join(argument.scan_values(lambda token: True))
+
+
+def parse_with_earley_per_call():
+    def earley():
+        return (
+            Lark(_grammar("command_level_grammar.lark"), start="command"),
+            Lark(_grammar("call_level_grammar.lark"), start="call"),
+        )
+
+    command_parser, _ = earley()
+    tree = command_parser.parse(PIPELINE)
+    for call in tree.find_data("call"):
+        _, call_parser = earley()
+        call_parser.parse(_text(call).strip())
+
+
+SHARED_LALR = (
+    Lark(_grammar("command_level_grammar.lark"), start="command",
+         **LALR_OPTIONS),
+    Lark(_grammar("call_level_grammar.lark"), start="call", **LALR_OPTIONS),
+)
+
+
+def parse_with_shared_lalr():
+    _two_stage(*SHARED_LALR)
+
+
+def parse_in_single_pass():
+    parse(PIPELINE)
+
+
+def report(name, function, number):
+    seconds = timeit.timeit(function, number=number) / number
+    print(f"{name:<28} {seconds * 1000:10.3f} ms/line "
+          f"{1 / seconds:10.1f} lines/s")
+    return seconds
+
+
+if __name__ == "__main__":
+    print(f"{STAGES}-stage pipeline, {len(PIPELINE)} characters")
+    parse("")  # build the shared parser outside of the timed region
+    report("earley, parser per call", parse_with_earley_per_call, 3)
+    two_stage = report("two-stage shared lalr", parse_with_shared_lalr, 200)
+    single_pass = report("single pass", parse_in_single_pass, 200)
+    print(f"speedup over two-stage: {two_stage / single_pass:.1f}x")
@@ -0,0 +1,56 @@
+"""
+Throughput of a pipe over a large file with the sequential and threaded
+pipe executors:
+
+    cat big.txt | grep ERROR | cut -b 1-20
+
+The size of the generated file is given in MiB (256 by default, use e.g.
+4096 for a multi-GB file).
+
+    python benchmarks/pipe_executor_benchmark.py [MiB]
+"""
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+    )
+
+from commands import Call  # noqa: E402
+from executors import EXECUTORS  # noqa: E402
+
+MIB = 256
+LINE = "{level} request {i:09} served in {ms:2} ms\n"
+
+
+def write_file(file_name, mib):
+    size = mib * 1024 * 1024
+    with open(file_name, "w") as f:
+        i = written = 0
+        while written < size:
+            level = "ERROR" if i % 100 == 0 else "INFO "
+            written += f.write(LINE.format(level=level, i=i, ms=i % 97))
+            i += 1
+
+
+def report(name, file_name, mib):
+    calls = [
+        Call(f"cat {file_name}"), Call("grep ERROR"), Call("cut -b 1-20")
+    ]
+    start = time.perf_counter()
+    output = b"".join(map(bytes, EXECUTORS[name](calls)))
+    seconds = time.perf_counter() - start
+    lines = output.count(b"\n") + 1
+    print(f"{name:<10} {seconds:8.2f} s {mib / seconds:8.1f} MiB/s "
+          f"{lines} lines of output")
+
+
+if __name__ == "__main__":
+    mib = int(sys.argv[1]) if len(sys.argv) > 1 else MIB
+    with tempfile.TemporaryDirectory() as directory:
+        file_name = os.path.join(directory, "big.txt")
+        write_file(file_name, mib)
+        for name in EXECUTORS:
+            report(name, file_name, mib)
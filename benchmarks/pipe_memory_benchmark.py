@@ -0,0 +1,70 @@
+"""
+Peak memory of a pipe over a large file, measured with tracemalloc.
+
+    cat big.txt | grep ERROR | cut -b 1-20
+
+The pipe is evaluated as a chain of streams, and as it was before, with
+every call executed in turn on the whole output of the previous call.
+
+    python benchmarks/pipe_memory_benchmark.py [lines]
+"""
+import os
+import sys
+import tempfile
+import tracemalloc
+from collections import deque
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+    )
+
+from applications import Cat, Cut, Grep  # noqa: E402
+from commands import Call, Pipe  # noqa: E402
+
+LINES = 1_000_000
+
+
+def write_file(file_name, lines):
+    with open(file_name, "w") as f:
+        for i in range(lines):
+            level = "ERROR" if i % 1000 == 0 else "INFO"
+            f.write(f"{level} request {i:09} served in {i % 97} ms\n")
+
+
+def streamed(file_name):
+    out = deque()
+    Pipe(
+        Call(f"cat {file_name}"), Call("grep ERROR"), Call("cut -b 1-20")
+        ).eval(out)
+    return out
+
+
+def whole(file_name):
+    out = deque()
+    Cat().exec([file_name], out, False)
+    Grep().exec(["ERROR"], out, True)
+    Cut().exec(["-b", "1-20"], out, True)
+    return out
+
+
+def report(name, evaluate, file_name):
+    tracemalloc.start()
+    out = evaluate(file_name)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<9} peak {peak / 1024:10.0f} KiB, "
+          f"{len(out[0])} characters of output")
+
+
+if __name__ == "__main__":
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else LINES
+    with tempfile.TemporaryDirectory() as directory:
+        file_name = os.path.join(directory, "big.txt")
+        write_file(file_name, lines)
+        size = os.path.getsize(file_name)
+        empty_file = os.path.join(directory, "empty.txt")
+        write_file(empty_file, 0)
+        streamed(empty_file)  # load the parser outside of the measured region
+        print(f"{lines} lines, {size / 1024:.0f} KiB")
+        report("streamed", streamed, file_name)
+        report("whole", whole, file_name)
@@ -0,0 +1,64 @@
+"""
+Time of common pipes over a large file, run as written and as rewritten
+by the rules of pipe_rewrites.py.
+
+    python benchmarks/pipe_rewrites_benchmark.py [lines]
+"""
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+    )
+
+from commands import Call  # noqa: E402
+from executors import sequential  # noqa: E402
+from pipe_rewrites import RULES, rewrite  # noqa: E402
+
+LINES = 500_000
+PIPES = [
+    "cat {file} | grep ERROR",
+    "sort {file} | head -n 10",
+    "sort {file} | uniq",
+    "sort {users} | uniq",
+    "sort {file} | grep ERROR",
+    "cat {file} | sort -r | grep ERROR | head -n 5",
+]
+
+
+def write_files(file_name, users_file, lines):
+    """a log of mostly distinct lines, and the users of its lines"""
+    with open(file_name, "w") as f, open(users_file, "w") as users:
+        for i in range(lines):
+            level = "ERROR" if i % 100 == 0 else "INFO"
+            user = f"user {i * 7919 % 5000:05}"
+            f.write(f"{level} {user} request {i % 97}\n")
+            users.write(f"{user}\n")
+
+
+def run(pipe, files, rules):
+    calls, _ = rewrite(
+        [Call(call.format(**files)) for call in pipe.split(" | ")], rules
+        )
+    start = time.perf_counter()
+    output = b"".join(map(bytes, sequential(calls)))
+    return time.perf_counter() - start, output
+
+
+if __name__ == "__main__":
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else LINES
+    with tempfile.TemporaryDirectory() as directory:
+        files = {
+            "file": os.path.join(directory, "big.txt"),
+            "users": os.path.join(directory, "users.txt"),
+        }
+        write_files(files["file"], files["users"], lines)
+        print(f"{lines} lines")
+        for pipe in PIPES:
+            written, expected = run(pipe, files, frozenset())
+            rewritten, output = run(pipe, files, frozenset(RULES))
+            assert output == expected, pipe
+            print(f"{pipe:<48} written {written:6.3f} s, "
+                  f"rewritten {rewritten:6.3f} s")
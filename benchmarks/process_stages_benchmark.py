@@ -0,0 +1,63 @@
+"""
+Throughput of a CPU-bound pipe over a large file with every pipe
+executor, including worker processes passing their output through shared
+memory:
+
+    cat big.txt | grep .*ERROR.*[0-9]{3} ms | cut -b 1-5,7-20 | uniq | sort
+
+Each call of the pipe runs on a core of its own with the processes
+executor, so the pipe scales with the number of cores up to the number of
+calls. The size of the generated file is given in MiB (64 by default).
+
+    python benchmarks/process_stages_benchmark.py [MiB]
+"""
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+    )
+
+from commands import Call  # noqa: E402
+from executors import EXECUTORS  # noqa: E402
+
+MIB = 64
+LINE = "{level} request {i:09} served in {ms} ms\n"
+CALLS = [
+    "cat {file}",
+    "grep '.*ERROR.*[0-9]{{3}} ms'",
+    "cut -b 1-5,7-20",
+    "uniq",
+    "sort",
+]
+
+
+def write_file(file_name, mib):
+    size = mib * 1024 * 1024
+    with open(file_name, "w") as f:
+        i = written = 0
+        while written < size:
+            level = "ERROR" if i % 3 == 0 else "INFO "
+            written += f.write(LINE.format(level=level, i=i, ms=i % 1999))
+            i += 1
+
+
+def report(name, file_name, mib):
+    calls = [Call(call.format(file=file_name)) for call in CALLS]
+    start = time.perf_counter()
+    output = b"".join(map(bytes, EXECUTORS[name](calls)))
+    seconds = time.perf_counter() - start
+    print(f"{name:<10} {seconds:8.2f} s {mib / seconds:8.1f} MiB/s "
+          f"{len(output)} bytes of output")
+
+
+if __name__ == "__main__":
+    mib = int(sys.argv[1]) if len(sys.argv) > 1 else MIB
+    print(f"{os.cpu_count()} cores")
+    with tempfile.TemporaryDirectory() as directory:
+        file_name = os.path.join(directory, "big.txt")
+        write_file(file_name, mib)
+        for name in EXECUTORS:
+            report(name, file_name, mib)
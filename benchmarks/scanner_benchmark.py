@@ -0,0 +1,56 @@
+"""
+Parse throughput of a corpus of unquoted command lines, such as
+
+    cat logs/app-17.log | grep ERROR | cut -b 1-20 > errors-17.txt
+
+Compares the scanner used for lines without quotes with the parser. The
+scanner parses the whole corpus (a million lines by default), the slower
+parser only a sample of it.
+
+    python benchmarks/scanner_benchmark.py [lines]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+    )
+
+from command_evaluator import lark_parse  # noqa: E402
+from scanner import scan  # noqa: E402
+
+LINES = 1_000_000
+PARSER_SAMPLE = 20_000
+TEMPLATES = [
+    "echo {i}",
+    "cat logs/app-{i}.log | grep ERROR | cut -b 1-20 > errors-{i}.txt",
+    "sort data/{i}.csv | uniq | head -n 10",
+    "< in-{i}.txt tail -n 5; ls dir{i}; cat *.txt",
+    "find src -name {i}.py | sort",
+]
+
+
+def corpus(lines):
+    return [
+        TEMPLATES[i % len(TEMPLATES)].format(i=i) for i in range(lines)
+    ]
+
+
+def report(name, parse, lines):
+    start = time.perf_counter()
+    for line in lines:
+        parse(line)
+    seconds = time.perf_counter() - start
+    rate = len(lines) / seconds
+    print(f"{name:<8} {len(lines):>9} lines {seconds:8.2f} s "
+          f"{rate:12.0f} lines/s")
+    return rate
+
+
+if __name__ == "__main__":
+    lines = corpus(int(sys.argv[1]) if len(sys.argv) > 1 else LINES)
+    lark_parse("")  # build the shared parser outside of the timed region
+    scanner = report("scanner", scan, lines)
+    parser = report("parser", lark_parse, lines[:PARSER_SAMPLE])
+    print(f"speedup: {scanner / parser:.1f}x")
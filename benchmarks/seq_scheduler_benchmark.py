@@ -0,0 +1,63 @@
+"""
+Time taken by a sequence of commands which read files of their own, run
+one after the other and side by side (see scheduler.py).
+
+    grep '.*099 ' big0.txt; grep '.*199 ' big1.txt; ...; sort big4.txt > out
+
+"sequential" runs the commands one after the other, "threaded" and
+"processes" run the grep calls side by side, in threads and in worker
+processes, then the sort, which writes a file. The threads take turns on
+the interpreter lock, so only the worker processes can overlap the work of
+the grep calls, against the cost of sending their output back.
+
+    python benchmarks/seq_scheduler_benchmark.py [lines]
+"""
+import os
+import sys
+import time
+import tempfile
+from collections import deque
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+    )
+
+import session  # noqa: E402
+from command_evaluator import parse  # noqa: E402
+from scheduler import scheduled  # noqa: E402
+
+LINES = 300_000
+FILES = 4
+
+
+def write_file(file_name, lines, seed):
+    with open(file_name, "w") as f:
+        for i in range(lines):
+            f.write(f"INFO request {i * seed % lines:09} served\n")
+
+
+def report(name, cmdline):
+    seq = parse(cmdline)
+    out = deque()
+    start = time.perf_counter()
+    if name == "sequential":
+        seq.eval(out)
+    else:
+        scheduled(seq.commands, out, name)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<10} {elapsed:6.2f} s, output {len(''.join(out))} chars")
+
+
+if __name__ == "__main__":
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else LINES
+    with tempfile.TemporaryDirectory() as directory:
+        for i in range(FILES + 1):
+            write_file(os.path.join(directory, f"big{i}.txt"), lines, i + 7)
+        cmdline = "; ".join(
+            [f"grep '.*{i}99 ' big{i}.txt" for i in range(FILES)]
+            + [f"sort big{FILES}.txt > out"]
+            )
+        print(f"{cmdline} ({lines} lines a file)")
+        with session.using(session.Session(directory)):
+            for name in ["sequential", "threaded", "processes"]:
+                report(name, cmdline)
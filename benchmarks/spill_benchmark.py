@@ -0,0 +1,72 @@
+"""
+Peak memory and time of a pipe whose output is collected between its
+segments, with the output kept in memory and spilled to a file.
+
+    cat big.txt | cut -b 1- | ... | cut -b 1- | tail -n 1
+
+The pipe is streamed in segments of SEGMENT calls, executors.STREAM_DEPTH
+lowered to it, so the output of its first segment, the whole file, is
+collected in a PipeBuffer before the second segment reads it.
+
+    python benchmarks/spill_benchmark.py [lines]
+"""
+import os
+import sys
+import time
+import tempfile
+import tracemalloc
+from collections import deque
+from functools import partial
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+    )
+
+import executors  # noqa: E402
+from commands import Call, Pipe  # noqa: E402
+from pipe_buffers import PipeBuffer, counters  # noqa: E402
+
+LINES = 200_000
+SEGMENT = 8
+THRESHOLD = 1024 * 1024
+
+
+def write_file(file_name, lines):
+    with open(file_name, "w") as f:
+        for i in range(lines):
+            f.write(f"INFO request {i:09} served in {i % 97} ms\n")
+
+
+def pipe(file_name):
+    return Pipe(
+        Call(f"cat {file_name}"),
+        *[Call("cut -b 1-")] * SEGMENT,
+        Call("tail -n 1"),
+        )
+
+
+def report(name, threshold, file_name):
+    executors.PipeBuffer = partial(PipeBuffer, threshold=threshold)
+    spilled = counters["spilled_bytes"]
+    out = deque()
+    tracemalloc.start()
+    start = time.perf_counter()
+    pipe(file_name).eval(out)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<9} peak {peak / 1024:8.0f} KiB, {elapsed:6.2f} s, "
+          f"spilled {(counters['spilled_bytes'] - spilled) / 1024:.0f} KiB, "
+          f"output {out[0].strip()!r}")
+
+
+if __name__ == "__main__":
+    executors.STREAM_DEPTH = SEGMENT
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else LINES
+    with tempfile.TemporaryDirectory() as directory:
+        file_name = os.path.join(directory, "big.txt")
+        write_file(file_name, lines)
+        print(f"{lines} lines, {os.path.getsize(file_name) / 1024:.0f} KiB")
+        pipe(file_name).eval(deque())  # load the parser outside of the runs
+        report("memory", 0, file_name)
+        report("spilled", THRESHOLD, file_name)
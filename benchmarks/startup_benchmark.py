@@ -0,0 +1,59 @@
+"""
+Cold start time of `sh -c "echo 'foo'"`, a command line which is parsed
+(unquoted lines are scanned without the parser), with the parser loaded
+each way: from the generated standalone parser, and, with the standalone
+parser hidden, from lark with and without the on-disk parse table cache
+(PYSHELL_CACHE_DIR).
+
+    python benchmarks/startup_benchmark.py
+"""
+import os
+import sys
+import time
+import tempfile
+import subprocess
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+SHELL = os.path.join(SRC, "shell.py")
+CMDLINE = "echo 'foo'"
+RUNS = 20
+
+# runs the shell as python src/shell.py would, with the standalone parser
+# hidden if the first argument is "hidden"
+LAUNCHER = """
+import sys, runpy
+hide, src, shell = sys.argv[1:4]
+if hide == "hidden":
+    sys.modules["standalone_parser"] = None
+sys.argv = [shell] + sys.argv[4:]
+sys.path.insert(0, src)
+runpy.run_path(shell, run_name="__main__")
+"""
+
+
+def startup_time(standalone, cache_dir):
+    env = dict(os.environ, PYSHELL_CACHE_DIR=cache_dir)
+    # the warm up run writes the bytecode which a start usually loads
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    cmd = [
+        sys.executable, "-c", LAUNCHER,
+        "shown" if standalone else "hidden", SRC, SHELL, "-c", CMDLINE,
+    ]
+    subprocess.run(cmd, env=env, stdout=subprocess.DEVNULL,
+                   check=True)  # warm up
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        subprocess.run(cmd, env=env, stdout=subprocess.DEVNULL)
+    return (time.perf_counter() - start) / RUNS
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as cache_dir:
+        standalone = startup_time(True, "")
+        cached = startup_time(False, cache_dir)
+        uncached = startup_time(False, "")
+    print(f"standalone parser    {standalone * 1000:8.1f} ms")
+    print(f"lark, warm cache     {cached * 1000:8.1f} ms")
+    print(f"lark, no cache       {uncached * 1000:8.1f} ms")
+    print(f"cache saving         {(uncached - cached) * 1000:8.1f} ms "
+          "per start")
@@ -0,0 +1,62 @@
+"""
+Time to the first byte of output, and to the end of output, of the shell
+in -c mode, for a command line whose first command prints early:
+
+    echo start; cat big.txt | grep ERROR; cat big.txt | tail -n 1
+
+The shell writes the output of every command as soon as it has run. It
+is compared with printing the output once the whole line has run, as the
+shell did before.
+
+    python benchmarks/ttfb_benchmark.py [lines]
+"""
+import os
+import sys
+import time
+import tempfile
+import subprocess
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+LINES = 1_000_000
+CMDLINE = "echo start; cat {file} | grep ERROR; cat {file} | tail -n 1"
+WHOLE_LINE = """
+import sys
+from collections import deque
+from shell import eval
+out = deque()
+eval(sys.argv[1], out)
+print("".join(out), end="")
+"""
+
+
+def write_file(file_name, lines):
+    with open(file_name, "w") as f:
+        for i in range(lines):
+            level = "ERROR" if i % 100 == 0 else "INFO"
+            f.write(f"{level} request {i:09}\n")
+
+
+def report(name, args, cwd):
+    start = time.perf_counter()
+    p = subprocess.Popen(args, stdout=subprocess.PIPE, cwd=cwd)
+    p.stdout.read(1)
+    first = time.perf_counter()
+    size = 1 + len(p.stdout.read())
+    p.wait()
+    end = time.perf_counter()
+    print(f"{name:<12} first byte {(first - start) * 1000:8.1f} ms, "
+          f"last byte {(end - start) * 1000:8.1f} ms, {size} bytes")
+
+
+if __name__ == "__main__":
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else LINES
+    with tempfile.TemporaryDirectory() as directory:
+        file_name = os.path.join(directory, "big.txt")
+        write_file(file_name, lines)
+        cmdline = CMDLINE.format(file=file_name)
+        report(
+            "per command",
+            [sys.executable, os.path.join(SRC, "shell.py"), "-c", cmdline],
+            SRC,
+            )
+        report("whole line", [sys.executable, "-c", WHOLE_LINE, cmdline], SRC)
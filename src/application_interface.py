@@ -1,5 +1,43 @@
 from abc import ABCMeta, abstractmethod
-from typing import List
+from collections import deque
+from typing import Iterator, List, Optional
+
+# the encoding of the text of the bytes passed through a pipe; bytes which
+# are not valid in it are decoded as surrogates and encoded back unchanged
+ENCODING = "utf-8"
+ENCODING_ERRORS = "surrogateescape"
+
+
+def encode(text: str) -> bytes:
+    return text.encode(ENCODING, ENCODING_ERRORS)
+
+
+def decode(data: bytes) -> str:
+    return str(data, ENCODING, ENCODING_ERRORS)
+
+
+class Lines(list):
+
+    """
+    A chunk of lines: a list of lines of bytes, each ending with a newline
+    but perhaps the last line of a stream, whose bytes, bytes(lines), are
+    the lines joined. Applications which work on lines pass their output
+    as Lines, so the next application reads the lines without splitting
+    them. A Lines chunk is not modified once it is yielded.
+    """
+
+    __slots__ = ()
+
+    def __bytes__(self):
+        return b"".join(self)
+
+
+def keep(chunk) -> bytes:
+    """
+    returns a chunk which may be kept after the next chunk is read: the
+    chunk itself if it is bytes or Lines, otherwise a copy of it.
+    """
+    return chunk if type(chunk) in (bytes, Lines) else bytes(chunk)
 
 
 class Application(metaclass=ABCMeta):
@@ -7,7 +45,41 @@ class Application(metaclass=ABCMeta):
     def __subclasshook__(cls, subclass):
         return hasattr(subclass, "exec") and callable(subclass.exec)
 
+    @property
+    def holds_input(self) -> bool:
+        """
+        whether stream holds the whole of its input before its output, as
+        the default, which executes the application with exec, does
+        """
+        return type(self).stream is Application.stream
+
     @abstractmethod
     def exec(self, args: List[str], out: List[str], in_pipe: bool) -> None:
         """executes the application"""
         raise NotImplementedError
+
+    def stream(
+        self, args: List[str], stdin: Optional[Iterator[bytes]]
+    ) -> Iterator[bytes]:
+        """
+        executes the application in a pipe, reading stdin (None for the
+        first call of a pipe) as an iterator of chunks of bytes and
+        yielding its output as chunks of bytes.
+
+        A chunk is bytes, Lines, or a bytearray or memoryview of a buffer
+        which its producer reuses, so that blocks of data are passed on
+        without copying them; bytes(chunk) are the bytes of any chunk. A
+        chunk is only valid until the next chunk is read, and is not to be
+        modified: a chunk may be yielded, or a view of it, as it is read,
+        but a chunk kept after the next one is read is copied with keep().
+
+        By default the application is executed with exec, receiving the
+        whole of stdin, decoded, as one entry of out.
+        """
+        out = deque()
+        in_pipe = stdin is not None
+        if in_pipe:
+            out.append(decode(b"".join(map(bytes, stdin))))
+        self.exec(args, out, in_pipe)
+        for text in out:
+            yield encode(text)
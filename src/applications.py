@@ -1,10 +1,171 @@
 import os
 import re
 import sys
-import glob
-from os import listdir
-from application_interface import Application
+import heapq
+from io import BytesIO
+from collections import Counter, deque
+from contextlib import closing
+from itertools import chain, islice
+import jobs
+import process_stages
+import session
+from application_interface import Application, Lines, decode, encode
 from exceptions import ApplicationExcecutionError
+from pipe_buffers import SortBuffer
+from process_stages import ProcessStage
+from settings import PROCESS_APPLICATIONS
+
+# the number of bytes of a file read at once
+BLOCK_SIZE = 8 * 1024
+
+# the most lines of a Lines chunk of the output of sort and tail
+LINES_SIZE = 1024
+
+
+def read_line_batches(file_name):
+    """
+    yields the lines of a file as Lines of about BLOCK_SIZE bytes. The
+    file is closed once they are read.
+    """
+    with session.current().open(file_name, "rb") as f:
+        while True:
+            lines = f.readlines(BLOCK_SIZE)
+            if not lines:
+                return
+            yield Lines(lines)
+
+
+def read_blocks(file_name):
+    """
+    yields the content of a file in blocks of BLOCK_SIZE bytes, read into
+    a buffer which is reused: a block is only valid until the next one is
+    read. The file is closed once they are read.
+    """
+    buffer = bytearray(BLOCK_SIZE)
+    with session.current().open(file_name, "rb", buffering=0) as f:
+        while True:
+            size = f.readinto(buffer)
+            if size == BLOCK_SIZE:
+                yield buffer
+            elif size:
+                yield buffer[:size]
+            else:
+                return
+
+
+def line_batches(chunks):
+    """
+    yields the lines of a stream of chunks, with their newlines, in lists,
+    a list for each chunk: a Lines chunk as it is, unless a line starts in
+    the chunk before it. Only the last line of the stream may not end
+    with a newline.
+    """
+    pending = b""
+    for chunk in chunks:
+        if type(chunk) is Lines:
+            if not chunk:
+                continue
+            if not pending and chunk[-1][-1:] == b"\n":
+                yield chunk
+                continue
+            lines = list(chunk)
+            lines[0] = pending + lines[0]
+        else:
+            # copied, as the lines outlive the chunk
+            data = pending + chunk if pending else bytes(chunk)
+            if not data:
+                continue
+            lines = BytesIO(data).readlines()
+        pending = lines.pop() if lines[-1][-1:] != b"\n" else b""
+        if lines:
+            yield lines
+    if pending:
+        yield [pending]
+
+
+def iter_lines(chunks):
+    """yields the lines of a stream of chunks, with their newlines"""
+    return chain.from_iterable(line_batches(chunks))
+
+
+def join_lines(batches):
+    """
+    yields the lines of batches, lists of lines ending with newlines but
+    perhaps the last line, as Lines, without the newline of the last
+    line: the bytes of b"\\n".join() of the lines without their newlines.
+    """
+    previous = None
+    for lines in batches:
+        if not lines:
+            continue
+        output = Lines() if previous is None else Lines([previous])
+        output += lines
+        previous = output.pop()
+        if output:
+            yield output
+    if previous is not None:
+        yield Lines([previous[:-1] if previous[-1:] == b"\n" else previous])
+
+
+def _slices(lines, size=LINES_SIZE):
+    """yields lines as Lines of at most size lines"""
+    if type(lines) is not list:
+        lines = iter(lines)
+        while True:
+            chunk = Lines(islice(lines, size))
+            if not chunk:
+                return
+            yield chunk
+    for i in range(0, len(lines), size):
+        yield Lines(lines[i:i + size])
+
+
+def _count_and_file(args, stdin):
+    """
+    Returns the number of lines and the file for head and tail,
+    [-n N] [FILE], None if stdin is read as no FILE is given.
+    """
+    n = 10
+    if len(args) >= 2 and args[0] == "-n" and args[1].isnumeric():
+        n, args = int(args[1]), args[2:]
+    if len(args) == 1:
+        return n, args[0]
+    elif not args and stdin is not None:
+        return n, None
+    raise ApplicationExcecutionError("Invalid Arguments")
+
+
+def first_lines(chunks, n):
+    """
+    yields the chunks of the first n lines of a stream of chunks: the
+    chunks before the n-th newline as they are, then a view of the chunk
+    it is in, up to it, or the first lines of a Lines chunk.
+    """
+    if n <= 0:
+        return
+    for chunk in chunks:
+        if type(chunk) is Lines:
+            count = len(chunk)
+            if chunk and chunk[-1][-1:] != b"\n":
+                count -= 1  # a line which ends in the next chunk
+            if count < n:
+                n -= count
+                yield chunk
+                continue
+            yield Lines(chunk[:n])
+            return
+        if type(chunk) is memoryview:
+            chunk = bytes(chunk)
+        count = chunk.count(b"\n")
+        if count < n:
+            n -= count
+            yield chunk
+            continue
+        end = -1
+        for _ in range(n):
+            end = chunk.find(b"\n", end + 1)
+        yield memoryview(chunk)[:end + 1]
+        return
 
 
 class Pwd(Application):
@@ -18,12 +179,15 @@ class Pwd(Application):
             raise ApplicationExcecutionError(
                 "Pwd Can Not Take Arguments From stdin"
                 )
-        out.append(os.getcwd() + "\n")
+        out.append(session.current().cwd + "\n")
 
 
 class Cd(Application):
 
-    """change the current working directory to the first argument"""
+    """
+    changes the working directory of the session to the first argument,
+    rather than that of the process (see session.py)
+    """
 
     def exec(self, args, out, in_pipe):
         if in_pipe:
@@ -32,7 +196,7 @@ class Cd(Application):
                 )
         elif len(args) != 1:
             raise ApplicationExcecutionError("Invalid Arguments")
-        os.chdir(args[0])
+        session.current().chdir(args[0])
 
 
 class Ls(Application):
@@ -41,7 +205,7 @@ class Ls(Application):
 
     def _get_directory(self, args):
         if len(args) == 0:
-            return os.getcwd()
+            return session.current().cwd
         elif len(args) == 1:
             return args[0]
         else:
@@ -54,7 +218,7 @@ class Ls(Application):
                 )
         ls_dir = self._get_directory(args)
         contents = []
-        for f in listdir(ls_dir):
+        for f in session.current().listdir(ls_dir):
             if not f.startswith("."):  # if f is hidden, do not add to list
                 contents.append(f)
         out.append("\n".join(contents) + "\n")
@@ -71,10 +235,19 @@ class Cat(Application):
             args = out.pop().split(" ")  # get input from stdin
         lines = []
         for a in args:
-            with open(a.strip()) as f:
+            with session.current().open(a.strip()) as f:
                 lines.append(f.read())
         out.append("".join(lines))
 
+    def stream(self, args, stdin):
+        if args:
+            for a in args:
+                yield from read_blocks(a.strip())
+        elif stdin is None:
+            raise ApplicationExcecutionError("Invalid Arguments")
+        else:
+            yield from stdin
+
 
 class Echo(Application):
 
@@ -96,7 +269,7 @@ class Head(Application):
     """
 
     def _read_first_n_lines_from_file(self, file, n, out):
-        with open(file) as f:
+        with session.current().open(file) as f:
             lines = f.readlines()
             content = []
             for i in range(0, min(len(lines), n)):
@@ -119,6 +292,11 @@ class Head(Application):
         else:
             raise ApplicationExcecutionError("Invalid Arguments")
 
+    def stream(self, args, stdin):
+        n, file_name = _count_and_file(args, stdin)
+        chunks = stdin if file_name is None else read_blocks(file_name)
+        yield from first_lines(chunks, n)
+
 
 class Tail(Application):
 
@@ -127,7 +305,7 @@ class Tail(Application):
     """
 
     def _read_last_n_lines_from_file(self, file, n, out):
-        with open(file) as f:
+        with session.current().open(file) as f:
             lines = f.readlines()
             no_of_lines = len(lines)
             display_length = min(no_of_lines, n)
@@ -152,6 +330,15 @@ class Tail(Application):
         else:
             raise ApplicationExcecutionError("Invalid Arguments")
 
+    def stream(self, args, stdin):
+        n, file_name = _count_and_file(args, stdin)
+        if file_name is None:
+            batches = line_batches(stdin)
+        else:
+            batches = read_line_batches(file_name)
+        lines = deque(chain.from_iterable(batches), maxlen=n)
+        yield from _slices(list(lines))
+
 
 class Grep(Application):
 
@@ -168,7 +355,7 @@ class Grep(Application):
         multiple_files = len(files) > 1
         contents = []
         for file in files:
-            with open(file) as f:
+            with session.current().open(file) as f:
                 lines = f.readlines()
                 self._grep(pattern, multiple_files, contents, file, lines)
         out.append("\n".join(contents))
@@ -192,6 +379,63 @@ class Grep(Application):
         else:
             self._find_matches_from_files(args[0], args[1:], out)
 
+    def _matches(self, pattern, lines):
+        """
+        the lines of a batch which match, with their newlines, which are
+        not matched: the end of a line is matched before its newline.
+        """
+        match = pattern.match
+        last = lines[-1]
+        if last[-1:] == b"\n":
+            return [line for line in lines if match(line, 0, len(line) - 1)]
+        matches = [
+            line for line in lines[:-1] if match(line, 0, len(line) - 1)
+            ]
+        if match(last):
+            matches.append(last)
+        return matches
+
+    def _stream_matches_from_stdin(self, pattern, stdin):
+        """matches the lines of stdin.split(b"\\n"), as exec does"""
+        ended = True
+        with closing(line_batches(stdin)) as batches:
+            for lines in batches:
+                ended = lines[-1][-1:] == b"\n"
+                yield self._matches(pattern, lines)
+        if ended and pattern.match(b""):
+            yield [b""]
+
+    def _stream_matches_from_files(self, pattern, files):
+        multiple_files = len(files) > 1
+        for file in files:
+            prefix = encode(f"{file}:")
+            # closed as soon as grep is, as the file is open until then
+            with closing(read_line_batches(file)) as batches:
+                for lines in batches:
+                    matches = self._matches(pattern, lines)
+                    if multiple_files:
+                        matches = [prefix + line for line in matches]
+                    if matches and matches[-1][-1:] != b"\n":
+                        matches[-1] += b"\n"  # a file without a last newline
+                    yield matches
+
+    def stream(self, args, stdin):
+        """
+        matches lines as bytes, against the pattern encoded: the pattern
+        is a bytes regex, whose classes such as \\w match ASCII only.
+        """
+        if len(args) < 1:
+            raise ApplicationExcecutionError("Invalid Arguments")
+        pattern = re.compile(encode(args[0]))
+        if len(args) > 1:
+            matches = self._stream_matches_from_files(pattern, args[1:])
+        elif stdin is None:
+            raise ApplicationExcecutionError("Invalid Arguments")
+        else:
+            matches = self._stream_matches_from_stdin(pattern, stdin)
+        with closing(matches):
+            yield from join_lines(matches)
+
 
 class Cut(Application):
     """
@@ -212,49 +456,85 @@ class Cut(Application):
         """
         Returns the extracted section from given line.
         """
-        result = ""
+        sections = []
         for param in no_of_bytes_param:
             param_section = [p for p in re.split("(-)", param) if p != ""]
             if len(param_section) == 1 and int(param_section[0]) <= len(
                 line
             ):  # Single byte arg. e.g. -b n
-                result += self._single_param(line, param_section[0])
+                sections.append(self._single_param(line, param_section[0]))
             elif len(param_section) == 2:
                 # -b -n (from first byte to nth byte) or -b n-
                 # (from nth byte to last byte)
                 if param_section[0] == "-":  # Case -b -n
-                    result += line[: int(param_section[1])]
+                    sections.append(line[: int(param_section[1])])
                 elif param_section[1] == "-":  # Case -b n-
-                    result += str(line[int(param_section[0]) - 1:])
+                    sections.append(line[int(param_section[0]) - 1:])
                     break
             elif len(param_section) == 3 and param_section[1] == "-":
                 # -b n-m (from nth byte to mth byte)
-                result += line[
-                    int(param_section[0]) - 1: int(param_section[2])
-                    ]
-        return result
+                sections.append(
+                    line[int(param_section[0]) - 1: int(param_section[2])]
+                    )
+        return line[:0].join(sections)  # str or bytes as line
 
     def _single_param(self, line, param):
-        if int(param) == 1:
-            return line[0]
-        return line[int(param)]
+        """the param-th byte of line, counted from 1"""
+        return line[int(param) - 1:int(param)]
+
+    def _slices(self, no_of_bytes_param):
+        """
+        Returns the slices of a line whose sections _get_section joins,
+        so that the params are parsed once rather than for every line.
+        """
+        slices = []
+        for param in no_of_bytes_param:
+            param_section = [p for p in re.split("(-)", param) if p != ""]
+            if len(param_section) == 1:  # past the end of a line is empty
+                n = int(param_section[0])
+                slices.append(slice(n - 1, n))
+            elif len(param_section) == 2:
+                if param_section[0] == "-":
+                    slices.append(slice(None, int(param_section[1])))
+                elif param_section[1] == "-":
+                    slices.append(slice(int(param_section[0]) - 1, None))
+                    break
+            elif len(param_section) == 3 and param_section[1] == "-":
+                slices.append(
+                    slice(int(param_section[0]) - 1, int(param_section[2]))
+                    )
+        return slices
+
+    def _cut_lines(self, slices, lines):
+        """Returns the sections of a batch of lines, with newlines."""
+        if len(slices) == 1:
+            section = slices[0]
+            return [line.strip()[section] + b"\n" for line in lines]
+        return [
+            b"".join([line[section] for section in slices]) + b"\n"
+            for line in map(bytes.strip, lines)
+            ]
 
     def _calculate(self, no_of_bytes_param, lines):
         """
         Returns the result to print to stdout.
         """
-        result = ""
-        for line in lines:
-            result += self._get_section(no_of_bytes_param, line.strip()) + "\n"
-        return result[:-1]
+        return "\n".join(
+            self._get_section(no_of_bytes_param, line.strip())
+            for line in lines
+            )
 
-    def exec(self, args, out, in_pipe):
+    def _no_of_bytes_param(self, args):
         no_of_bytes_param = args[1].split(",")
         no_of_bytes_param.sort(
             key=lambda x: int(x.split("-")[0])
             if x.split("-")[0] != ""
             else -ord(x[0])
         )
+        return no_of_bytes_param
+
+    def exec(self, args, out, in_pipe):
+        no_of_bytes_param = self._no_of_bytes_param(args)
         if len(args) == 2:
             if not in_pipe:
                 raise ApplicationExcecutionError("Invalid Arguments")
@@ -262,10 +542,25 @@ class Cut(Application):
             lines = args.splitlines(keepends=False)
         else:
             file_name = args[2]
-            with open(file_name) as file:
+            with session.current().open(file_name) as file:
                 lines = file.readlines()
         out.append(self._calculate(no_of_bytes_param, lines))
 
+    def stream(self, args, stdin):
+        """cuts lines as bytes, so the offsets count bytes, not characters"""
+        no_of_bytes_param = self._no_of_bytes_param(args)
+        if len(args) == 2:
+            if stdin is None:
+                raise ApplicationExcecutionError("Invalid Arguments")
+            batches = line_batches(stdin)
+        else:
+            batches = read_line_batches(args[2])
+        slices = self._slices(no_of_bytes_param)
+        with closing(batches):
+            yield from join_lines(
+                self._cut_lines(slices, lines) for lines in batches
+                )
+
 
 class Find(Application):
 
@@ -291,7 +586,7 @@ class Find(Application):
                 )
         path, pattern = self._get_path_and_pattern(args)
         file_names = "\n".join(
-            glob.iglob(path + "/**/" + pattern, recursive=True)
+            session.current().iglob(path + "/**/" + pattern, recursive=True)
             )
         out.append(file_names)
 
@@ -328,7 +623,7 @@ class Uniq(Application):
         out.append("".join(uniq_lines))
 
     def _read_file(self, file_name):
-        with open(file_name) as file:
+        with session.current().open(file_name) as file:
             lines = file.readlines()
         return lines
 
@@ -347,13 +642,16 @@ class Uniq(Application):
                 return args[0] == "-i"
         return True
 
-    def exec(self, args, out, in_pipe):
+    def _check_args(self, args, in_pipe):
         num_of_args = len(args)
-        case_insensitive = False
         if not self._correct_no_of_args(
             num_of_args, in_pipe
         ) or not self._correct_flags(num_of_args, args, in_pipe):
             raise ApplicationExcecutionError("Invalid Arguments")
+
+    def exec(self, args, out, in_pipe):
+        case_insensitive = False
+        self._check_args(args, in_pipe)
         if len(args) > 0:
             case_insensitive = args[0] == "-i"
         if in_pipe:
@@ -362,6 +660,26 @@ class Uniq(Application):
             lines = self._read_file(args[-1])
         self._uniq_lines(out, lines, case_insensitive)
 
+    def stream(self, args, stdin):
+        in_pipe = stdin is not None
+        self._check_args(args, in_pipe)
+        case_insensitive = len(args) > 0 and args[0] == "-i"
+        if in_pipe:
+            batches = line_batches(stdin)
+        else:
+            batches = read_line_batches(args[-1])
+        previous = None
+        with closing(batches):
+            for lines in batches:
+                output = Lines()
+                for line in lines:
+                    key = decode(line).lower() if case_insensitive else line
+                    if key != previous:
+                        output.append(line)
+                    previous = key
+                if output:
+                    yield output
+
 
 class Sort(Application):
     """
@@ -375,13 +693,15 @@ class Sort(Application):
     - `FILE` is the name of the file. If not specified, uses stdin.
     """
 
+    holds_input = True
+
     def _sort_contents(self, contents, out, reverse=False):
         if contents:
             contents.sort(reverse=reverse)
             out.append("".join(contents))
 
     def _read_file(self, file_name):
-        with open(file_name) as f:
+        with session.current().open(file_name) as f:
             return f.readlines()
 
     def _input_from_stdin(self, out):
@@ -416,6 +736,170 @@ class Sort(Application):
         else:
             raise ApplicationExcecutionError("Invalid Arguments")
 
+    def _input(self, args, stdin):
+        """whether the lines are sorted in reverse, and their batches"""
+        reverse = len(args) > 0 and args[0] == "-r"
+        files = args[1:] if reverse else args
+        if len(files) == 1:
+            return reverse, read_line_batches(files[0])
+        elif not files and stdin is not None:
+            return reverse, line_batches(stdin)
+        raise ApplicationExcecutionError("Invalid Arguments")
+
+    def stream(self, args, stdin):
+        """
+        sorts the lines in a SortBuffer, which spills them to files in
+        sorted runs once they take PIPE_SPILL_THRESHOLD bytes of memory
+        """
+        reverse, batches = self._input(args, stdin)
+        buffer = SortBuffer(reverse)
+        try:
+            for lines in batches:
+                buffer.extend(lines)
+            lines = buffer.sorted()
+            if buffer.last is not None:
+                lines = _running_on(lines, buffer.last, reverse)
+            yield from _slices(lines)
+        finally:
+            buffer.close()
+
+
+def _run_on(lines, last):
+    """
+    the last line of the input of sort, if it has no newline, runs into
+    the line sorted after it, as in exec.
+    """
+    if last[-1:] != b"\n":
+        i = lines.index(last)
+        lines[i:i + 2] = [b"".join(lines[i:i + 2])]
+
+
+def _running_on(lines, last, reverse):
+    """
+    yields sorted lines, with last, the last line of the input without a
+    newline, running into the line sorted after it, as _run_on does
+    """
+    for line in lines:
+        if last is not None and (line <= last if reverse else line >= last):
+            yield last + line
+            last = None
+        else:
+            yield line
+    if last is not None:
+        yield last
+
+
+class SortedHead(Sort):
+
+    """
+    sort [-r] [FILE] | head -n N, keeping the first N + 1 sorted lines in
+    a heap rather than sorting every line: the extra line is the one the
+    last line of the input may run into.
+    """
+
+    holds_input = False
+
+    def __init__(self, n):
+        self.n = n
+
+    def stream(self, args, stdin):
+        reverse, batches = self._input(args, stdin)
+        first = (heapq.nlargest if reverse else heapq.nsmallest)(
+            self.n + 1, chain.from_iterable(batches)
+            )
+        for line in first:
+            if line[-1:] != b"\n":
+                _run_on(first, line)
+                break
+        yield from _slices(first[:self.n])
+
+
+class DistinctSort(Sort):
+
+    """
+    sort [-r] [FILE] | uniq, sorting the distinct lines only, in the order
+    they are first read, which sorting takes advantage of as it does for
+    sort. The line the last line of the input runs into is kept as well
+    if it was repeated.
+    """
+
+    def stream(self, args, stdin):
+        reverse, batches = self._input(args, stdin)
+        counts = Counter()
+        last = b"\n"
+        for lines in batches:
+            counts.update(lines)
+            last = lines[-1]
+        lines = sorted(counts, reverse=reverse)
+        if last[-1:] != b"\n":
+            i = lines.index(last)
+            following = lines[i + 1:i + 2]
+            if following and counts[following[0]] > 1:
+                lines.insert(i + 2, following[0])
+            _run_on(lines, last)
+            # the line the last line ran into may equal the line before it
+            lines = [
+                line for line, previous in zip(lines, [None] + lines)
+                if line != previous
+                ]
+        yield from _slices(lines)
+
+
+class FilteredSort(Sort):
+
+    """
+    sort [-r] [FILE] | grep PATTERN, matching the lines before they are
+    sorted, so that only those grep would keep are sorted. Its output is
+    still matched by grep: the lines it passes on are those of the output
+    of sort which match, and its last line, which grep needs to see.
+
+    Stdin is kept whole in case its last line has no newline and runs into
+    the line sorted after it; a file is read again instead.
+    """
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+
+    def stream(self, args, stdin):
+        match = re.compile(encode(self.pattern)).match
+        reverse, batches = self._input(args, stdin)
+        reads_stdin = len(args) == (1 if reverse else 0)
+        every_line = [] if reads_stdin else None
+        matching = []
+        last = b"\n"
+        for lines in batches:
+            matching += [
+                line for line in lines if match(line, 0, len(line) - 1)
+                ]
+            if every_line is not None:
+                every_line += lines
+            last = lines[-1]
+        if last[-1:] == b"\n":
+            matching.sort(reverse=reverse)
+            yield from _slices(matching)
+            return
+        if matching and matching[-1] is last:
+            matching.pop()
+        if every_line is None:
+            _, batches = self._input(args, stdin)
+            every_line = chain.from_iterable(batches)
+        if reverse:
+            following = max((x for x in every_line if x < last), default=None)
+        else:
+            following = min((x for x in every_line if x > last), default=None)
+        matching.sort(reverse=reverse)
+        if following is None:
+            matching.append(last)
+        else:
+            if match(following, 0, len(following) - 1):
+                matching.remove(following)
+            i = sum(
+                1 for line in matching
+                if (line > last if reverse else line < last)
+                )
+            matching.insert(i, last + following)
+        yield from _slices(matching)
+
 
 class Clear(Application):
 
@@ -443,60 +927,269 @@ class Exit(Application):
         sys.exit(0)
 
 
+def _job_number(arg):
+    """the number of a job, written N or %N"""
+    number = arg[1:] if arg[:1] == "%" else arg
+    if not number.isdecimal():
+        raise ApplicationExcecutionError("Invalid Arguments")
+    return int(number)
+
+
+class Jobs(Application):
+
+    """lists the background jobs, which have not been waited for"""
+
+    def exec(self, args, out, in_pipe):
+        if args:
+            raise ApplicationExcecutionError("Jobs Takes No Arguments")
+        elif in_pipe:
+            raise ApplicationExcecutionError(
+                "Jobs Can Not Take Arguments From stdin"
+                )
+        for job in jobs.jobs():
+            out.append(
+                f"[{job.number}] {job.status:<7} {job.raw_command} &\n"
+                )
+
+
+class Wait(Application):
+
+    """
+    waits for the background jobs given by their numbers, every job if
+    none is given, and outputs what they output
+    """
+
+    def exec(self, args, out, in_pipe):
+        if in_pipe:
+            raise ApplicationExcecutionError(
+                "Wait Can Not Take Arguments From stdin"
+                )
+        jobs.wait([_job_number(arg) for arg in args], out)
+
+
+class Fg(Application):
+
+    """
+    waits for a background job, the job started last if no number is
+    given, and outputs what it output
+    """
+
+    def exec(self, args, out, in_pipe):
+        if in_pipe:
+            raise ApplicationExcecutionError(
+                "Fg Can Not Take Arguments From stdin"
+                )
+        elif len(args) > 1:
+            raise ApplicationExcecutionError("Invalid Arguments")
+        number = _job_number(args[0]) if args else jobs.current()
+        if number is None:
+            raise ApplicationExcecutionError("No Such Job")
+        jobs.wait([number], out)
+
+
+class Explain(Application):
+
+    """
+    prints the plan of the command line made of its arguments, without
+    running it, see explain.py: a command line starting with explain is
+    explained whole, so this runs explain after other commands of a line
+    """
+
+    def exec(self, args, out, in_pipe):
+        from explain import explain_line
+
+        if in_pipe:
+            raise ApplicationExcecutionError(
+                "Explain Can Not Take Arguments From stdin"
+                )
+        elif not args:
+            raise ApplicationExcecutionError("Invalid Arguments")
+        out.append(explain_line(" ".join(args)))
+
+
+class Stdin:
+
+    """
+    The stdin of a call in a pipe, which remembers whether reading it
+    raised, so that errors of the calls before it are not taken for its
+    own errors.
+    """
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.failed = False
+
+    def __iter__(self):
+        try:
+            yield from self.chunks
+        except Exception:
+            self.failed = True
+            raise
+
+
 class UnsafeDecorator:
     def __init__(self, application, call):
         self.application = application
         self.call = call
 
+    def _error_message(self, error):
+        if isinstance(error, OSError):
+            return f"OS Error: {self.call.raw_command}\n"
+        elif isinstance(error, ApplicationExcecutionError):
+            return f"{error.message}: {self.call.raw_command}\n"
+        return f"Index Error: {self.call.raw_command}\n"
+
     def exec(self, args, out, in_pipe):
         try:
             self.application.exec(args, out, in_pipe)
-        except OSError:
-            out.append(f"OS Error: {self.call.raw_command}\n")
-        except ApplicationExcecutionError as e:
-            out.append(f"{e.message}: {self.call.raw_command}\n")
-        except IndexError:
-            out.append(f"Index Error: {self.call.raw_command}\n")
+        except (OSError, ApplicationExcecutionError, IndexError) as e:
+            out.append(self._error_message(e))
+
+    def stream(self, args, stdin):
+        if stdin is not None:
+            stdin = Stdin(stdin)
+        try:
+            yield from self.application.stream(args, stdin)
+        except (OSError, ApplicationExcecutionError, IndexError) as e:
+            if stdin is not None and stdin.failed:
+                raise
+            yield encode(self._error_message(e))
 
 
 def save_result_to_file(file_name, result):
-    f = open(file_name, "w+")
+    f = session.current().open(file_name, "w+")
     f.write(result)
     f.close()
 
 
+def close_stdin(chunks, stdin):
+    """
+    yields chunks, the output of a call, then closes stdin: a call which
+    ends before reading the whole of its stdin, like head, stops the calls
+    before it, which close their files, as SIGPIPE would.
+    """
+    try:
+        yield from chunks
+    finally:
+        close = getattr(stdin, "close", None)
+        if close:
+            close()
+
+
+def stream_to_file(file_name, chunks):
+    """writes chunks to a file as they are produced, yielding nothing"""
+    with session.current().open(file_name, "wb+") as f:
+        for chunk in chunks:
+            if type(chunk) is Lines:
+                f.writelines(chunk)
+            else:
+                f.write(chunk)
+    yield from ()
+
+
+APPLICATIONS = {
+    "pwd": Pwd,
+    "cd": Cd,
+    "ls": Ls,
+    "cat": Cat,
+    "echo": Echo,
+    "head": Head,
+    "tail": Tail,
+    "grep": Grep,
+    "cut": Cut,
+    "find": Find,
+    "uniq": Uniq,
+    "sort": Sort,
+    "clear": Clear,
+    "exit": Exit,
+    "jobs": Jobs,
+    "wait": Wait,
+    "fg": Fg,
+    "explain": Explain,
+}
+
+
 def application_factory(app):
-    application = {
-        "pwd": Pwd,
-        "cd": Cd,
-        "ls": Ls,
-        "cat": Cat,
-        "echo": Echo,
-        "head": Head,
-        "tail": Tail,
-        "grep": Grep,
-        "cut": Cut,
-        "find": Find,
-        "uniq": Uniq,
-        "sort": Sort,
-        "clear": Clear,
-        "exit": Exit,
-    }
-    return application[app]()
-
-
-def execute_application(call, out, in_pipe):
+    return APPLICATIONS[app]()
+
+
+def streams_bytes(app):
+    """
+    whether the application named app, perhaps unsafe, reads and writes
+    bytes with a stream of its own, which then runs its calls outside a
+    pipe too, so that a call reads a file as the calls of a pipe do,
+    rather than decoding it whole for exec
+    """
+    application = APPLICATIONS.get(app[1:] if app[:1] == "_" else app)
+    return application is not None and (
+        application.stream is not Application.stream
+        )
+
+
+def resolve_application(call):
+    """
+    returns the application of an invocation, wrapped in an
+    UnsafeDecorator if its name starts with _, or None if the unsafe
+    application is not supported. Applications keep no state, so the
+    application can be reused for every invocation of the same call.
+    """
     app = call.application
-    args = call.args
     if app[0] == "_":
         try:
-            app = application_factory(app[1:])
+            return UnsafeDecorator(application_factory(app[1:]), call)
         except KeyError:
-            out.append(f"Unsupported Application: {app[1:]}\n")
+            return None
+    return application_factory(app)
+
+
+def execute_application(call, out, in_pipe, application=None):
+    """
+    application is the application of the call if it has already been
+    resolved (see resolve_application).
+    """
+    if application is None:
+        application = resolve_application(call)
+        if application is None:
+            out.append(f"Unsupported Application: {call.application[1:]}\n")
             return
-        application = UnsafeDecorator(app, call)
-    else:
-        application = application_factory(app)
-    application.exec(args, out, in_pipe)
+    application.exec(call.args, out, in_pipe)
     if call.file_output:
         save_result_to_file(call.file_output, out.pop())
+
+
+def stream_application(call, stdin, application=None):
+    """
+    The streaming counterpart of execute_application: returns the output
+    of the application as an iterator of chunks of bytes, reading stdin,
+    an iterator of chunks or None for the first call of a pipe. Output
+    redirected to a file is written to it as it is produced.
+
+    Applications named in the PROCESS_APPLICATIONS setting run in a
+    worker process, which resolves the application itself.
+    """
+    if (
+        call.application.lstrip("_") in PROCESS_APPLICATIONS
+        and not process_stages.WORKER
+    ):
+        return ProcessStage(_stream_application, (call,), stdin)
+    return _stream_application(call, stdin, application)
+
+
+def _stream_application(call, stdin, application=None):
+    """
+    stdin is closed once the output is read, even the output of an
+    unsupported application, which does not read it
+    """
+    if application is None:
+        application = resolve_application(call)
+    if application is None:
+        output = iter([
+            encode(f"Unsupported Application: {call.application[1:]}\n")
+            ])
+    else:
+        output = application.stream(call.args, stdin)
+        if call.file_output:
+            output = stream_to_file(call.file_output, output)
+    if stdin is None:
+        return output
+    return close_stdin(output, stdin)
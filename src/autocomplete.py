@@ -1,6 +1,7 @@
 """ OS Module used to get paths """
-from os import getcwd, listdir, path
+from os import listdir, path
 import readline
+import session
 
 APPLICATIONS = {
     "pwd": "",
@@ -17,6 +18,10 @@ APPLICATIONS = {
     "find": "",
     "sort": "-r",
     "cut": "-b",
+    "jobs": "",
+    "wait": "",
+    "fg": "",
+    "explain": "",
 }
 
 
@@ -82,7 +87,7 @@ class Completer:  # Custom completer
 
     def autocomplete_files_and_folders(self, current_text, text, state):
         """ Returns list of matches by file and folders """
-        ls_dir = getcwd()
+        ls_dir = session.current().cwd
         if "/" in current_text[-1]:
             ls_dir += "/" + current_text[-1][: current_text[-1].rindex("/")]
         self.set_options_to_files_and_folders(ls_dir)
@@ -0,0 +1,68 @@
+"""
+Values kept as pickle files in CACHE_DIR, e.g. parse tables and compiled
+scripts.
+"""
+import os
+import pickle
+
+
+def read_cache(cache_file):
+    """
+    Returns the value kept in cache_file, or None if the file is missing
+    or cannot be loaded.
+    """
+    try:
+        with open(cache_file, "rb") as f:
+            return pickle.load(f)
+    except Exception:  # missing, corrupt or incompatible, so rebuild it
+        return None
+
+
+def touch_cache(cache_file):
+    """marks a cache file as used, see write_cache"""
+    try:
+        os.utime(cache_file)
+    except OSError:
+        pass
+
+
+def _prune(cache_dir, keep):
+    """removes the files of cache_dir but the keep last used"""
+    paths = [
+        os.path.join(cache_dir, name) for name in os.listdir(cache_dir)
+        if not name.startswith(".tmp-")
+    ]
+    if len(paths) <= keep:
+        return
+    paths.sort(key=os.path.getmtime)
+    for path in paths[:len(paths) - keep]:
+        os.remove(path)
+
+
+def write_cache(value, cache_file, replaces=None, keep=None):
+    """
+    Writes the cache atomically, so concurrent shells never read a
+    partially written file. Other files of the cache directory whose
+    names start with replaces, older versions of the value, are removed,
+    and if keep is given, files of the directory but the keep last written
+    or touched (see touch_cache). A cache directory which cannot be
+    written to is ignored.
+    """
+    import tempfile
+
+    cache_dir, name = os.path.split(cache_file)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=cache_dir, prefix=".tmp-", delete=False
+        ) as f:
+            pickle.dump(value, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(f.name, cache_file)
+        if replaces:
+            for old in os.listdir(cache_dir):
+                if old.startswith(replaces) and old != name:
+                    os.remove(os.path.join(cache_dir, old))
+        if keep is not None:
+            _prune(cache_dir, keep)
+    except OSError:
+        pass
@@ -1,212 +1,197 @@
-from glob import glob
-from lark.visitors import Visitor_Recursive
-from lark import Token
-from parser import Parser
+import re
+import session
+from functools import lru_cache
+from collections import deque, namedtuple
 from exceptions import InvalidCommandSubstitution
+from settings import PLAN_CACHE_SIZE
 
+UNQUOTED = "unquoted"
+QUOTED = "quoted"
+BACKQUOTED = "backquoted"
 
-class CommandSubstituitionVisitor(Visitor_Recursive):
-    """
-    Visits a call tree, and replaces backquoted content
-    with its evaluated result.
+DOUBLE_QUOTED_BACKQUOTES = re.compile("`([^`]*)`")
 
-    echo `echo foo` -> echo foo
-    `echo echo` bar -> echo bar
-    """
+# number of distinct argument templates shared between plans
+ARGUMENT_CACHE_SIZE = 4096
 
-    def __init__(self, out):
-        self.out = out
+# a piece of an argument together with how it was quoted, e.g.
+# a"b`c`" -> Part(a, unquoted), Part(b, quoted), Part(c, backquoted)
+Part = namedtuple("Part", ["text", "quoting"])
 
-    def _eval_command_substituition(self, command, out):
-        """
-        Evaluates command substitution and returns the number of outputs
-        to be taken from out. e.g.
-
-        `echo foo` -> 1
-        `echo foo; echo bar' -> 2
-        """
-        from commands import Seq
-        from command_evaluator import extract_raw_commands
-
-        parser = Parser()
-        command_tree = parser.command_level_parse(command)
-        if not command_tree:
-            return
-        raw_commands = extract_raw_commands(command_tree)
-        seq = Seq(raw_commands)
-        seq.eval(out)
-        return len(raw_commands)
-
-    def backquoted(self, tree):
-        """
-        If the call contains a backquote,
-        we evaluate and replace the backquoted
-        argument with the results in out.
-        """
-        no_of_outputs = self._eval_command_substituition(
-            tree.children[0], self.out
-            )
-        if not no_of_outputs:
-            raise InvalidCommandSubstitution(
-                "Invalid Command Substitution: " + str(tree.children[0])
-            )
-        res = []
-        for _ in range(no_of_outputs):  # get correct no. of outputs from out
-            res.append(self.out.pop().replace("\n", " ").strip())
-        res.reverse()
-        # replace backquoted command with outputs
-        tree.children[0] = " ".join(res)
 
+class Argument(namedtuple("Argument", ["parts", "globbing"])):
 
-class RedirectionVisitor(Visitor_Recursive):
     """
-    Visits a redirection tree, a sub tree of a call tree,
-    and extracts the IO type (< or >), and the file name.
+    An argument template. Backquoted parts are substituted, and the
+    argument is globbed if it contains an unquoted *, in the working
+    directory of the session (see session.py), every time the argument
+    is resolved.
     """
 
-    def __init__(self):
-        self.io_type = None
-        self.file_name = ""
-
-    def _extract_quoted_content(self, node):
-        if len(node.children) > 0:
-            self.file_name += str(node.children[0])
-        else:
-            self.file_name += ""
+    __slots__ = ()
+
+    @property
+    def static(self):
+        """whether the argument is neither substituted nor globbed"""
+        return not self.globbing and all(
+            part.quoting != BACKQUOTED for part in self.parts
+        )
+
+    def resolve(self, substitute):
+        arg = "".join(
+            substitute(part.text) if part.quoting == BACKQUOTED
+            else part.text
+            for part in self.parts
+        )
+        if self.globbing:
+            globbing = session.current().glob(arg)
+            if globbing:
+                return " ".join(globbing)
+        return arg
 
-    def _double_quoted(self, tree):
-        """
-        extracts the string inside of double quotes
-        including nested backquotes.
-        """
-        for child in tree.children:
-            if type(child) is Token:
-                self.file_name += str(child)
-            else:  # backquoted
-                self._extract_quoted_content(child)
 
-    def _quoted(self, tree):
-        for child in tree.children:
-            if child.data == "double_quoted":
-                self._double_quoted(child)
-            else:  # single quoted or backquoted
-                self._extract_quoted_content(child)
+class CallPlan(namedtuple("CallPlan", ["application", "args", "file_output"])):
 
-    def argument(self, tree):
-        for child in tree.children:
-            if type(child) is Token:
-                self.file_name += str(child)
-            else:
-                self._quoted(child)
+    """
+    The immutable plan of a call: the application, argument and
+    output redirection templates. Plans only depend on the text of a
+    call, so they can be reused for every execution of that text.
+    """
 
-    def redirection(self, tree):
-        self.io_type = str(tree.children[0])
+    __slots__ = ()
+
+    @property
+    def static(self):
+        """whether no template of the call is substituted or globbed"""
+        templates = (self.application,) + self.args
+        if self.file_output:
+            templates += (self.file_output,)
+        return all(template.static for template in templates)
+
+    @property
+    def substitutions(self):
+        """the commands of every command substitution slot in the call"""
+        arguments = (self.application,) + self.args
+        if self.file_output:
+            arguments += (self.file_output,)
+        return [
+            part.text
+            for argument in arguments
+            for part in argument.parts
+            if part.quoting == BACKQUOTED
+        ]
+
+    def resolve(self, substitute):
+        """
+        returns the application, arguments and file output of one
+        execution of the call. substitute evaluates the command of a
+        command substitution and returns its output.
+        """
+        application = self.application.resolve(substitute)
+        args = [arg.resolve(substitute) for arg in self.args]
+        file_output = None
+        if self.file_output:
+            file_output = self.file_output.resolve(substitute)
+        return application, args, file_output
+
+    def compile(self):
+        """
+        returns a function of substitute like resolve, for which the
+        templates which are static are resolved once, so that only command
+        substitution and globbing run on every execution.
+        """
+        if self.static:
+            application, args, file_output = self.resolve(None)
+            args = tuple(args)
+            return lambda substitute: (application, list(args), file_output)
+
+        def resolved(template):
+            return template.resolve(None) if template.static else template
+
+        application = resolved(self.application)
+        args = tuple(map(resolved, self.args))
+        file_output = self.file_output and resolved(self.file_output)
+
+        def resolve(substitute):
+            return (
+                application if type(application) is str
+                else application.resolve(substitute),
+                [
+                    arg if type(arg) is str else arg.resolve(substitute)
+                    for arg in args
+                ],
+                file_output if type(file_output) is not Argument
+                else file_output.resolve(substitute),
+            )
 
+        return resolve
 
-class CallTreeVisitor(Visitor_Recursive):
 
+def command_substitution(command):
     """
-    Visits the nodes of a call tree generated by the lark grammar.
-    extracts the application, the arguments, and file output if any.
-    e.g.
+    Evaluates the command of a command substitution, and returns its
+    output with newlines replaced by spaces. e.g.
 
-    echo foo bar > file.txt -> application = echo
-                               args = [foo, bar]
-                               file_output = "file.txt"
+    `echo foo` -> foo
+    `echo foo; echo bar` -> foo bar
     """
+    from command_evaluator import compile_command_line
 
-    def __init__(self):
-        self.application = None
-        self.args = []
-        self.file_output = None
+    seq = compile_command_line(command)
+    if not seq:
+        raise InvalidCommandSubstitution(
+            "Invalid Command Substitution: " + command
+        )
+    out = deque()
+    seq.eval(out)
+    return " ".join(output.replace("\n", " ").strip() for output in out)
 
-    def _redirection(self, tree):
-        redirection_visitor = RedirectionVisitor()
-        redirection_visitor.visit_topdown(tree)
-        if redirection_visitor.io_type == ">":
-            self.file_output = redirection_visitor.file_name
-        else:
-            self.args.append(redirection_visitor.file_name)
 
-    def _extract_quoted_content(self, node):
-        if len(node.children) > 0:
-            return node.children[0]
-        else:
-            return ""
+def _double_quoted_parts(content):
+    """
+    splits the content of double quotes into its quoted parts and
+    nested backquotes, e.g. a `echo b` -> a (quoted), echo b (backquoted)
+    """
+    pieces = DOUBLE_QUOTED_BACKQUOTES.split(content)
+    for i, text in enumerate(pieces):
+        if i % 2:
+            yield Part(text, BACKQUOTED)
+        elif text:
+            yield Part(text, QUOTED)
 
-    def _double_quoted(self, tree):
-        """
-        extracts the string inside of double quotes
-        including nested backquotes
-        """
-        double_quoted_args = ""
-        for child in tree.children:
-            if type(child) is Token:
-                double_quoted_args += str(child)
-            else:  # backquoted
-                double_quoted_args += self._extract_quoted_content(child)
-        return double_quoted_args
-
-    def _quoted(self, tree):
-        quoted_args = ""
-        for child in tree.children:
-            if child.data == "double_quoted":
-                quoted_args += self._double_quoted(child)
-            else:  # single quoted or backquoted
-                quoted_args += self._extract_quoted_content(child)
-        return quoted_args
-
-    def _globbing(self, arg, unquoted_asterisk):
-        if unquoted_asterisk:
-            globbing = glob(arg)
-            if globbing:
-                self.args.append(" ".join(globbing))
-                return
-        self.args.append(arg)
 
-    def _argument(self, tree):
-        """
-        extracts the argument from an atom, and applys
-        globbing if there is an unquoted *.
-        """
-        unquoted_asterisk = False
-        arg = ""
-        for child in tree.children:
-            if type(child) is Token:
-                arg += str(child)
-                unquoted_asterisk = "*" in str(child)
-            else:
-                arg += self._quoted(child)
-        self._globbing(arg, unquoted_asterisk)
-
-    def atom(self, tree):
-        for child in tree.children:
-            if child.data == "redirection":
-                self._redirection(child)
-            if child.data == "argument":
-                self._argument(child)
-
-    def _application(self, tree):
-        """
-        Extracts the application from the argument
-        including if the application is bound by
-        quotes.
-        """
-        application = ""
-        for child in tree.children:
-            if type(child) is Token:
-                application += str(child)
-            else:
-                application += self._quoted(child)
-            self.application = application
-
-    def call(self, tree):
-        for child in tree.children:
-            if child.data == "argument":
-                """
-                an argument which is a child of a call
-                will always contain the application.
-                """
-                self._application(child)
-            elif child.data == "redirection":
-                self._redirection(child)
+@lru_cache(maxsize=ARGUMENT_CACHE_SIZE)
+def argument_template(tokens, globbing=False):
+    """
+    Builds the template of an argument from the text of its tokens, e.g.
+    ("a", "'b'") for a'b'. If globbing is set, the argument is globbed
+    when it contains an unquoted *. Templates are immutable, so every
+    plan shares the templates of common arguments.
+    """
+    parts = []
+    for token in tokens:
+        quote = token[0]
+        if quote == "'":
+            parts.append(Part(token[1:-1], QUOTED))
+        elif quote == "`":
+            parts.append(Part(token[1:-1], BACKQUOTED))
+        elif quote == '"':
+            parts.extend(_double_quoted_parts(token[1:-1]))
+        else:
+            parts.append(Part(token, UNQUOTED))
+    globbing = globbing and any(
+        part.quoting == UNQUOTED and "*" in part.text for part in parts
+    )
+    return Argument(tuple(parts), globbing)
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def call_plan(raw_command):
+    """returns the plan of a call, or None if it is not recognized"""
+    from command_evaluator import parse
+
+    call = parse(raw_command, start="call")
+    if not call:
+        return None
+    _, plan = call
+    return plan
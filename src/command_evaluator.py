@@ -1,84 +1,153 @@
-from lark import Tree
-from lark.lexer import Token
-from lark.visitors import Visitor_Recursive
-from commands import Call, Pipe
+import gc
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from collections import namedtuple
+from parser import Parser, Transformer
+from call_evaluator import CallPlan, argument_template
+from commands import Background, Call, Pipe, Seq, has_empty_job
+from explain import explain_command
+from scanner import is_unquoted, scan
+from settings import PLAN_CACHE_SIZE
 
+# the token texts of an argument, its redirection (< or >) if any, and
+# where its text starts and ends in the command line
+Span = namedtuple("Span", ["tokens", "io_type", "start", "end"])
+
+
+class CommandTransformer(Transformer):
 
-class CommandTreeVisitor(Visitor_Recursive):
     """
-    Visits a command tree generated by the command grammar
-    and extracts each raw command and what they are seperated by
+    Builds the commands of a command line while it is parsed, in a single
+    pass: arguments, quoting and redirections of every call are already
+    resolved into a CallPlan when the call is reduced.
     e.g.
-    echo "foo"; echo bar | echo -> [Call, Pipe]
+    echo "foo"; echo bar | echo -> Seq([Call, Pipe])
 
                           where -> Call.raw_command = echo "foo"
-                                   Pipe.lhs = echo bar
-                                   Pipe.rhs = echo
+                                   Pipe.calls = (echo bar, echo)
+
+    The transformer is shared by every parse, so the command line being
+    parsed is kept per thread.
     """
 
     def __init__(self):
-        self.raw_commands = []
+        self._local = threading.local()
 
-    def pipe(self, tree):
-        lhs = self.raw_commands.pop(-2)
-        rhs = self.raw_commands.pop(-1)
-        self.raw_commands.append(Pipe(lhs, rhs))
+    @property
+    def text(self):
+        return self._local.text
 
-    def _extract_quoted_content(self, node, quote: str):
-        """
-        extracts the content of a quote-node, aswell
-        as what quote it is bound by.
-        e.g. (Tree("double_quoted" [(Token, 'foo')])) -> "foo"
-        """
-        if len(node.children) > 0:
-            return quote + node.children[0] + quote
-        else:
-            return quote + quote
+    @text.setter
+    def text(self, text):
+        self._local.text = text
 
-    def _double_quoted(self, tree):
-        """
-        extracts the content of a double quoted node,
-        aswell as nested backquotes.
-        """
-        double_quoted_args = '"'
-        for child in tree.children:
-            if(type(child) is Token):
-                double_quoted_args += str(child)
-            else:  # backquoted
-                double_quoted_args += self._extract_quoted_content(child, "`")
-        return double_quoted_args + '"'
-
-    def _quoted(self, tree):
-        """
-        Extracts the contents of a qouted node, including
-        what quotes the content is bound by.
-        """
-        quoted_args = ""
-        for child in tree.children:
-            if(child.data == "double_quoted"):
-                quoted_args += self._double_quoted(child)
-            elif(child.data == "single_quoted"):
-                quoted_args += self._extract_quoted_content(child, "'")
-            else:  # backquoted
-                quoted_args += self._extract_quoted_content(child, "`")
-        return quoted_args
-
-    def call(self, tree):
+    def argument(self, tokens):
+        return Span(
+            tuple(str(token) for token in tokens),
+            None,
+            tokens[0].pos_in_stream,
+            tokens[-1].end_pos,
+        )
+
+    def redirection(self, children):
+        io_type = children[0]
+        argument = children[-1]
+        return Span(
+            argument.tokens, str(io_type), io_type.pos_in_stream, argument.end
+        )
+
+    def call(self, children):
         """
-        iterates over the children of a call node
-        extracting the contents, including what is
-        bound by quotes.
+        returns the raw command and plan of a call. The first argument
+        which is not redirected is the application, input files are
+        passed to the application as arguments.
         """
-        args = ""
-        for child in tree.children:
-            if (type(child) == Tree) and child.data == "quoted":
-                args += self._quoted(child)
+        if not children:
+            return "", None
+        application = None
+        args = []
+        file_output = None
+        for child in children:
+            if child.io_type == ">":
+                file_output = argument_template(child.tokens)
+            elif child.io_type == "<":
+                args.append(argument_template(child.tokens))
+            elif application is None:
+                application = argument_template(child.tokens)
             else:
-                args += str(child)
-        self.raw_commands.append(Call((args).strip()))
+                args.append(argument_template(child.tokens, globbing=True))
+        raw_command = self.text[children[0].start:children[-1].end]
+        return raw_command, CallPlan(application, tuple(args), file_output)
+
+    def _command(self, command):
+        if type(command) is tuple:
+            return Call(*command)
+        return command
+
+    def pipe(self, calls):
+        return Pipe(*[self._command(call) for call in calls])
+
+    def background(self, children):
+        return Background(self._command(children[0]))
+
+    def command(self, children):
+        """a command line with an empty background job is not recognized"""
+        commands = [self._command(command) for command in children]
+        return not has_empty_job(commands) and Seq(commands)
 
 
-def extract_raw_commands(command_tree):
-    command_tree_visitor = CommandTreeVisitor()
-    command_tree_visitor.visit(command_tree)
-    return command_tree_visitor.raw_commands
+TRANSFORMER = CommandTransformer()
+
+
+@contextmanager
+def _gc_paused():
+    """
+    Parsing a long command line allocates many objects which all stay
+    alive, so the garbage collector would repeatedly scan them without
+    freeing anything.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def lark_parse(text, start="command"):
+    """parses text with the grammar, see parse"""
+    TRANSFORMER.text = text
+    return Parser(TRANSFORMER).parse(text, start)
+
+
+def parse(text, start="command"):
+    """
+    Parses a command line into its Seq of commands, or a single call
+    (start="call") into its raw command and plan. Returns False if the
+    text is not recognized.
+
+    Most command lines contain no quotes, those are scanned without
+    running the parser. A command line starting with explain is not
+    parsed, it is explained (see explain.py).
+    """
+    if start == "command":
+        explained = explain_command(text)
+        if explained:
+            return Seq([explained])
+    with _gc_paused():
+        if is_unquoted(text):
+            return scan(text, start)
+        return lark_parse(text, start)
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def compile_command_line(cmdline):
+    """
+    Returns the Seq of commands of a command line, or None if it is not
+    recognized. Commands are never modified by evaluation, so the plans
+    of recently seen command lines are kept and reused;
+    compile_command_line.cache_info() reports the hits and misses.
+    """
+    return parse(cmdline) or None
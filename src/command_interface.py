@@ -5,6 +5,8 @@ from typing import Optional, Deque
 class Command(metaclass=ABCMeta):
     """Abstract class method for Commands Call, Pipe, and Seq"""
 
+    __slots__ = ()
+
     @classmethod
     def __subclasshook__(cls, subclass):
         return hasattr(subclass, "eval") and callable(subclass.exec)
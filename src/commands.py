@@ -1,118 +1,246 @@
-from parser import Parser
-from call_evaluator import CommandSubstituitionVisitor
-from call_evaluator import CallTreeVisitor
-from applications import execute_application
+from collections import namedtuple
+import jobs
+import process_stages
+from application_interface import decode, encode
+from call_evaluator import call_plan, command_substitution
+from applications import (
+    APPLICATIONS,
+    execute_application,
+    resolve_application,
+    stream_application,
+    streams_bytes,
+)
 from command_interface import Command
+from executors import EXECUTORS
+from output import Output
+from pipe_rewrites import rewrite
+from settings import PIPE_EXECUTOR, SEQ_EXECUTOR
+
+# one execution of a call, with command substitution and globbing done
+Invocation = namedtuple(
+    "Invocation", ["raw_command", "application", "args", "file_output"]
+    )
+
+# the functions executing a compiled call, eval(out, in_pipe) and
+# stream(stdin), like Call.eval and Call.stream
+CompiledCall = namedtuple("CompiledCall", ["eval", "stream"])
+
+
+def _supported(app):
+    """whether resolve_application resolves an application named app"""
+    return app[1:] in APPLICATIONS if app[:1] == "_" else app in APPLICATIONS
+
+
+def compile_call(raw_command, plan):
+    """
+    Compiles the plan of a call into the functions executing it. The
+    arguments and file output which are neither substituted nor globbed
+    are resolved once (see CallPlan.compile), and so is the application,
+    with its UnsafeDecorator, unless its name is substituted or globbed,
+    or it is not supported, which is reported on every execution as
+    before. Command substitution and globbing run on every execution.
+
+    Outside a pipe, the applications with a stream of their own (see
+    streams_bytes) are streamed as the first call of a pipe is, so that
+    a call reads its files as bytes wherever it runs.
+    """
+    resolve = plan.compile()
+    application = None
+    if plan.application.static:
+        app = plan.application.resolve(None)
+        if _supported(app):
+            application = resolve_application(
+                Invocation(raw_command, app, [], None)
+                )
+
+    def eval(out, in_pipe=False):
+        app, args, file_output = resolve(command_substitution)
+        if not app:
+            return
+        invocation = Invocation(raw_command, app, args, file_output)
+        if in_pipe or not streams_bytes(app):
+            execute_application(invocation, out, in_pipe, application)
+        else:
+            emit(out, stream_application(invocation, None, application))
+
+    def stream(stdin=None):
+        app, args, file_output = resolve(command_substitution)
+        if not app:
+            return stdin or iter(())
+        return stream_application(
+            Invocation(raw_command, app, args, file_output),
+            stdin,
+            application,
+            )
+
+    return CompiledCall(eval, stream)
 
 
 class Call(Command):
-    def __init__(self, raw_command):
+
+    """
+    A call keeps its raw command, which error messages quote, its plan
+    and, once it has run, its compiled call. Commands are kept by the
+    plan caches, so they have no instance dicts.
+    """
+
+    __slots__ = ("raw_command", "plan", "compiled")
+
+    def __init__(self, raw_command, plan=None):
+        """
+        plan is the CallPlan of raw_command, if the command line parser
+        has already built it. Otherwise raw_command is parsed.
+        """
         self.raw_command = raw_command
+        self.plan = plan or call_plan(raw_command)
+        self.compiled = None
+
+    def __reduce__(self):
+        """a call is pickled without its compiled call, compiled again"""
+        return Call, (self.raw_command, self.plan)
 
-        self.application = None
-        self.args = []
-        self.file_output = None
+    def _compile(self):
+        if self.compiled is None:
+            self.compiled = compile_call(self.raw_command, self.plan)
+        return self.compiled
 
-    def _valid(self, out, call_tree):
-        if not call_tree:
+    def _valid(self, out):
+        if not self.plan:
             if self.raw_command:
                 out.append(f"Unrecognized Command: {self.raw_command}\n")
             return False
         return True
 
-    def _eval_command_subsitution(self, out, call_tree):
-        command_substituition_visitor = CommandSubstituitionVisitor(out)
-        command_substituition_visitor.visit(call_tree)
+    def eval(self, out, in_pipe=False):
+        """
+        executes the compiled call, running command substitution and
+        globbing afresh.
+        """
+        if not self._valid(out):
+            return
+        (self.compiled or self._compile()).eval(out, in_pipe)
 
-    def _visit_call_tree(self, call_tree):
+    def stream(self, stdin=None):
         """
-        visits call tree and extracts application, arguments, and
-        file output (if any).
+        executes the compiled call like eval, and returns the output of
+        the application as an iterator of chunks of bytes. stdin is the
+        output of the previous call of a pipe, or None for the first call.
+        An empty call passes stdin on.
         """
-        call_tree_visitor = CallTreeVisitor()
-        call_tree_visitor.visit_topdown(call_tree)
+        if not self.plan:
+            if self.raw_command:
+                return iter(
+                    [encode(f"Unrecognized Command: {self.raw_command}\n")]
+                    )
+            return stdin or iter(())
+        return (self.compiled or self._compile()).stream(stdin)
 
-        self.application = call_tree_visitor.application
-        self.args = call_tree_visitor.args
-        self.file_output = call_tree_visitor.file_output
 
-    def eval(self, out, in_pipe=False):
-        parser = Parser()
-        call_tree = parser.call_level_parse(self.raw_command)
-        if not self._valid(out, call_tree):
-            return
-        else:
-            self._eval_command_subsitution(out, call_tree)
-            self._visit_call_tree(call_tree)
-            if self.application:
-                execute_application(self, out, in_pipe)
+def emit(out, chunks):
+    """
+    adds output, chunks of bytes, to out, decoded, unless out is the
+    shell's Output, which writes the chunks while they are produced
+    """
+    if isinstance(out, Output):
+        out.write_stream(chunks)
+        return
+    output = b"".join(map(bytes, chunks))
+    if output:
+        out.append(decode(output))
 
 
-class PipeIterator:
+class Pipe(Command):
+
     """
-    Allows ordered iteration over all calls in a pipe
+    A Pipe is a flat sequence of calls, call | call | ... | call
     """
 
-    def _calls(self, pipe):
-        calls = []
-        while type(pipe.lhs()) is Pipe:
-            calls.append(pipe.rhs())
-            pipe = pipe.lhs()
-        calls.append(pipe.rhs())
-        calls.append(pipe.lhs())
-        calls.reverse()
-        return calls
+    __slots__ = ("calls", "rewritten")
 
-    def __init__(self, pipe):
-        self.index = 0
-        self.calls = self._calls(pipe)
+    def __init__(self, *calls):
+        self.calls = calls
+        self.rewritten = None
 
-    def __next__(self):
-        if self.index >= len(self.calls):
-            raise StopIteration
-        index = self.index
-        self.index += 1
-        return self.calls[index]
+    def __iter__(self):
+        return iter(self.calls)
 
+    def __reduce__(self):
+        """a pipe is pickled without its rewritten calls, rewritten again"""
+        return Pipe, self.calls
 
-class Pipe(Command):
+    def _rewrite(self):
+        if self.rewritten is None:
+            self.rewritten, _ = rewrite(self.calls)
+        return self.rewritten
+
+    def eval(self, out):
+        """
+        The calls of a pipe are chained as streams: every call, excluding
+        the first, reads the output of the previous call as its stdin, a
+        chunk at a time, while it is produced. Only the output of the last
+        call is kept whole, and added to out, decoded, unless out is the
+        shell's Output, which writes its bytes while they are produced. The
+        calls are rewritten once, by the rules of the PIPE_REWRITES setting
+        (see pipe_rewrites.py), and run by the executor of the
+        PIPE_EXECUTOR setting, or in the current thread in a worker
+        process.
+        """
+        executor = "sequential" if process_stages.WORKER else PIPE_EXECUTOR
+        emit(out, EXECUTORS[executor](self.rewritten or self._rewrite()))
+
+
+class Background(Command):
 
     """
-    A Pipe is made up of Calls and/or other Pipes where:
-        lhs = pipe | call
-        rhs = call
+    A command followed by &, run as a background job (see jobs.py): its
+    output is kept by the job rather than added to out.
     """
 
-    def __init__(self, lhs, rhs):
-        self.calls = (lhs, rhs)
+    __slots__ = ("command",)
 
-    def lhs(self):
-        return self.calls[0]
+    def __init__(self, command):
+        self.command = command
 
-    def rhs(self):
-        return self.calls[1]
+    @property
+    def raw_command(self):
+        if type(self.command) is Pipe:
+            return " | ".join(call.raw_command for call in self.command)
+        return self.command.raw_command
 
-    def __iter__(self):
-        return PipeIterator(self)
+    def eval(self, out, in_pipe=False):
+        jobs.start(self.raw_command, self.command)
 
-    def eval(self, out):
-        """
-        For every command in a pipe, excluding the first, we take input from
-        out as args by passing in in_pipe as true when evaluating each call
-        """
-        first_call = True
-        for call in self:
-            if first_call:
-                call.eval(out)
-                first_call = False
-            else:
-                call.eval(out, True)
+
+def has_empty_job(commands):
+    """
+    whether a command of commands runs nothing in the background, as in
+    "&" or "a && b", which a command line is not to have
+    """
+    return any(
+        type(command) is Background and not command.raw_command
+        for command in commands
+        )
 
 
 class Seq(Command):
+
+    __slots__ = ("commands",)
+
     def __init__(self, commands):
-        self.commands = commands
+        self.commands = tuple(commands)
 
     def eval(self, out):
+        """
+        the shell's Output is flushed as soon as each command has run.
+        With the SEQ_EXECUTOR setting other than sequential, commands run
+        side by side where they cannot conflict (see scheduler.py).
+        """
+        if SEQ_EXECUTOR != "sequential" and len(self.commands) > 1:
+            from scheduler import scheduled
+
+            scheduled(self.commands, out, SEQ_EXECUTOR)
+            return
         for commands in self.commands:
             commands.eval(out)
+            if isinstance(out, Output):
+                out.flush()
@@ -0,0 +1,218 @@
+"""
+Executors of pipes. The calls of a pipe are chained as streams, every
+call reading the output of the previous call as its stdin (see
+Call.stream); an executor decides where the streams run. An executor
+takes the calls of a pipe and returns the output of the last call as an
+iterator of chunks of bytes.
+"""
+import sys
+import threading
+from contextvars import copy_context
+from queue import Queue, Empty, Full
+from application_interface import Lines, keep
+from pipe_buffers import PipeBuffer
+from process_stages import ProcessStage
+from settings import PIPE_QUEUE_SIZE
+
+# the most frames reading a chunk of a stream runs through for each call,
+# an unsafe call of grep taking the most, the frames left to the callers
+# of a pipe, and the frames the reader of a stream takes itself
+CALL_FRAMES = 8
+CALLER_FRAMES = 200
+READER_FRAMES = 30
+
+# the most calls of a pipe chained into a single stream: reading a stream
+# runs through the frames of each of its calls, so pipes which would
+# exceed the recursion limit are streamed in segments, with the output of
+# each segment collected in a PipeBuffer (100 calls with the default
+# limit, fewer if a pipe runs with fewer frames left, see _stream_depth)
+STREAM_DEPTH = (sys.getrecursionlimit() - CALLER_FRAMES) // CALL_FRAMES
+
+# the most threads the calls of a pipe are spread over
+PIPE_THREADS = 64
+
+# the most worker processes the calls of a pipe are spread over
+PIPE_PROCESSES = 16
+
+# the most chunks, and about the most bytes, passed through a queue at once
+BATCH_SIZE = 256
+BATCH_BYTES = 8 * 1024
+
+# seconds between checks of a thread waiting on a full queue whether its
+# stage has been closed
+CLOSE_POLL = 0.05
+
+_DONE = object()
+
+
+class _Failure:
+
+    """an exception raised by a stage, raised again by its reader"""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error):
+        self.error = error
+
+
+def _stream_depth():
+    """
+    STREAM_DEPTH, or fewer calls if fewer frames are left below the
+    recursion limit for a stream read about where it is chained
+    """
+    frames = 0
+    frame = sys._getframe()
+    while frame is not None:
+        frames += 1
+        frame = frame.f_back
+    room = sys.getrecursionlimit() - frames - READER_FRAMES
+    return max(1, min(STREAM_DEPTH, room // CALL_FRAMES))
+
+
+def sequential(calls, stdin=None):
+    """chains the calls in the current thread"""
+    stream_depth = _stream_depth()
+    stream = stdin
+    for depth, call in enumerate(calls):
+        if depth and depth % stream_depth == 0:
+            buffer = PipeBuffer()
+            buffer.extend(stream)
+            stream = iter(buffer)
+        stream = call.stream(stream)
+    return stream
+
+
+class ThreadedStage:
+
+    """
+    Runs a stream in a thread, which passes its chunks in batches through
+    a bounded queue to the reader of the stage, copying chunks which are
+    views of a buffer (see Application.stream). A Lines chunk, a batch of
+    lines already, is passed in a batch of its own. When the queue is full the
+    thread waits for the reader, so a slow reader throttles the stream.
+    An exception raised by the stream is raised again by the reader. The
+    thread runs in the context of the thread creating the stage, so in
+    its session (see session.py).
+
+    A stage is closed once its reader stops reading, which stops the
+    thread and closes the stream.
+    """
+
+    def __init__(self, stream, queue_size=PIPE_QUEUE_SIZE,
+                 batch_size=BATCH_SIZE):
+        self.queue = Queue(queue_size)
+        self.batch_size = batch_size
+        self.closed = threading.Event()
+        self.thread = threading.Thread(
+            target=copy_context().run, args=(self._run, stream), daemon=True
+            )
+        self.thread.start()
+
+    def _put(self, item):
+        """waits for room in the queue, returns False if the stage is closed"""
+        while not self.closed.is_set():
+            try:
+                self.queue.put(item, timeout=CLOSE_POLL)
+                return True
+            except Full:
+                pass
+        return False
+
+    def _run(self, stream):
+        try:
+            batch = []
+            size = 0
+            for chunk in stream:
+                batch.append(keep(chunk))
+                size += BATCH_BYTES if type(chunk) is Lines else len(chunk)
+                if len(batch) == self.batch_size or size >= BATCH_BYTES:
+                    if not self._put(batch):
+                        return
+                    batch = []
+                    size = 0
+            if not batch or self._put(batch):
+                self._put(_DONE)
+        except BaseException as e:
+            self._put(_Failure(e))
+        finally:
+            close = getattr(stream, "close", None)
+            if close:
+                close()
+
+    def __iter__(self):
+        try:
+            while True:
+                item = self.queue.get()
+                if item is _DONE:
+                    return
+                elif type(item) is _Failure:
+                    raise item.error
+                yield from item
+        finally:
+            self.close()
+
+    def close(self):
+        """
+        stops the thread, which sees the stage is closed once it next puts
+        a batch, and ends the queue for a reader waiting on it.
+        """
+        self.closed.set()
+        while True:
+            try:
+                while True:
+                    self.queue.get_nowait()
+            except Empty:
+                pass
+            try:
+                self.queue.put_nowait(_DONE)
+                return
+            except Full:
+                pass
+
+
+def _segments(calls, threads):
+    size = -(-len(calls) // threads)
+    return [calls[i:i + size] for i in range(0, len(calls), size)]
+
+
+def threaded(calls, threads=PIPE_THREADS):
+    """
+    runs the calls in threads of their own, the last call in the current
+    thread. Pipes of more calls than threads are split into segments of
+    consecutive calls, chained in a thread.
+    """
+    *segments, last = _segments(calls, threads)
+    stages = []
+    stream = None
+    try:
+        for segment in segments:
+            stream = ThreadedStage(sequential(segment, stream))
+            stages.append(stream)
+        yield from sequential(last, stream)
+    finally:
+        for stage in stages:
+            stage.close()
+        for stage in stages:
+            stage.thread.join()
+
+
+def processes(calls, workers=PIPE_PROCESSES):
+    """
+    runs the calls in worker processes of their own, split into segments
+    of consecutive calls like threaded, passing their output through
+    shared memory (see process_stages.py).
+    """
+    stream = None
+    for segment in _segments(calls, workers):
+        stream = ProcessStage(sequential, (segment,), stream)
+    try:
+        yield from stream
+    finally:
+        stream.close()
+
+
+EXECUTORS = {
+    "sequential": sequential,
+    "threaded": threaded,
+    "processes": processes,
+}
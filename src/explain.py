@@ -0,0 +1,244 @@
+"""
+The explain builtin. explain CMDLINE prints the plan of a command line
+without running it: for every call, the application it resolves to, the
+arguments it would receive after globbing, where its output goes, the
+sizes of the files it names and how it would be run, and which commands
+of the sequence would run side by side. Command substitutions are not
+run, they are reported as such.
+"""
+import os
+import session
+from applications import APPLICATIONS, streams_bytes
+from call_evaluator import BACKQUOTED
+from command_interface import Command
+from commands import Background, Pipe
+from executors import STREAM_DEPTH
+from pipe_rewrites import rewrite
+from scheduler import batches
+from settings import (
+    PIPE_EXECUTOR,
+    PIPE_SPILL_THRESHOLD,
+    PROCESS_APPLICATIONS,
+    SEQ_EXECUTOR,
+)
+
+EXPLAIN = "explain"
+
+# how the calls of a pipe are run in parallel by each executor
+PARALLEL_EXECUTORS = {
+    "threaded": "parallel (threads)",
+    "processes": "parallel (worker processes)",
+}
+
+
+class Explain(Command):
+
+    """explains the command line following explain, see explain_line"""
+
+    __slots__ = ("cmdline",)
+
+    def __init__(self, cmdline):
+        self.cmdline = cmdline
+
+    def eval(self, out, in_pipe=False):
+        out.append(explain_line(self.cmdline))
+
+
+def explain_command(cmdline):
+    """returns the Explain of an explain command line, otherwise None"""
+    words = cmdline.split(None, 1)
+    if not words or words[0] != EXPLAIN:
+        return None
+    return Explain(words[1] if len(words) > 1 else "")
+
+
+def _size(size):
+    for unit in ["B", "KiB", "MiB", "GiB"]:
+        if size < 1024 or unit == "GiB":
+            break
+        size /= 1024
+    return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+
+
+def _application(call):
+    """
+    the name of the application of a call, the application and how it is
+    described, or why it is not resolved
+    """
+    application = getattr(call, "application", None)
+    if application is not None:  # a RewrittenCall
+        return "", application, type(application).__name__
+    template = call.plan.application
+    if not template.static:
+        return "", None, "substituted when run"
+    name = template.resolve(None)
+    unsafe = name[:1] == "_"
+    cls = APPLICATIONS.get(name[1:] if unsafe else name)
+    if cls is None:
+        return name, None, f"unsupported ({name})"
+    if unsafe:
+        return name, cls(), f"UnsafeDecorator({cls.__name__})"
+    return name, cls(), cls.__name__
+
+
+def _arguments(call):
+    """
+    the number of arguments of a call, notes on those which are globbed
+    or substituted, and the paths they name, without running command
+    substitution
+    """
+    if not hasattr(call, "plan"):
+        return len(call.args), [], call.args
+    notes = []
+    paths = []
+    for template in call.plan.args:
+        text = "".join(
+            f"`{part.text}`" if part.quoting == BACKQUOTED else part.text
+            for part in template.parts
+            )
+        if not template.static and not template.globbing:
+            notes.append(f"{text}: substituted when run")
+        elif template.globbing:
+            matches = session.current().glob(text)
+            notes.append(f"{text}: {len(matches)} matches")
+            paths += matches or [text]
+        else:
+            paths.append(text)
+    return len(call.plan.args), notes, paths
+
+
+def _output(call, last):
+    file_output = getattr(call, "file_output", None)
+    if hasattr(call, "plan") and call.plan.file_output:
+        template = call.plan.file_output
+        if not template.static:
+            return "a file named when run"
+        file_output = template.resolve(None)
+    if file_output:
+        return file_output
+    return "stdout" if last else "the next call"
+
+
+def _strategy(name, application, in_pipe):
+    """
+    in-memory for calls which hold their whole input, streaming for the
+    others, and whether the call runs in parallel with the others. Outside
+    a pipe, only the applications with a stream of their own stream (see
+    streams_bytes), the others are executed whole.
+    """
+    if not in_pipe and not (name and streams_bytes(name)):
+        return "in-memory (executed whole)"
+    held = application is not None and application.holds_input
+    strategy = "in-memory" if held else "streaming"
+    if name.lstrip("_") in PROCESS_APPLICATIONS:
+        return f"{strategy}, parallel (worker process)"
+    elif in_pipe and PIPE_EXECUTOR in PARALLEL_EXECUTORS:
+        return f"{strategy}, {PARALLEL_EXECUTORS[PIPE_EXECUTOR]}"
+    return strategy
+
+
+def _explain_call(call, number, last, in_pipe):
+    """the lines explaining a call, and the bytes of the files it names"""
+    name, application, description = _application(call)
+    count, notes, paths = _arguments(call)
+    lines = [
+        f"  {number}. {call.raw_command}",
+        f"     application: {description}",
+        f"     arguments: {count}",
+    ]
+    lines += [f"       {note}" for note in notes]
+    lines.append(f"     output: {_output(call, last)}")
+    current = session.current()
+    sizes = [
+        (path, os.stat(current.path(path)).st_size) for path in paths
+        if os.path.isfile(current.path(path))
+    ]
+    if sizes:
+        lines.append(
+            "     input files: "
+            + ", ".join(f"{path} ({_size(size)})" for path, size in sizes)
+            )
+    lines.append(
+        f"     strategy: {_strategy(name, application, in_pipe)}"
+        )
+    return lines, sum(size for _, size in sizes)
+
+
+def _explain_command(command, number):
+    if type(command) is Explain:
+        return [f"command {number}: explain {command.cmdline}"]
+    elif type(command) is Background:
+        lines = _explain_command(command.command, number)
+        lines[0] += ", in the background"
+        return lines
+    elif type(command) is not Pipe:
+        if not command.plan:
+            return [f"command {number}: unrecognized ({command.raw_command})"]
+        lines, size = _explain_call(command, 1, True, False)
+        return [f"command {number}: call"] + lines + [
+            f"  input read: {_size(size)}"
+        ]
+    calls, rewrites = rewrite(command.calls)
+    lines = [
+        f"command {number}: pipe of {len(command.calls)} calls, "
+        f"run {PIPE_EXECUTOR}"
+    ]
+    lines += [f"  rewrite {rule}: {before} -> {after}"
+              for rule, before, after in rewrites]
+    if PIPE_EXECUTOR == "sequential" and len(calls) > STREAM_DEPTH:
+        lines.append(
+            f"  output collected every {STREAM_DEPTH} calls, spilled to "
+            f"a file above {_size(PIPE_SPILL_THRESHOLD)}"
+            )
+    total = 0
+    for i, call in enumerate(calls):
+        if hasattr(call, "plan") and not call.plan:
+            lines.append(f"  {i + 1}. {call.raw_command}: unrecognized")
+            continue
+        call_lines, size = _explain_call(
+            call, i + 1, i == len(calls) - 1, True
+            )
+        lines += call_lines
+        total += size
+    lines.append(f"  input read: {_size(total)}")
+    return lines
+
+
+def _alongside(commands):
+    """
+    the number of the command each command of a sequence runs alongside,
+    by its number, for the commands which do not run on their own
+    """
+    numbers = {id(command): number for number, command in
+               enumerate(commands, 1)}
+    alongside = {}
+    for (first, _), *rest in batches(commands):
+        for command, _ in rest:
+            alongside[numbers[id(command)]] = numbers[id(first)]
+    return alongside
+
+
+def explain_line(cmdline):
+    """
+    Returns the plan of a command line as text, one section per command of
+    its sequence, without running any of it.
+    """
+    from command_evaluator import compile_command_line
+
+    if not cmdline.strip():
+        return f"Invalid Arguments: {EXPLAIN}\n"
+    seq = compile_command_line(cmdline)
+    if not seq:
+        return f"Unrecognized Input: {cmdline}\n"
+    alongside = {}
+    if SEQ_EXECUTOR != "sequential":
+        alongside = _alongside(seq.commands)
+    lines = [f"explain {cmdline}"]
+    for number, command in enumerate(seq.commands, 1):
+        if getattr(command, "raw_command", None) == "":
+            continue  # the empty call after a last &, which does nothing
+        command_lines = _explain_command(command, number)
+        if number in alongside:
+            command_lines[0] += f", alongside command {alongside[number]}"
+        lines += command_lines
+    return "\n".join(lines) + "\n"
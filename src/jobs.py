@@ -0,0 +1,120 @@
+"""
+Background jobs. A command followed by & runs as a job on a pool of
+JOB_WORKERS threads, collecting its output into a buffer of its own
+rather than the shell's output, and the shell goes on with the next
+command at once. Jobs are numbered from 1, like those of a UNIX shell,
+and the builtins jobs, wait and fg (see applications.py) list them, and
+wait for them and output what they collected. A job runs in a copy of
+the session starting it, as a subshell would, so a cd in a job does not
+change the working directory of the session.
+"""
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import session
+from exceptions import ApplicationExcecutionError
+from settings import JOB_WORKERS
+
+_jobs = {}
+_lock = threading.Lock()
+_pool = None
+
+# the job run by the current thread, if the thread is one of the pool's
+_running = threading.local()
+
+
+class Job:
+
+    """
+    A command run in the background: its output, appended to as it runs,
+    its session and its future, done once the command has run.
+    """
+
+    __slots__ = (
+        "number", "raw_command", "output", "session", "future", "reported"
+    )
+
+    def __init__(self, number, raw_command):
+        self.number = number
+        self.raw_command = raw_command
+        self.output = deque()
+        self.session = session.Session(session.current().cwd)
+        self.future = None
+        self.reported = False
+
+    @property
+    def status(self):
+        if not self.future.done():
+            return "Running"
+        return "Failed" if self.future.exception() else "Done"
+
+    def run(self, command):
+        _running.job = self
+        try:
+            with session.using(self.session):
+                command.eval(self.output)
+        finally:
+            _running.job = None
+
+
+def start(raw_command, command):
+    """runs command as a new job, and returns the job"""
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(JOB_WORKERS, thread_name_prefix="job")
+        number = max(_jobs, default=0) + 1
+        job = _jobs[number] = Job(number, raw_command)
+        job.future = _pool.submit(job.run, command)
+    return job
+
+
+def jobs():
+    """the jobs which have not been waited for, in the order they started"""
+    with _lock:
+        return [_jobs[number] for number in sorted(_jobs)]
+
+
+def finished():
+    """the jobs which have finished since the last call, for the REPL"""
+    done = [job for job in jobs() if job.future.done() and not job.reported]
+    for job in done:
+        job.reported = True
+    return done
+
+
+def _take(numbers):
+    """
+    removes the jobs numbered numbers, every job when there are none,
+    from the jobs, and returns them. A job never waits for itself.
+    """
+    running = getattr(_running, "job", None)
+    with _lock:
+        numbers = list(dict.fromkeys(numbers)) or sorted(_jobs)
+        if any(number not in _jobs for number in numbers):
+            raise ApplicationExcecutionError("No Such Job")
+        return [
+            _jobs.pop(number) for number in numbers
+            if _jobs[number] is not running
+        ]
+
+
+def wait(numbers, out):
+    """
+    Waits for the jobs numbered numbers, every job when there are none,
+    in turn, and appends the output of each to out. An error raised by a
+    job is raised again once the output of all of them is appended.
+    """
+    error = None
+    for job in _take(numbers):
+        job_error = job.future.exception()
+        out.extend(job.output)
+        error = error or job_error
+    if error:
+        raise error
+
+
+def current():
+    """the number of the job started last, or None if there are no jobs"""
+    with _lock:
+        return max(_jobs, default=None)
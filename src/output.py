@@ -0,0 +1,149 @@
+"""
+The output of the shell. Commands append their output to a deque, out;
+the shell's out is an Output, which writes it to stdout as soon as each
+command has run, and the output of a pipe while it is produced, rather
+than once the whole command line has run.
+
+Output is written to the binary buffer of stdout through a Sink, in large
+writes, or line by line on a terminal. The bytes output by pipes are
+written as they are, without decoding them, if stdout has the encoding of
+the pipes.
+"""
+import sys
+import time
+import codecs
+from collections import deque
+from application_interface import ENCODING, ENCODING_ERRORS, decode
+
+# the most seconds output of a pipe is kept in the stdout buffer
+FLUSH_INTERVAL = 0.05
+
+# the number of bytes of output gathered into a write to stdout
+BUFFER_SIZE = 1 << 16
+
+
+class Sink:
+
+    """
+    Writes text, and the bytes output by pipes, to the binary buffer of a
+    text stream, such as stdout, in the encoding of the stream. Output is
+    gathered into writes of BUFFER_SIZE bytes, or, if the stream is a
+    terminal, written as soon as a line is complete. Streams without a
+    binary buffer are written to as text.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.binary = getattr(stream, "buffer", None)
+        self.encoding = getattr(stream, "encoding", None) or "utf-8"
+        self.errors = getattr(stream, "errors", None) or "strict"
+        if self.errors == "strict":
+            # bytes of pipes which are not valid in ENCODING, decoded as
+            # surrogates, are written back as they were read
+            self.errors = ENCODING_ERRORS
+        self.transcode = (
+            codecs.lookup(self.encoding).name != codecs.lookup(ENCODING).name
+            )
+        self.tty = stream.isatty()
+        self.pending = []
+        self.size = 0
+        if self.binary:
+            stream.flush()  # text written to the stream before, e.g. prompts
+
+    def write(self, text):
+        if not self.binary:
+            self.stream.write(text)
+        else:
+            self._add(text.encode(self.encoding, self.errors))
+
+    def write_bytes(self, data):
+        """writes a chunk output by a pipe"""
+        data = bytes(data)  # a copy of a view, the bytes of Lines
+        if not self.binary:
+            self.stream.write(decode(data))
+        elif self.transcode:
+            self._add(decode(data).encode(self.encoding, self.errors))
+        else:
+            self._add(data)
+
+    def _add(self, data):
+        self.pending.append(data)
+        self.size += len(data)
+        if self.size >= BUFFER_SIZE:
+            self._write()
+        elif self.tty and b"\n" in data:
+            self.flush()
+
+    def _write(self):
+        if self.pending:
+            self.binary.write(b"".join(self.pending))
+            self.pending.clear()
+            self.size = 0
+
+    def flush(self):
+        if self.binary:
+            self._write()
+            self.binary.flush()
+        else:
+            self.stream.flush()
+
+
+class Output(deque):
+
+    """
+    A deque of output which flush() writes to stdout, or to the given
+    stream, and empties.
+    """
+
+    def __init__(self, stream=None):
+        super().__init__()
+        self.stream = stream
+
+    def _sink(self):
+        return Sink(self.stream or sys.stdout)
+
+    def flush(self):
+        sink = self._sink()
+        while self:
+            sink.write(self.popleft())
+        sink.flush()
+
+    def write_stream(self, chunks):
+        """
+        writes chunks of bytes while they are produced, after the output
+        before them. The stream is flushed on the first chunk, then at
+        most every FLUSH_INTERVAL seconds, and at the end.
+        """
+        sink = self._sink()
+        while self:
+            sink.write(self.popleft())
+        if sink.tty:
+            for chunk in chunks:
+                sink.write_bytes(chunk)
+        else:
+            self._write_gathered(sink, chunks)
+        sink.flush()
+
+    def _write_gathered(self, sink, chunks):
+        """
+        writes chunks gathered into writes of BUFFER_SIZE bytes, and
+        flushes them at least every FLUSH_INTERVAL seconds
+        """
+        monotonic = time.monotonic
+        pending = []
+        append = pending.append
+        size = 0
+        deadline = 0
+        for chunk in chunks:
+            if type(chunk) is not bytes:
+                chunk = bytes(chunk)  # a view or Lines, kept as bytes
+            append(chunk)
+            size += len(chunk)
+            if size >= BUFFER_SIZE or monotonic() >= deadline:
+                sink.write_bytes(b"".join(pending))
+                pending.clear()
+                size = 0
+                if monotonic() >= deadline:
+                    sink.flush()
+                    deadline = monotonic() + FLUSH_INTERVAL
+        sink.write_bytes(b"".join(pending))
@@ -1,42 +1,149 @@
-from pathlib import Path
-from lark import Lark, UnexpectedCharacters, UnexpectedEOF
+import os
+import sys
+import hashlib
+from functools import lru_cache
+from settings import CACHE_DIR
+from cache import read_cache, write_cache
 
+GRAMMARS_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "grammars"
+    )
 
-class Parser:
-    def __init__(self):
-        self.command_level_parser = Lark(self._command_level_grammar(),
-                                         start="command")
-        self.call_command_parser = Lark(self._call_level_grammar(),
-                                        start="call")
-
-    def _command_level_grammar(self):
-        file = open(
-            str(Path(__file__).parent.absolute())
-            + "/grammars/command_level_grammar.lark",
-            "r",
-        )
-        grammar = file.read()
-        file.close()
-        return grammar
-
-    def _call_level_grammar(self):
-        file = open(
-            str(Path(__file__).parent.absolute())
-            + "/grammars/call_level_grammar.lark",
-            "r",
+# every command line is parsed with one grammar, either as a whole line
+# (command) or as a single call (call)
+GRAMMAR_FILE = "shell_grammar.lark"
+START = ["command", "call"]
+
+LALR_OPTIONS = {"parser": "lalr", "lexer": "contextual"}
+
+
+def _read_grammar(grammar_file=GRAMMAR_FILE):
+    with open(os.path.join(GRAMMARS_DIR, grammar_file), "r") as file:
+        return file.read()
+
+
+def grammar_digest():
+    """
+    Hash of the grammar, used to tell whether the generated standalone
+    parser is up to date.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{GRAMMAR_FILE}:{','.join(START)}\n".encode("utf8"))
+    digest.update(_read_grammar().encode("utf8"))
+    return digest.hexdigest()
+
+
+def _standalone_parser():
+    """
+    Returns the parser module generated by tools/generate_parser, or
+    None when it is missing or was generated from an older grammar.
+    Using it avoids importing lark and building the parse tables.
+    """
+    try:
+        import standalone_parser
+    except ImportError:
+        return None
+    if standalone_parser.GRAMMAR_DIGEST != grammar_digest():
+        return None
+    return standalone_parser
+
+
+standalone_parser = _standalone_parser()
+if standalone_parser:
+    from standalone_parser import Lark, Transformer, Tree, Token  # noqa: F401
+    from standalone_parser import UnexpectedInput
+else:
+    from lark import Lark, Transformer, Tree, Token  # noqa: F401
+    from lark import UnexpectedInput
+
+
+def _cache_file(grammar, cache_dir):
+    """
+    The cache file is keyed by everything the parse tables depend on,
+    so a changed grammar or a new lark/python version never loads
+    stale tables.
+    """
+    import lark
+
+    key = "\n".join(
+        [grammar, ",".join(START), lark.__version__,
+         str(sys.version_info[:2])]
         )
-        grammar = file.read()
-        file.close()
-        return grammar
+    digest = hashlib.sha256(key.encode("utf8")).hexdigest()[:32]
+    name = os.path.splitext(GRAMMAR_FILE)[0]
+    return os.path.join(cache_dir, f"{name}-{digest}")
 
-    def command_level_parse(self, cmd):
-        try:
-            return self.command_level_parser.parse(cmd)
-        except (UnexpectedCharacters, UnexpectedEOF):
-            return False
 
-    def call_level_parse(self, call):
+def _read_cache(cache_file):
+    tables = read_cache(cache_file)
+    try:
+        Lark._load_from_dict(*tables)
+        return tables
+    except Exception:  # not parse tables of this lark version
+        return None
+
+
+def build_parse_tables():
+    """the serialized parse tables of the grammar, built with lark"""
+    import lark
+    from lark.grammar import Rule
+    from lark.lexer import TerminalDef
+
+    parser = lark.Lark(_read_grammar(), start=START, **LALR_OPTIONS)
+    return parser.memo_serialize([TerminalDef, Rule])
+
+
+def _parse_tables(cache_dir=CACHE_DIR):
+    cache_file = None
+    if cache_dir:
+        cache_file = _cache_file(_read_grammar(), cache_dir)
+        tables = _read_cache(cache_file)
+        if tables:
+            return tables
+    tables = build_parse_tables()
+    if cache_file:
+        name = os.path.splitext(GRAMMAR_FILE)[0]
+        write_cache(tables, cache_file, replaces=f"{name}-")
+    return tables
+
+
+@lru_cache(maxsize=None)
+def _load_parse_tables():
+    """
+    The generated standalone parser is preferred. Otherwise the tables
+    are built with lark and kept in CACHE_DIR, so that short lived
+    shells (e.g. sh -c) only pay for loading them.
+    """
+    if standalone_parser:
+        return standalone_parser.PARSE_TABLES
+    return _parse_tables()
+
+
+@lru_cache(maxsize=None)
+def _load_parser(transformer):
+    """
+    Returns the LALR parser calling the callbacks of transformer. Parsers
+    are built once per process and shared by every Parser instance, as
+    building the parse tables is far more expensive than parsing a
+    command line.
+    """
+    data, memo = _load_parse_tables()
+    return Lark._load_from_dict(data, memo, transformer=transformer)
+
+
+class Parser:
+
+    """
+    Parses command lines and calls. Without a transformer parse returns
+    the parse tree, with one the transformer builds the result of every
+    rule as soon as it is reduced, so no tree is ever created.
+    """
+
+    def __init__(self, transformer=None):
+        self.parser = _load_parser(transformer)
+
+    def parse(self, text, start="command"):
         try:
-            return self.call_command_parser.parse(call)
-        except (UnexpectedCharacters, UnexpectedEOF):
+            return self.parser.parse(text, start=start)
+        except UnexpectedInput:
             return False
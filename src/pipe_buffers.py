@@ -0,0 +1,190 @@
+"""
+Buffers for the output of a call of a pipe which is collected before it
+is read, like the output of a segment of a long pipe (see
+executors.sequential). A buffer holds its chunks in memory until they
+take PYSHELL_PIPE_SPILL_THRESHOLD bytes of memory, the objects holding
+them included, then spills them to a temporary file in
+PYSHELL_PIPE_SPILL_DIR, which is read back in blocks and removed once the
+buffer is read or closed.
+
+The lines sort holds are collected in a SortBuffer, which, past the same
+threshold, sorts them and spills them to a file in runs, merged once the
+lines are read (an external merge sort).
+"""
+import sys
+import heapq
+import struct
+import tempfile
+import threading
+from functools import partial
+from application_interface import Lines, keep
+from settings import PIPE_SPILL_DIR, PIPE_SPILL_THRESHOLD
+
+# the size of the blocks a spilled buffer is read back in
+READ_SIZE = 64 * 1024
+
+# the bytes of memory a line held in a list takes, besides its bytes: the
+# bytes object and the reference to it
+LINE_SIZE = sys.getsizeof(b"") + struct.calcsize("P")
+
+# the number of buffers and sort runs spilled to a file and the bytes
+# written to them, since the shell started
+counters = {"spilled_buffers": 0, "spilled_bytes": 0}
+_counters_lock = threading.Lock()
+
+
+def _count(buffers, size):
+    with _counters_lock:
+        counters["spilled_buffers"] += buffers
+        counters["spilled_bytes"] += size
+
+
+def _size(chunk):
+    return sum(map(len, chunk)) if type(chunk) is Lines else len(chunk)
+
+
+def _memory(chunk):
+    """
+    the bytes of memory a kept chunk takes, which for Lines of short
+    lines is several times their bytes, as every line is an object
+    """
+    if type(chunk) is Lines:
+        return sys.getsizeof(chunk) + sum(map(sys.getsizeof, chunk))
+    return sys.getsizeof(chunk)
+
+
+class PipeBuffer:
+
+    """
+    Collects chunks of bytes, copying those which are views of a buffer
+    (see Application.stream), and yields them again when iterated, once.
+    A threshold of 0 keeps every chunk in memory.
+    """
+
+    def __init__(self, threshold=PIPE_SPILL_THRESHOLD,
+                 directory=PIPE_SPILL_DIR):
+        self.threshold = threshold
+        self.directory = directory or None
+        self.chunks = []
+        self.size = 0
+        self.file = None
+
+    @property
+    def spilled(self):
+        return self.file is not None
+
+    def append(self, chunk):
+        if self.file is not None:
+            self._write(chunk)
+            return
+        chunk = keep(chunk)
+        self.chunks.append(chunk)
+        self.size += _memory(chunk)
+        if self.threshold and self.size >= self.threshold:
+            self._spill()
+
+    def extend(self, chunks):
+        for chunk in chunks:
+            self.append(chunk)
+
+    def _spill(self):
+        self.file = tempfile.TemporaryFile(dir=self.directory)
+        chunks, self.chunks = self.chunks, []
+        _count(1, 0)
+        for chunk in chunks:
+            self._write(chunk)
+
+    def _write(self, chunk):
+        if type(chunk) is Lines:
+            self.file.writelines(chunk)
+        else:
+            self.file.write(chunk)
+        _count(0, _size(chunk))
+
+    def __iter__(self):
+        try:
+            chunks, self.chunks = self.chunks, []
+            yield from chunks
+            if self.file is not None:
+                self.file.seek(0)
+                yield from iter(partial(self.file.read, READ_SIZE), b"")
+        finally:
+            self.close()
+
+    def close(self):
+        """drops the chunks and removes the file of a spilled buffer"""
+        self.chunks = []
+        if self.file is not None:
+            self.file.close()
+
+
+class SortBuffer:
+
+    """
+    Collects the lines of the input of sort, lines of bytes each ending
+    with a newline, but for the last line of the input, which is kept
+    apart as last. Once the lines take threshold bytes of memory they are
+    sorted and spilled to a temporary file, a run; sorted() merges the
+    runs with the lines left. A threshold of 0 keeps every line in memory.
+    """
+
+    def __init__(self, reverse=False, threshold=PIPE_SPILL_THRESHOLD,
+                 directory=PIPE_SPILL_DIR):
+        self.reverse = reverse
+        self.threshold = threshold
+        self.directory = directory or None
+        self.lines = []
+        self.size = 0
+        self.runs = []
+        self.last = None
+
+    @property
+    def spilled(self):
+        return bool(self.runs)
+
+    def extend(self, lines):
+        """adds a batch of lines, which are not modified afterwards"""
+        if lines and lines[-1][-1:] != b"\n":
+            self.last = lines[-1]
+            lines = lines[:-1]
+        self.lines += lines
+        if self.threshold:
+            self.size += LINE_SIZE * len(lines) + sum(map(len, lines))
+            if self.size >= self.threshold:
+                self._spill()
+
+    def _spill(self):
+        self.lines.sort(reverse=self.reverse)
+        run = tempfile.TemporaryFile(dir=self.directory)
+        self.runs.append(run)
+        run.writelines(self.lines)
+        run.seek(0)
+        _count(1, sum(map(len, self.lines)))
+        self.lines = []
+        self.size = 0
+
+    def sorted(self):
+        """
+        the lines, without last, sorted: a list if no run was spilled,
+        otherwise an iterator merging the runs, which closes them once
+        it is read
+        """
+        self.lines.sort(reverse=self.reverse)
+        if not self.runs:
+            return self.lines
+        return self._merged()
+
+    def _merged(self):
+        try:
+            yield from heapq.merge(
+                *self.runs, self.lines, reverse=self.reverse
+                )
+        finally:
+            self.close()
+
+    def close(self):
+        """drops the lines and removes the files of the runs"""
+        self.lines = []
+        for run in self.runs:
+            run.close()
+        self.runs = []
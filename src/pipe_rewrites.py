@@ -0,0 +1,226 @@
+"""
+Rewrites of the calls of a pipe into calls which give the same output
+with less work, applied once, before a pipe first runs (see Pipe.eval):
+
+- cat_file: cat FILE | APP -> APP FILE, for the applications which read
+  a file as they read stdin. grep does not when its pattern matches an
+  empty line: from stdin it also matches the empty line after the last
+  newline.
+- sort_head: sort | head -n N -> the first N sorted lines, kept in a heap.
+- sort_uniq: sort | uniq -> the distinct lines, sorted.
+- sort_grep: sort | grep PATTERN -> the lines matched before they are
+  sorted, still followed by grep.
+
+Only calls without command substitution or globbing are rewritten, and
+only if their arguments are valid, so that a rewritten pipe fails as the
+pipe it replaces would. The rules applied are those of the PIPE_REWRITES
+setting, and each rewrite is logged at INFO level.
+"""
+import logging
+import re
+from application_interface import encode
+from applications import (
+    DistinctSort,
+    FilteredSort,
+    SortedHead,
+    close_stdin,
+    stream_to_file,
+)
+from call_evaluator import CallPlan
+from settings import PIPE_REWRITES
+
+logger = logging.getLogger(__name__)
+
+
+class RewrittenCall:
+
+    """
+    The call standing for consecutive calls of a pipe: streams the output
+    of an application which does the work of all of them. Its raw command
+    names the application and the calls. It always runs in the thread or
+    process of the calls before it.
+    """
+
+    __slots__ = ("raw_command", "application", "args", "file_output")
+
+    def __init__(self, raw_command, application, args, file_output):
+        self.raw_command = raw_command
+        self.application = application
+        self.args = args
+        self.file_output = file_output
+
+    def stream(self, stdin=None):
+        output = self.application.stream(self.args, stdin)
+        if self.file_output:
+            output = stream_to_file(self.file_output, output)
+        if stdin is None:
+            return output
+        return close_stdin(output, stdin)
+
+
+def _static(call):
+    """
+    the application, arguments and file output of a call, if the call
+    has neither command substitution nor globbing, otherwise None
+    """
+    plan = getattr(call, "plan", None)
+    if not plan or not plan.static:
+        return None
+    return plan.resolve(None)
+
+
+def _reads_stdin(app, args):
+    """whether app, called with args in a pipe, reads stdin only"""
+    if app in ("head", "tail"):
+        return not args or (
+            len(args) == 2 and args[0] == "-n" and args[1].isdecimal()
+            )
+    elif app == "grep":
+        return len(args) == 1
+    elif app == "cut":
+        return len(args) == 2
+    elif app == "uniq":
+        return not args or args == ["-i"]
+    elif app == "sort":
+        return not args or args == ["-r"]
+    return app == "cat" and not args
+
+
+def _matches_empty_line(pattern):
+    """whether grep with pattern matches an empty line, or fails"""
+    try:
+        return re.compile(encode(pattern)).match(b"") is not None
+    except re.error:
+        return True
+
+
+def _sort_args(call, first):
+    """
+    the arguments of a call of sort whose output is read by the next call
+    of a pipe, or None. A first call reads a file, the others stdin.
+    """
+    static = _static(call)
+    if not static:
+        return None
+    app, args, file_output = static
+    if app != "sort" or file_output:
+        return None
+    if args[:1] == ["-r"]:
+        files = args[1:]
+    else:
+        files = args
+    return args if len(files) == (1 if first else 0) else None
+
+
+def _rewrite_cat_file(calls, i):
+    if i != 0:
+        return None
+    cat, call = _static(calls[0]), _static(calls[1])
+    if not cat or not call:
+        return None
+    app, args, file_output = cat
+    if app != "cat" or len(args) != 1 or file_output:
+        return None
+    file_name = args[0]
+    if file_name != file_name.strip() or not _reads_stdin(*call[:2]):
+        return None
+    if call[0] == "grep" and _matches_empty_line(call[1][0]):
+        return None
+    plan = calls[1].plan
+    return type(calls[1])(
+        f"{calls[1].raw_command} {file_name}",
+        CallPlan(plan.application, plan.args + calls[0].plan.args,
+                 plan.file_output),
+        )
+
+
+def _sorted_then(app, calls, i):
+    """the sort arguments and the call after it, if that calls app"""
+    sort_args = _sort_args(calls[i], i == 0)
+    static = _static(calls[i + 1])
+    if sort_args is None or not static or static[0] != app:
+        return None
+    return sort_args, static
+
+
+def _rewritten(calls, i, application, sort_args, file_output):
+    """the call of application standing for calls i and i + 1"""
+    return RewrittenCall(
+        f"{type(application).__name__}"
+        f"({calls[i].raw_command} | {calls[i + 1].raw_command})",
+        application,
+        sort_args,
+        file_output,
+        )
+
+
+def _rewrite_sort_head(calls, i):
+    found = _sorted_then("head", calls, i)
+    if not found:
+        return None
+    sort_args, (_, args, file_output) = found
+    if not _reads_stdin("head", args):
+        return None
+    n = int(args[1]) if args else 10
+    return _rewritten(calls, i, SortedHead(n), sort_args, file_output)
+
+
+def _rewrite_sort_uniq(calls, i):
+    found = _sorted_then("uniq", calls, i)
+    if not found:
+        return None
+    sort_args, (_, args, file_output) = found
+    if args:
+        return None
+    return _rewritten(calls, i, DistinctSort(), sort_args, file_output)
+
+
+def _rewrite_sort_grep(calls, i):
+    found = _sorted_then("grep", calls, i)
+    if not found:
+        return None
+    sort_args, (_, args, _) = found
+    if len(args) != 1:
+        return None
+    sort = _rewritten(calls, i, FilteredSort(args[0]), sort_args, None)
+    return sort, calls[i + 1]
+
+
+# the rules, in the order they are tried at each call of a pipe: a rule
+# returns what replaces the call and the next, or None
+RULES = {
+    "cat_file": _rewrite_cat_file,
+    "sort_head": _rewrite_sort_head,
+    "sort_uniq": _rewrite_sort_uniq,
+    "sort_grep": _rewrite_sort_grep,
+}
+
+
+def rewrite(calls, rules=PIPE_REWRITES):
+    """
+    Returns the calls of a pipe, rewritten by the rules named in rules,
+    and the rewrites, as (rule, calls before, calls after), written as
+    pipes. A call is rewritten again until no rule applies, e.g.
+    cat FILE | sort | head becomes sort FILE | head and then a SortedHead.
+    """
+    calls = list(calls)
+    rewrites = []
+    i = 0
+    while i < len(calls) - 1:
+        for name, rule in RULES.items():
+            if name not in rules:
+                continue
+            replacement = rule(calls, i)
+            if replacement is not None:
+                break
+        else:
+            i += 1
+            continue
+        if not isinstance(replacement, tuple):
+            replacement = (replacement,)
+        before = " | ".join(call.raw_command for call in calls[i:i + 2])
+        after = " | ".join(call.raw_command for call in replacement)
+        logger.info("%s: %s -> %s", name, before, after)
+        rewrites.append((name, before, after))
+        calls[i:i + 2] = replacement
+    return calls, rewrites
@@ -0,0 +1,276 @@
+"""
+Streams run in worker processes, for CPU-bound calls of a pipe, which
+threads would run one at a time. A worker process reads its stdin from,
+and writes its output to, rings of slots in shared memory: chunks of
+bytes are copied into the slots rather than pickled. A worker reading the
+output of another worker reads it directly from the other's ring.
+"""
+import time
+import pickle
+import struct
+import threading
+import multiprocessing
+from contextvars import copy_context
+from multiprocessing import shared_memory
+import session
+from application_interface import Lines
+
+# the number and size of the slots of a ring
+RING_SLOTS = 64
+SLOT_SIZE = 64 * 1024
+
+# seconds between checks, while waiting on a ring, whether the other end
+# of the ring is still there
+CLOSE_POLL = 0.05
+
+# seconds after which the chunks gathered into a slot are written to the
+# ring, even if the slot is not full
+FLUSH_INTERVAL = 0.01
+
+# the length and the kind of the data of a slot
+HEADER = struct.Struct("<IB")
+DATA, END, ERROR = range(3)
+
+CONTEXT = multiprocessing.get_context()
+
+# whether this process is a worker, whose calls are not moved to workers
+# of their own
+WORKER = False
+
+
+def _always():
+    return True
+
+
+class Ring:
+
+    """
+    A ring of slots in shared memory, written by one process and read by
+    another. The free and filled semaphores count the slots which can be
+    written and read, so a writer waits for the reader when the ring is
+    full. The writer keeps the position of the next slot to write, the
+    head, and the reader of the next slot to read, the tail.
+    """
+
+    def __init__(self, slots=RING_SLOTS, slot_size=SLOT_SIZE):
+        self.slots = slots
+        self.slot_size = slot_size
+        self.memory = shared_memory.SharedMemory(
+            create=True, size=slots * slot_size
+            )
+        self.free = CONTEXT.Semaphore(slots)
+        self.filled = CONTEXT.Semaphore(0)
+        self.head = self.tail = 0
+
+    @property
+    def capacity(self):
+        """the most bytes of data in a slot"""
+        return self.slot_size - HEADER.size
+
+    def __getstate__(self):
+        return (
+            self.memory.name, self.slots, self.slot_size,
+            self.free, self.filled,
+        )
+
+    def __setstate__(self, state):
+        name, self.slots, self.slot_size, self.free, self.filled = state
+        self.memory = shared_memory.SharedMemory(name=name)
+        self.head = self.tail = 0
+
+    def _acquire(self, semaphore, alive):
+        """returns False if alive() turns false while waiting"""
+        while not semaphore.acquire(timeout=CLOSE_POLL):
+            if not alive():
+                return semaphore.acquire(block=False)
+        return True
+
+    def _offset(self, position):
+        return (position % self.slots) * self.slot_size
+
+    def put(self, kind, data=b"", alive=_always):
+        if not self._acquire(self.free, alive):
+            return False
+        offset = self._offset(self.head)
+        HEADER.pack_into(self.memory.buf, offset, len(data), kind)
+        start = offset + HEADER.size
+        self.memory.buf[start:start + len(data)] = data
+        self.head += 1
+        self.filled.release()
+        return True
+
+    def get(self, alive=_always):
+        """returns the kind and data of the next slot, None if given up"""
+        if not self._acquire(self.filled, alive):
+            return None
+        offset = self._offset(self.tail)
+        length, kind = HEADER.unpack_from(self.memory.buf, offset)
+        start = offset + HEADER.size
+        data = bytes(self.memory.buf[start:start + length])
+        self.tail += 1
+        self.free.release()
+        return kind, data
+
+    def close(self):
+        self.memory.close()
+
+    def unlink(self):
+        self.memory.close()
+        self.memory.unlink()
+
+
+def _pickle_error(error, capacity):
+    try:
+        data = pickle.dumps(error)
+    except Exception:
+        data = b""
+    if not data or len(data) > capacity:
+        data = pickle.dumps(RuntimeError(repr(error)[:1024]))
+    return data
+
+
+def write_chunks(ring, chunks, alive=_always):
+    """
+    Writes chunks to a ring, as bytes gathered into slots, followed by their
+    end, or by the exception raised by chunks. A slot is written once it
+    is full, or FLUSH_INTERVAL after its first chunk, so a slow stream is
+    read without waiting for a full slot. Returns False if alive() turned
+    false while waiting for the reader.
+    """
+    capacity = ring.capacity
+    pending = bytearray()
+    deadline = 0
+    try:
+        for chunk in chunks:
+            if not pending:
+                deadline = time.monotonic() + FLUSH_INTERVAL
+            pending += bytes(chunk) if type(chunk) is Lines else chunk
+            while len(pending) >= capacity:
+                if not ring.put(DATA, pending[:capacity], alive):
+                    return False
+                del pending[:capacity]
+            if pending and time.monotonic() >= deadline:
+                if not ring.put(DATA, pending, alive):
+                    return False
+                pending.clear()
+        kind, data = END, b""
+    except BaseException as e:
+        kind, data = ERROR, _pickle_error(e, capacity)
+    if pending and not ring.put(DATA, pending, alive):
+        return False
+    return ring.put(kind, data, alive)
+
+
+def read_chunks(ring, alive=_always):
+    """
+    Yields the chunks of bytes written to a ring, raising the exception
+    written instead of them.
+    """
+    while True:
+        slot = ring.get(alive)
+        if slot is None:
+            raise ChildProcessError("worker process exited")
+        kind, data = slot
+        if kind == ERROR:
+            raise pickle.loads(data)
+        if kind == END:
+            return
+        yield data
+
+
+def _run(target, args, stdin, stdout, current):
+    global WORKER
+    WORKER = True
+
+    def chunks():
+        yield from target(*args, None if stdin is None else read_chunks(stdin))
+
+    with session.using(current):
+        write_chunks(stdout, chunks())
+
+
+def _feed(ring, chunks, alive):
+    try:
+        write_chunks(ring, chunks, alive)
+    finally:
+        close = getattr(chunks, "close", None)
+        if close:
+            close()
+
+
+class ProcessStage:
+
+    """
+    Runs target(*args, stdin), an iterator of chunks of bytes, in a worker
+    process and yields its chunks. When stdin is the output of another
+    ProcessStage the worker reads it directly from the other's ring,
+    otherwise a thread writes stdin to a ring of the stage. The worker
+    runs target in the session of the thread creating the stage (see
+    session.py).
+
+    A stage is closed once its reader stops reading: its worker is
+    stopped, as are the workers it reads from.
+    """
+
+    def __init__(self, target, args, stdin):
+        self.output = Ring()
+        self.input = None
+        self.upstream = None
+        self.feeder = None
+        self.taken = False
+        self.finished = False
+        self.closed = threading.Event()
+        if type(stdin) is ProcessStage and not stdin.taken:
+            stdin.taken = True
+            self.upstream = stdin
+            stdin_ring = stdin.output
+        elif stdin is not None:
+            self.input = stdin_ring = Ring()
+            self.feeder = threading.Thread(
+                target=copy_context().run,
+                args=(_feed, stdin_ring, stdin, self._open),
+                daemon=True,
+                )
+        else:
+            stdin_ring = None
+        self.process = CONTEXT.Process(
+            target=_run,
+            args=(
+                target, args, stdin_ring, self.output, session.current()
+                ),
+            daemon=True,
+            )
+        self.process.start()
+        if self.feeder:
+            self.feeder.start()
+
+    def _open(self):
+        return not self.closed.is_set()
+
+    def __iter__(self):
+        self.taken = True
+        try:
+            yield from read_chunks(self.output, self.process.is_alive)
+            self.finished = True
+        finally:
+            self.close()
+
+    def close(self):
+        """
+        stops the worker, unless it has finished, and frees its rings. A
+        worker whose output was not read to its end is terminated, as the
+        workers before it, like SIGPIPE would.
+        """
+        if self.closed.is_set():
+            return
+        self.closed.set()
+        if not self.finished:
+            self.process.terminate()
+        self.process.join()
+        if self.feeder:
+            self.feeder.join()
+        if self.upstream:
+            self.upstream.close()
+        for ring in (self.input, self.output):
+            if ring:
+                ring.unlink()
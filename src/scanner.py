@@ -0,0 +1,79 @@
+import re
+from call_evaluator import CallPlan, argument_template
+from commands import Background, Call, Pipe, Seq, has_empty_job
+
+QUOTES = ("'", '"', "`")
+
+WORD = r"[^ \t\n;&|<>]+"
+
+# the call rule of shell_grammar.lark, for calls without quotes
+CALL = re.compile(
+    rf"[ \t]*(?:(?:[<>][ \t]*{WORD}[ \t]+)*{WORD}"
+    rf"(?:[ \t]+(?:[<>][ \t]*)?{WORD})*[ \t]*)?"
+    )
+CALL_TOKENS = re.compile(rf"[<>]|{WORD}")
+
+
+def is_unquoted(text):
+    """whether text contains no quotes, so it can be scanned"""
+    return not any(quote in text for quote in QUOTES)
+
+
+def scan_call(text):
+    """
+    Returns the raw command and plan of an unquoted call, as the parser
+    would, or False if the call is not recognized.
+    """
+    if not CALL.fullmatch(text):
+        return False
+    raw_command = text.strip(" \t")
+    if not raw_command:
+        return "", None
+    application = None
+    args = []
+    file_output = None
+    tokens = iter(CALL_TOKENS.findall(text))
+    for token in tokens:
+        if token == "<":
+            args.append(argument_template((next(tokens),)))
+        elif token == ">":
+            file_output = argument_template((next(tokens),))
+        elif application is None:
+            application = argument_template((token,))
+        else:
+            args.append(argument_template((token,), globbing=True))
+    return raw_command, CallPlan(application, tuple(args), file_output)
+
+
+def scan(text, start="command"):
+    """
+    A linear scanner for command lines without quotes, which splits the
+    line on ;, & and | and scans every call. It builds the same commands
+    as the parser, without running it.
+    """
+    if start == "call":
+        return scan_call(text)
+    commands = []
+    for sequenced in text.split(";"):
+        *background, last = sequenced.split("&")
+        for pipe in background:
+            command = scan_pipe(pipe)
+            if not command:
+                return False
+            commands.append(Background(command))
+        command = scan_pipe(last)
+        if not command:
+            return False
+        commands.append(command)
+    return not has_empty_job(commands) and Seq(commands)
+
+
+def scan_pipe(text):
+    """the Call or Pipe of an unquoted pipe, or False"""
+    calls = []
+    for call in text.split("|"):
+        call = scan_call(call)
+        if not call:
+            return False
+        calls.append(Call(*call))
+    return Pipe(*calls) if len(calls) > 1 else calls[0]
@@ -0,0 +1,198 @@
+"""
+Scheduling of the commands of a sequence, a; b; c. With the SEQ_EXECUTOR
+setting other than "sequential", commands which cannot conflict run side
+by side, and their output is still written in the order of the sequence.
+
+The effects of a command are the files it reads and writes, found from
+the arguments and redirections of its calls (see FILE_ARGUMENTS) and
+resolved in the working directory of the session. A command whose effects
+are not known is a barrier, it runs once the commands before it have run
+and before those after it: cd, calls with command substitution or
+globbing, applications other than those of FILE_ARGUMENTS, and commands
+other than calls and pipes.
+
+A sequence runs in batches. The first command of a batch runs in the
+current thread, writing its output as it is produced. The commands after
+it join the batch while they write no file and read no file it writes;
+those reading files run in threads or worker processes, started with the
+batch, and the others when their turn comes. A command writing a file
+starts a new batch, so that when a command raises, as when the sequence
+runs command by command, the commands after it have changed no file.
+"""
+import os
+from collections import deque, namedtuple
+import session
+from application_interface import encode
+from commands import Call, Pipe, emit
+from executors import ThreadedStage
+from output import Output
+from process_stages import ProcessStage
+
+# the most commands of a batch run in threads or worker processes
+SEQ_STAGES = 16
+
+# the files, as absolute paths, a command reads and writes
+Effects = namedtuple("Effects", ["reads", "writes"])
+
+NO_EFFECTS = Effects((), ())
+
+
+def _counted(args):
+    return args[2:] if args[:1] == ["-n"] else args
+
+
+def _flagged(flag):
+    return lambda args: args[1:] if args[:1] == [flag] else args
+
+
+# the arguments of a call of each application which name the files and
+# directories it reads, as the application parses them
+FILE_ARGUMENTS = {
+    "echo": lambda args: [],
+    "pwd": lambda args: [],
+    "ls": lambda args: args or ["."],
+    "cat": lambda args: args,
+    "head": _counted,
+    "tail": _counted,
+    "grep": lambda args: args[1:],
+    "cut": lambda args: args[2:],
+    "find": lambda args: ["."] if args[:1] == ["-name"] else args[:1],
+    "uniq": _flagged("-i"),
+    "sort": _flagged("-r"),
+}
+
+
+def _path(name):
+    return os.path.realpath(session.current().path(name.strip()))
+
+
+def _call_effects(call):
+    if not call.plan:
+        return NO_EFFECTS
+    if not call.plan.static:
+        return None
+    app, args, file_output = call.plan.resolve(None)
+    file_arguments = FILE_ARGUMENTS.get(app.lstrip("_"))
+    if file_arguments is None:
+        return None
+    return Effects(
+        tuple(map(_path, file_arguments(args))),
+        (_path(file_output),) if file_output else (),
+        )
+
+
+def effects(command):
+    """the Effects of a command, or None if they are not known"""
+    if type(command) is Call:
+        return _call_effects(command)
+    elif type(command) is not Pipe:
+        return None
+    reads = []
+    writes = []
+    for call in command.calls:
+        call_effects = _call_effects(call)
+        if call_effects is None:
+            return None
+        reads += call_effects.reads
+        writes += call_effects.writes
+    return Effects(tuple(reads), tuple(writes))
+
+
+def _overlap(path, other):
+    """whether a path is, or is in, the other, or the other in it"""
+    return (
+        path == other
+        or path.startswith(os.path.join(other, ""))
+        or other.startswith(os.path.join(path, ""))
+    )
+
+
+def _joins(first, command_effects):
+    """
+    whether a command joins the batch of a first command, their effects
+    first and command_effects
+    """
+    if first is None or command_effects is None or command_effects.writes:
+        return False
+    return not any(
+        _overlap(read, write)
+        for read in command_effects.reads
+        for write in first.writes
+        )
+
+
+def batches(commands):
+    """
+    Yields the batches of commands, lists of commands and their effects,
+    the first command of a batch first. The effects of a command are
+    found once the barriers before it have run, so after any cd.
+    """
+    batch = []
+    staged = 0
+    for command in commands:
+        command_effects = effects(command)
+        if batch and _joins(batch[0][1], command_effects) and (
+            not command_effects.reads or staged < SEQ_STAGES
+        ):
+            batch.append((command, command_effects))
+            staged += bool(command_effects.reads)
+            continue
+        if batch:
+            yield batch
+        batch = [(command, command_effects)]
+        staged = 0
+        if command_effects is None:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def evaluated(command, stdin=None):
+    """evaluates command, as Seq.eval does, and yields its output encoded"""
+    out = deque()
+    command.eval(out)
+    for text in out:
+        yield encode(text)
+
+
+def _stage(command, executor):
+    if executor == "processes":
+        return ProcessStage(evaluated, (command,), None)
+    return ThreadedStage(evaluated(command))
+
+
+def _flush(out):
+    if isinstance(out, Output):
+        out.flush()
+
+
+def run_batch(batch, out, executor):
+    """
+    runs a batch, the commands reading files in stages of executor, and
+    writes their output in order
+    """
+    (first, _), *rest = batch
+    stages = [
+        _stage(command, executor) if command_effects.reads else None
+        for command, command_effects in rest
+    ]
+    try:
+        first.eval(out)
+        _flush(out)
+        for (command, _), stage in zip(rest, stages):
+            if stage is None:
+                command.eval(out)
+            else:
+                emit(out, stage)
+            _flush(out)
+    finally:
+        for stage in stages:
+            if stage is not None:
+                stage.close()
+
+
+def scheduled(commands, out, executor):
+    """runs the commands of a sequence in batches, see the module"""
+    for batch in batches(commands):
+        run_batch(batch, out, executor)
@@ -0,0 +1,73 @@
+"""
+Script files: a command line per line, parsed once before the first line
+is executed. Blank lines and lines starting with # are skipped.
+"""
+import os
+import sys
+import hashlib
+from cache import read_cache, touch_cache, write_cache
+from command_evaluator import parse
+from parser import grammar_digest
+from settings import CACHE_DIR
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# the modules defining the commands of compiled scripts, a compiled
+# script is only reused by the code it was compiled with
+COMPILED_MODULES = [
+    "applications.py",
+    "call_evaluator.py",
+    "command_evaluator.py",
+    "commands.py",
+    "explain.py",
+    "scanner.py",
+]
+
+# the most compiled scripts kept, those used last
+CACHED_SCRIPTS = 256
+
+
+def _code_digest():
+    digest = hashlib.sha256(grammar_digest().encode("utf8"))
+    digest.update(str(sys.version_info[:2]).encode("utf8"))
+    for module in COMPILED_MODULES:
+        with open(os.path.join(SRC_DIR, module), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _cache_file(script, cache_dir):
+    """compiled scripts are keyed by the script content and the code"""
+    digest = hashlib.sha256(script.encode("utf8"))
+    digest.update(_code_digest().encode("utf8"))
+    return os.path.join(cache_dir, "scripts", digest.hexdigest()[:32])
+
+
+def command_lines(script):
+    for line in script.splitlines():
+        stripped = line.strip(" \t")
+        if stripped and not stripped.startswith("#"):
+            yield line
+
+
+def _compile(script):
+    return [(cmdline, parse(cmdline) or None)
+            for cmdline in command_lines(script)]
+
+
+def compile_script(script, cache_dir=CACHE_DIR):
+    """
+    Returns the command lines of a script together with their Seq of
+    commands, or None for a line which is not recognized, and whether
+    they were loaded from the cache rather than parsed.
+    """
+    if not cache_dir:
+        return _compile(script), False
+    cache_file = _cache_file(script, cache_dir)
+    compiled = read_cache(cache_file)
+    if compiled is not None:
+        touch_cache(cache_file)
+        return compiled, True
+    compiled = _compile(script)
+    write_cache(compiled, cache_file, keep=CACHED_SCRIPTS)
+    return compiled, False
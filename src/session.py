@@ -0,0 +1,133 @@
+"""
+Sessions. A session has a working directory of its own, which cd changes
+instead of the working directory of the process, and against which
+applications, globbing and autocomplete resolve relative paths, so that
+sessions, and the background jobs of a session, run commands side by side
+in one process. Files are opened relative to a descriptor of the session's
+directory (openat) where the platform supports it.
+
+The session of the running command is current(): the shell's session,
+which starts in the working directory of the process, unless a session is
+used with using(). Threads running parts of a command run in the context
+of the thread starting them (see executors.py), and worker processes
+receive the session with their calls.
+"""
+import errno
+import glob
+import os
+import stat
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+
+# whether files can be opened relative to a directory descriptor
+DIR_FD = os.open in os.supports_dir_fd and hasattr(os, "O_DIRECTORY")
+
+_session = ContextVar("session")
+_shell = None
+_shell_lock = threading.Lock()
+
+
+class Directory:
+
+    """
+    a directory, and its descriptor, closed once nothing holds it, with
+    the opener of open() opening files relative to it
+    """
+
+    __slots__ = ("path", "fd", "opener")
+
+    def __init__(self, path):
+        self.path = path
+        self.fd = self.opener = None
+        if DIR_FD:
+            self.fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+            self.opener = partial(os.open, mode=0o666, dir_fd=self.fd)
+        elif not stat.S_ISDIR(os.stat(path).st_mode):
+            raise NotADirectoryError(
+                errno.ENOTDIR, os.strerror(errno.ENOTDIR), path
+                )
+
+    def __del__(self):
+        if self.fd is not None:
+            os.close(self.fd)
+
+
+class Session:
+
+    """
+    A working directory, changed with chdir. The directory object is
+    replaced rather than changed, so a file being opened in the previous
+    directory while cd runs keeps its descriptor open.
+    """
+
+    __slots__ = ("directory",)
+
+    def __init__(self, cwd=None):
+        self.directory = Directory(os.path.abspath(cwd or os.getcwd()))
+
+    def __reduce__(self):
+        """a session is pickled as its path, its directory opened again"""
+        return Session, (self.cwd,)
+
+    @property
+    def cwd(self):
+        return self.directory.path
+
+    def path(self, name):
+        """the path of name, relative to the working directory"""
+        return os.path.join(self.directory.path, name)
+
+    def chdir(self, name):
+        self.directory = Directory(os.path.normpath(self.path(name)))
+
+    def open(self, name, mode="r", **kwargs):
+        """open(), with a relative name opened in the working directory"""
+        directory = self.directory  # held until the file is open
+        if directory.fd is None:
+            return open(os.path.join(directory.path, name), mode, **kwargs)
+        return open(name, mode, opener=directory.opener, **kwargs)
+
+    def listdir(self, name="."):
+        return os.listdir(self.path(name))
+
+    def iglob(self, pattern, recursive=False):
+        """
+        the paths matching pattern, relative to the working directory if
+        pattern is, as glob.iglob would give in the working directory
+        """
+        if not pattern or os.path.isabs(pattern):
+            yield from glob.iglob(pattern, recursive=recursive)
+            return
+        prefix = os.path.join(self.directory.path, "")
+        for path in glob.iglob(
+            glob.escape(prefix) + pattern, recursive=recursive
+        ):
+            yield path[len(prefix):]
+
+    def glob(self, pattern, recursive=False):
+        return list(self.iglob(pattern, recursive))
+
+
+def _shell_session():
+    global _shell
+    with _shell_lock:
+        if _shell is None:
+            _shell = Session()
+        return _shell
+
+
+def current():
+    """the session of the running command"""
+    return _session.get(None) or _shell or _shell_session()
+
+
+@contextmanager
+def using(session):
+    """runs the commands of the block in session"""
+    token = _session.set(session)
+    try:
+        yield session
+    finally:
+        _session.reset(token)
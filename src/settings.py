@@ -0,0 +1,70 @@
+"""
+Settings for the shell. Each setting can be overridden through an
+environment variable of the same name prefixed with PYSHELL_.
+"""
+import os
+
+
+def _setting(name, default):
+    return os.environ.get("PYSHELL_" + name, default)
+
+
+# directory holding the compiled parse tables and scripts, an empty value
+# disables it
+CACHE_DIR = _setting(
+    "CACHE_DIR",
+    os.path.join(
+        os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+        "python-shell",
+    ),
+)
+
+# number of parsed command lines and calls kept for reuse
+PLAN_CACHE_SIZE = int(_setting("PLAN_CACHE_SIZE", 256))
+
+# report the parse and execution time of script files on stderr
+SCRIPT_TIMES = bool(_setting("SCRIPT_TIMES", ""))
+
+# how the calls of a pipe are run, "sequential" in the current thread,
+# "threaded" in threads of their own or "processes" in worker processes
+# (see executors.py)
+PIPE_EXECUTOR = _setting("PIPE_EXECUTOR", "sequential")
+
+# number of batches of chunks queued between the threads of a pipe
+PIPE_QUEUE_SIZE = int(_setting("PIPE_QUEUE_SIZE", 16))
+
+# applications whose calls in a pipe run in worker processes, separated
+# by commas, e.g. "grep,sort"
+PROCESS_APPLICATIONS = frozenset(
+    filter(None, _setting("PROCESS_APPLICATIONS", "").split(","))
+    )
+
+# bytes of memory the output collected between the segments of a long
+# pipe, or the lines held by sort, take, the objects holding them
+# included, before they are spilled to a temporary file, 0 to keep them in
+# memory (see pipe_buffers.py)
+PIPE_SPILL_THRESHOLD = int(_setting("PIPE_SPILL_THRESHOLD", 64 * 1024 * 1024))
+
+# directory of the files output is spilled to, empty for the system's
+# temporary directory
+PIPE_SPILL_DIR = _setting("PIPE_SPILL_DIR", "")
+
+# rewrites of the calls of a pipe applied before it runs, separated by
+# commas, empty to run pipes as they are written (see pipe_rewrites.py)
+PIPE_REWRITES = frozenset(
+    filter(
+        None,
+        _setting(
+            "PIPE_REWRITES", "cat_file,sort_head,sort_uniq,sort_grep"
+        ).split(","),
+    )
+    )
+
+# number of threads running the commands of background jobs (see jobs.py)
+JOB_WORKERS = int(_setting("JOB_WORKERS", 4))
+
+# how the commands of a sequence are run, "sequential" one after the
+# other, or side by side where they cannot conflict, with the commands
+# reading files in "threaded" threads or "processes" worker processes
+# (see scheduler.py)
+SEQ_EXECUTOR = _setting("SEQ_EXECUTOR", "sequential")
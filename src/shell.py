@@ -1,40 +1,91 @@
 import sys
-import os
-from parser import Parser
-from collections import deque
-from command_evaluator import extract_raw_commands
-from commands import Seq
-from autocomplete import autocomplete
+import time
+import jobs
+import session
+from command_evaluator import compile_command_line
+from output import Output
+from pipe_buffers import counters
+from settings import CACHE_DIR, SCRIPT_TIMES
 
 
-def eval(cmdline, out):
-    parser = Parser()
-    command_tree = parser.command_level_parse(cmdline)
-    if not command_tree:
+def eval_compiled(cmdline, seq, out):
+    if not seq:
         out.append(f"Unrecognized Input: {cmdline}\n")
         return
-    raw_commands = extract_raw_commands(command_tree)
-    seq = Seq(raw_commands)
     seq.eval(out)
 
 
+def eval(cmdline, out):
+    eval_compiled(cmdline, compile_command_line(cmdline), out)
+
+
+def wait_jobs(out):
+    """
+    the shell waits for its background jobs before it exits, and outputs
+    what they output
+    """
+    jobs.wait([], out)
+    out.flush()
+
+
+def report_jobs():
+    """reports the background jobs which have finished on stderr"""
+    for job in jobs.finished():
+        print(f"[{job.number}] {job.status} {job.raw_command}",
+              file=sys.stderr)
+
+
+def run_script(path, cache_dir=CACHE_DIR):
+    """
+    Executes a script file. The script is compiled, or loaded from the
+    cache, before its first line runs; with PYSHELL_SCRIPT_TIMES set the
+    time spent on each is reported on stderr.
+    """
+    from script import compile_script
+
+    with open(path, "r") as f:
+        script = f.read()
+    start = time.perf_counter()
+    compiled, cached = compile_script(script, cache_dir)
+    parsed = time.perf_counter()
+    out = Output()
+    for cmdline, seq in compiled:
+        eval_compiled(cmdline, seq, out)
+        out.flush()
+    wait_jobs(out)
+    executed = time.perf_counter()
+    if SCRIPT_TIMES:
+        print(
+            f"{path}: {len(compiled)} lines, "
+            f"parse {(parsed - start) * 1000:.1f} ms"
+            f"{' (cached)' if cached else ''}, "
+            f"execution {(executed - parsed) * 1000:.1f} ms, "
+            f"spilled {counters['spilled_bytes']} bytes",
+            file=sys.stderr,
+        )
+
+
 if __name__ == "__main__":
-    autocomplete()
     args_num = len(sys.argv) - 1  # number of args excluding script name
-    if args_num > 0:  # checks for correct args for non interactive mode
+    if args_num == 1 and sys.argv[1] != "-c":  # runs a script file
+        run_script(sys.argv[1])
+    elif args_num > 0:  # checks for correct args for non interactive mode
         if args_num != 2:
             raise ValueError("wrong number of command line arguments")
         if sys.argv[1] != "-c":
             # -c runs the file in non-interactive mode
             raise ValueError(f"unexpected command line argument {sys.argv[1]}")
-        out = deque()
+        out = Output()
         eval(sys.argv[2], out)
-        while len(out) > 0:
-            print(out.popleft(), end="")
+        out.flush()
+        wait_jobs(out)
     else:
+        from autocomplete import autocomplete
+
+        autocomplete()
+        out = Output()
         while True:
-            cmdline = input(os.getcwd() + "> ")
-            out = deque()
+            report_jobs()
+            cmdline = input(session.current().cwd + "> ")
             eval(cmdline, out)
-            while len(out) > 0:
-                print(out.popleft(), end="")
+            out.flush()
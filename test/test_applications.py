@@ -1,10 +1,14 @@
 import os
 import re
+import tempfile
 import unittest
 import subprocess
+import session
 import applications as app
 from collections import deque
-from commands import Call
+from application_interface import Application
+from commands import Call, Invocation, Pipe
+from executors import threaded
 
 
 class TestPwd(unittest.TestCase):
@@ -91,8 +95,12 @@ class TestCd(unittest.TestCase):
         old_file_path = os.getcwd()
         cd.exec(["unittests"], self.out, False)
         self.assertEqual(len(self.out), 0)
-        self.assertEqual(old_file_path + "/unittests", os.getcwd())
+        self.assertEqual(
+            old_file_path + "/unittests", session.current().cwd
+            )
+        self.assertEqual(old_file_path, os.getcwd())
         cd.exec([".."], self.out, False)
+        self.assertEqual(old_file_path, session.current().cwd)
 
     def test_cd_in_pipe(self):
         cd = app.Cd()
@@ -801,6 +809,16 @@ class TestCut(unittest.TestCase):
         res = cut._get_section(param, line)
         self.assertEqual(res, "H")
 
+    def test_cut_get_section_single_params(self):
+        cut = app.Cut()
+        res = cut._get_section(["2", "11"], "Hello there")
+        self.assertEqual(res, "ee")
+
+    def test_cut_get_section_bytes(self):
+        cut = app.Cut()
+        res = cut._get_section(["2-3"], "\u00e9t\u00e9".encode())
+        self.assertEqual(res, b"\xa9t")
+
     def test_cut_get_section_from_n_to_end(self):
         cut = app.Cut()
         param = ["3-"]
@@ -851,7 +869,7 @@ class TestCut(unittest.TestCase):
         args = ["-b", "7-9,10"]
         cut.exec(args, self.out, True)
         res = self.out.pop()
-        self.assertEqual(res, "Word")
+        self.assertEqual(res, "Worl")
 
     def test_cut_invalid_arguments(self):
         cut = app.Cut()
@@ -1273,9 +1291,7 @@ class TestUnsafeDecorator(unittest.TestCase):
         self.out = deque()
 
     def test_key_error(self):
-        call = Call("_foo bar")
-        call.application = "_foo"
-        call.args = ["bar"]
+        call = Invocation("_foo bar", "_foo", ["bar"], None)
         app.execute_application(call, self.out, False)
         self.assertEqual(len(self.out), 1)
         self.assertEqual(
@@ -1319,10 +1335,12 @@ class TestFileOutput(unittest.TestCase):
 
     def test_file_output(self):
         out = deque()
-        call = Call("echo foo > unittests/bar.txt")
-        call.application = "echo"
-        call.args = ["foo"]
-        call.file_output = "unittests/bar.txt"
+        call = Invocation(
+            "echo foo > unittests/bar.txt",
+            "echo",
+            ["foo"],
+            "unittests/bar.txt",
+            )
 
         app.execute_application(call, out, False)
 
@@ -1365,3 +1383,232 @@ class TestExit(unittest.TestCase):
             out,
             True
             )
+
+
+class TestStream(unittest.TestCase):
+
+    TEXT = "AAA\nbbb\nBBB\nBBB\naaa\nAAA"
+
+    def _chunks(self, text, size=2):
+        data = text.encode()
+        return iter([data[i:i + size] for i in range(0, len(data), size)])
+
+    def _exec(self, application, args, text):
+        out = deque([text])
+        application.exec(args, out, True)
+        return "".join(out)
+
+    def _stream(self, application, args, text):
+        chunks = application.stream(args, self._chunks(text))
+        return b"".join(map(bytes, chunks)).decode()
+
+    def test_iter_lines(self):
+        lines = list(app.iter_lines(self._chunks(self.TEXT, 3)))
+        self.assertEqual(lines, self.TEXT.encode().splitlines(keepends=True))
+
+    def test_stream_is_exec_in_pipe(self):
+        for name, args in [
+            ("grep", ["A.."]),
+            ("grep", ["x"]),
+            ("grep", [".*"]),
+            ("grep", ["[AB]+$"]),
+            ("grep", ["a\\s"]),
+            ("cut", ["-b", "1,2-"]),
+            ("cut", ["-b", "2"]),
+            ("cut", ["-b", "-2,3"]),
+            ("cut", ["-b", "3-,1"]),
+            ("cut", ["-b", "1-2,4"]),
+            ("uniq", []),
+            ("uniq", ["-i"]),
+            ("sort", []),
+            ("sort", ["-r"]),
+        ]:
+            for text in [self.TEXT, self.TEXT + "\n", "\n\n", ""]:
+                application = app.application_factory(name)
+                self.assertEqual(
+                    self._stream(application, args, text),
+                    self._exec(application, args, text),
+                    (name, args, text),
+                    )
+
+    def test_lines_are_read_as_bytes(self):
+        for name, args in [
+            ("cat", []),
+            ("head", ["-n", "4"]),
+            ("tail", ["-n", "4"]),
+            ("grep", ["[AB]"]),
+            ("cut", ["-b", "2-"]),
+            ("uniq", ["-i"]),
+            ("sort", []),
+        ]:
+            for text in [self.TEXT, self.TEXT + "\n"]:
+                lines = text.encode().splitlines(keepends=True)
+                chunks = [app.Lines(lines[:3]), b"", app.Lines(lines[3:])]
+                application = app.application_factory(name)
+                self.assertEqual(
+                    b"".join(map(bytes, application.stream(args, chunks))),
+                    self._stream(application, args, text).encode(),
+                    (name, args, text),
+                    )
+
+    def test_lines_are_passed_on(self):
+        lines = app.Lines([b"b\n", b"a\n"])
+        batches = list(app.line_batches(iter([lines])))
+        self.assertIs(batches[0], lines)
+        output = list(app.Sort().stream([], iter([lines])))
+        self.assertEqual(output, [app.Lines([b"a\n", b"b\n"])])
+        self.assertIs(type(output[0]), app.Lines)
+        self.assertEqual(bytes(output[0]), b"a\nb\n")
+
+    def test_sorted_line_without_newline_runs_into_the_next(self):
+        output = app.Sort().stream([], iter([b"b\na"]))
+        head = app.Head().stream(["-n", "1"], output)
+        self.assertEqual(b"".join(map(bytes, head)), b"ab\n")
+
+    def test_line_batches(self):
+        chunks = [b"a\nb", app.Lines([b"c\n", b"d"]), bytearray(b"e\nf")]
+        self.assertEqual(
+            list(app.line_batches(iter(chunks))),
+            [[b"a\n"], [b"bc\n"], [b"de\n"], [b"f"]],
+            )
+
+    def test_head_and_tail_read_stdin(self):
+        self.assertEqual(
+            self._stream(app.Head(), ["-n", "2"], self.TEXT), "AAA\nbbb\n"
+            )
+        self.assertEqual(
+            self._stream(app.Tail(), ["-n", "2"], self.TEXT), "aaa\nAAA"
+            )
+
+    def test_cat_passes_stdin_on(self):
+        self.assertEqual(self._stream(app.Cat(), [], self.TEXT), self.TEXT)
+
+    def test_default_stream_runs_exec(self):
+        self.assertEqual(list(app.Echo().stream(["foo"], None)), [b"foo\n"])
+        with self.assertRaises(app.ApplicationExcecutionError):
+            list(app.Echo().stream(["foo"], iter([b"bar"])))
+
+    def test_unsafe_stream_reports_its_own_errors(self):
+        uniq = app.UnsafeDecorator(app.Uniq(), Call("_uniq x y"))
+        self.assertEqual(
+            list(uniq.stream(["x", "y"], iter([b"a"]))),
+            [b"Invalid Arguments: _uniq x y\n"],
+            )
+
+    def test_unsafe_stream_raises_errors_of_stdin(self):
+        uniq = app.UnsafeDecorator(app.Uniq(), Call("_uniq"))
+        stdin = app.Cat().stream(["missing.txt"], None)
+        with self.assertRaises(FileNotFoundError):
+            list(uniq.stream([], stdin))
+
+    def test_stream_is_binary_safe(self):
+        data = b"\xff\xfe\n\x80abc\n\xff\xfe\n"
+        for name, args, expected in [
+            ("cat", [], data),
+            ("sort", [], b"\x80abc\n\xff\xfe\n\xff\xfe\n"),
+            ("uniq", [], data),
+            ("grep", ["\udc80a"], b"\x80abc"),
+            ("cut", ["-b", "2-"], b"\xfe\nabc\n\xfe"),
+        ]:
+            application = app.application_factory(name)
+            self.assertEqual(
+                b"".join(map(bytes, application.stream(args, iter([data])))),
+                expected,
+                (name, args),
+                )
+
+    def test_cut_stream_counts_bytes(self):
+        text = "\u00e9t\u00e9\n"
+        self.assertEqual(
+            self._stream(app.Cut(), ["-b", "1-2"], text), "\u00e9"
+            )
+
+    def test_uniq_stream_ignores_case_of_text(self):
+        text = "\u00c9t\u00c9\n\u00e9t\u00e9\n"
+        self.assertEqual(
+            self._stream(app.Uniq(), ["-i"], text), "\u00c9t\u00c9\n"
+            )
+
+
+class Upper(Application):
+
+    """an application which only implements exec"""
+
+    def exec(self, args, out, in_pipe):
+        out.append(out.pop().upper())
+
+
+class TestChunks(unittest.TestCase):
+
+    """chunks which are views of a reused buffer, and their lifetime"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, "blocks.txt")
+        with open(self.file_name, "w") as f:
+            for i in range(2000):
+                f.write(f"line {i}\n")
+        with open(self.file_name, "rb") as f:
+            self.data = f.read()
+        self.assertGreater(len(self.data), 2 * app.BLOCK_SIZE)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_blocks_reuse_their_buffer(self):
+        blocks = app.read_blocks(self.file_name)
+        first = next(blocks)
+        data = bytes(first)
+        self.assertIs(next(blocks), first)
+        self.assertNotEqual(bytes(first), data)
+        self.assertEqual(data + bytes(first), self.data[:2 * app.BLOCK_SIZE])
+
+    def test_cat_forwards_blocks(self):
+        chunks = app.Cat().stream([self.file_name], None)
+        self.assertEqual(b"".join(map(bytes, chunks)), self.data)
+        self.assertIs(
+            next(app.Cat().stream([], iter([self.data]))), self.data
+            )
+
+    def test_head_forwards_chunks(self):
+        chunks = [b"a\nb\n", b"c\nd\n"]
+        output = list(app.Head().stream(["-n", "3"], iter(chunks)))
+        self.assertIs(output[0], chunks[0])
+        self.assertIs(type(output[1]), memoryview)
+        self.assertEqual(bytes(output[1]), b"c\n")
+
+    def test_head_of_file(self):
+        for n in [0, 1, 1500, 2000, 3000]:
+            output = app.Head().stream(["-n", str(n), self.file_name], None)
+            self.assertEqual(
+                b"".join(map(bytes, output)),
+                b"".join(self.data.splitlines(keepends=True)[:n]),
+                n,
+                )
+
+    def test_chunks_are_kept_by_readers(self):
+        calls = [f"cat {self.file_name}"] + ["cat"] * 10
+        out = deque()
+        Pipe(*map(Call, calls)).eval(out)
+        self.assertEqual(out.pop().encode(), self.data)
+        output = threaded([Call(call) for call in calls], threads=4)
+        self.assertEqual(b"".join(map(bytes, output)), self.data)
+        self.assertEqual(
+            b"".join(Upper().stream([], app.read_blocks(self.file_name))),
+            self.data.upper(),
+            )
+
+    def test_grep_stream_of_files_is_exec(self):
+        first = os.path.join(self.directory.name, "first.txt")
+        second = os.path.join(self.directory.name, "second.txt")
+        with open(first, "w") as f:
+            f.write("a1\nb1\na2")
+        with open(second, "w") as f:
+            f.write("a3\n")
+        for files in [[first], [first, second], [second, first]]:
+            out = deque()
+            app.Grep().exec(["a", *files], out, False)
+            output = app.Grep().stream(["a", *files], None)
+            self.assertEqual(
+                b"".join(map(bytes, output)).decode(), out.pop(), files
+                )
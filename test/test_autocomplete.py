@@ -1,5 +1,6 @@
 import unittest
 import subprocess
+import applications
 from autocomplete import APPLICATIONS, Completer
 
 
@@ -71,6 +72,9 @@ class TestCommandEvaluator(unittest.TestCase):
         res.append(self.completer.autocomplete_application(text, i+1))
         self.assertCountEqual(res, ["cd", "cat", "clear", "cut", None])
 
+    def test_every_application_is_completed(self):
+        self.assertCountEqual(APPLICATIONS, applications.APPLICATIONS)
+
     def test_autocomplete_flag(self):
         text = "head -"
         text_split = text.split(' ')
@@ -1,10 +1,9 @@
 import unittest
 from collections import deque
 import subprocess
-from parser import Parser
 from call_evaluator import (
-    CommandSubstituitionVisitor,
-    CallTreeVisitor,
+    call_plan,
+    command_substitution,
     InvalidCommandSubstitution,
 )
 
@@ -35,7 +34,6 @@ class TestCallEvaluator(unittest.TestCase):
             ]
         )
         self.prepare(filesystem_setup)
-        self.parser = Parser()
         self.out = deque()
 
     def tearDown(self):
@@ -46,44 +44,36 @@ class TestCallEvaluator(unittest.TestCase):
             print("error: failed to remove unittests directory")
             exit(1)
 
-    def _call_tree_visitor(self, cmd):
-        call_tree = self.parser.call_level_parse(cmd)
+    def _resolve(self, cmd):
+        # backquoted commands are left as they are
+        return call_plan(cmd).resolve(lambda command: command)
 
-        call_tree_visitor = CallTreeVisitor()
-        call_tree_visitor.visit_topdown(call_tree)
-
-        return (
-            call_tree_visitor.application,
-            call_tree_visitor.args,
-            call_tree_visitor.file_output,
-        )
-
-    def test_call_visitor_with_single_quotes(self):
-        application, args, file_output = self._call_tree_visitor("echo 'foo'")
+    def test_call_with_single_quotes(self):
+        application, args, file_output = self._resolve("echo 'foo'")
 
         self.assertEqual(application, "echo")
         self.assertEqual(len(args), 1)
         self.assertEqual(args[0], "foo")
         self.assertEqual(file_output, None)
 
-    def test_call_visitor_with_double_quotes(self):
-        application, args, file_output = self._call_tree_visitor('echo "bar"')
+    def test_call_with_double_quotes(self):
+        application, args, file_output = self._resolve('echo "bar"')
 
         self.assertEqual(application, "echo")
         self.assertEqual(len(args), 1)
         self.assertEqual(args[0], "bar")
         self.assertEqual(file_output, None)
 
-    def test_call_visitor_with_back_quotes(self):
-        application, args, file_output = self._call_tree_visitor("echo `fizz`")
+    def test_call_with_back_quotes(self):
+        application, args, file_output = self._resolve("echo `fizz`")
 
         self.assertEqual(application, "echo")
         self.assertEqual(len(args), 1)
         self.assertEqual(args[0], "fizz")
         self.assertEqual(file_output, None)
 
-    def test_call_visitor_with_back_quotes_nested_in_double_quotes(self):
-        application, args, file_output = self._call_tree_visitor(
+    def test_call_with_back_quotes_nested_in_double_quotes(self):
+        application, args, file_output = self._resolve(
             'echo "`fizz`"'
             )
 
@@ -92,8 +82,8 @@ class TestCallEvaluator(unittest.TestCase):
         self.assertEqual(args[0], "fizz")
         self.assertEqual(file_output, None)
 
-    def test_call_visitor_with_empty(self):
-        application, args, file_output = self._call_tree_visitor("echo ''")
+    def test_call_with_empty(self):
+        application, args, file_output = self._resolve("echo ''")
 
         self.assertEqual(application, "echo")
         self.assertEqual(len(args), 1)
@@ -101,7 +91,7 @@ class TestCallEvaluator(unittest.TestCase):
         self.assertEqual(file_output, None)
 
     def test_call_with_two_arguments_containing_no_quotes(self):
-        application, args, file_output = self._call_tree_visitor(
+        application, args, file_output = self._resolve(
             "echo foo bar"
             )
 
@@ -112,7 +102,7 @@ class TestCallEvaluator(unittest.TestCase):
         self.assertEqual(file_output, None)
 
     def test_call_with_argument_containing_quotes_with_spaces(self):
-        application, args, file_output = self._call_tree_visitor(
+        application, args, file_output = self._resolve(
             'echo "foo bar"'
             )
 
@@ -122,7 +112,7 @@ class TestCallEvaluator(unittest.TestCase):
         self.assertEqual(file_output, None)
 
     def test_call_with_argument_containing_quoted_and_unquoted_content(self):
-        application, args, file_output = self._call_tree_visitor('echo f"o"o')
+        application, args, file_output = self._resolve('echo f"o"o')
 
         self.assertEqual(application, "echo")
         self.assertEqual(len(args), 1)
@@ -130,7 +120,7 @@ class TestCallEvaluator(unittest.TestCase):
         self.assertEqual(file_output, None)
 
     def test_call_with_argument_containing_quoted_asterisk(self):
-        application, args, file_output = self._call_tree_visitor(
+        application, args, file_output = self._resolve(
             'echo "*.txt"'
             )
 
@@ -140,7 +130,7 @@ class TestCallEvaluator(unittest.TestCase):
         self.assertEqual(file_output, None)
 
     def test_argument_with_globbing(self):
-        application, args, file_output = self._call_tree_visitor(
+        application, args, file_output = self._resolve(
             'echo unittests/*.txt'
             )
         self.assertEqual(application, "echo")
@@ -159,7 +149,7 @@ class TestCallEvaluator(unittest.TestCase):
         self.assertEqual(file_output, None)
 
     def test_argument_with_unquoted_asterisk_and_globbing_equal_to_false(self):
-        application, args, file_output = self._call_tree_visitor("echo *.lark")
+        application, args, file_output = self._resolve("echo *.lark")
 
         self.assertEqual(application, "echo")
         self.assertEqual(len(args), 1)
@@ -167,7 +157,7 @@ class TestCallEvaluator(unittest.TestCase):
         self.assertEqual(file_output, None)
 
     def test_call_with_quoted_application(self):
-        application, args, file_output = self._call_tree_visitor('"echo" foo')
+        application, args, file_output = self._resolve('"echo" foo')
 
         self.assertEqual(application, "echo")
         self.assertEqual(len(args), 1)
@@ -175,7 +165,7 @@ class TestCallEvaluator(unittest.TestCase):
         self.assertEqual(file_output, None)
 
     def test_call_with_part_quoted_and_unquoted_application(self):
-        application, args, file_output = self._call_tree_visitor("e'ch'o foo")
+        application, args, file_output = self._resolve("e'ch'o foo")
 
         self.assertEqual(application, "echo")
         self.assertEqual(len(args), 1)
@@ -183,7 +173,7 @@ class TestCallEvaluator(unittest.TestCase):
         self.assertEqual(file_output, None)
 
     def test_call_with_prefix_redirection(self):
-        application, args, file_output = self._call_tree_visitor(
+        application, args, file_output = self._resolve(
             "< file.txt echo"
             )
 
@@ -193,63 +183,105 @@ class TestCallEvaluator(unittest.TestCase):
         self.assertEqual(file_output, None)
 
     def test_invalid_call(self):
-        self.assertEqual(
-            self.parser.call_level_parse("echo AAA >> file.txt"), False
-            )
+        self.assertIsNone(call_plan("echo AAA >> file.txt"))
 
 
-class TestCommandSubstitutionVisitor(unittest.TestCase):
+class TestCommandSubstitution(unittest.TestCase):
 
     def setUp(self):
-        self.parser = Parser()
+        p = subprocess.run(["mkdir", "unittests"], stdout=subprocess.DEVNULL)
+        if p.returncode != 0:
+            print("error: failed to create unittest directory")
+            exit(1)
         self.out = deque()
 
-    def test_command_substitution_visitor(self):
-        call_tree = self.parser.call_level_parse("echo `echo foo`")
-
-        command_substituition_visitor = CommandSubstituitionVisitor(self.out)
-        command_substituition_visitor.visit(call_tree)
+    def tearDown(self):
+        p = subprocess.run(
+            ["rm", "-r", "unittests"], stdout=subprocess.DEVNULL
+            )
+        if p.returncode != 0:
+            print("error: failed to remove unittests directory")
+            exit(1)
 
-        call_tree_visitor = CallTreeVisitor()
-        call_tree_visitor.visit_topdown(call_tree)
+    def test_command_substitution(self):
+        application, args, file_output = call_plan(
+            "echo `echo foo`"
+            ).resolve(command_substitution)
 
         self.assertEqual(len(self.out), 0)
-        self.assertEqual(len(call_tree_visitor.args), 1)
-        self.assertEqual(call_tree_visitor.args[0], "foo")
-        self.assertEqual(call_tree_visitor.file_output, None)
-
-    def test_command_substitution_visitor_with_invalid_command(self):
-        call_tree = self.parser.call_level_parse("echo `'''`")
+        self.assertEqual(application, "echo")
+        self.assertEqual(args, ["foo"])
+        self.assertEqual(file_output, None)
 
-        command_substituition_visitor = CommandSubstituitionVisitor(self.out)
+    def test_command_substitution_of_sequence(self):
+        self.assertEqual(command_substitution("echo foo; echo bar"), "foo bar")
 
+    def test_command_substitution_with_invalid_command(self):
         self.assertRaises(
-            InvalidCommandSubstitution,
-            command_substituition_visitor.visit,
-            call_tree
+            InvalidCommandSubstitution, command_substitution, "'''"
         )
 
+    def test_substitution_slots(self):
+        plan = call_plan('`echo echo` a"`echo b`" > `echo c`')
+        self.assertEqual(
+            plan.substitutions, ["echo echo", "echo b", "echo c"]
+            )
 
-class TestRedirectionVisitor(unittest.TestCase):
+    def test_plan_is_resolved_afresh(self):
+        plan = call_plan("echo `echo $x` unittests/*.txt")
+        outputs = iter(["a", "b"])
 
-    def setUp(self):
-        self.parser = Parser()
-        self.out = deque()
+        _, args, _ = plan.resolve(lambda command: next(outputs))
+        self.assertEqual(args, ["a", "unittests/*.txt"])
 
-    def _call_tree_visitor(self, cmd):
-        call_tree = self.parser.call_level_parse(cmd)
+        with open("unittests/new.txt", "w"):
+            pass
+        _, args, _ = plan.resolve(lambda command: next(outputs))
+        self.assertEqual(args, ["b", "unittests/new.txt"])
 
-        call_tree_visitor = CallTreeVisitor()
-        call_tree_visitor.visit_topdown(call_tree)
+    def test_compiled_plan_is_resolved_afresh(self):
+        resolve = call_plan("echo `echo $x` unittests/*.txt").compile()
+        outputs = iter(["a", "b"])
 
-        return (
-            call_tree_visitor.application,
-            call_tree_visitor.args,
-            call_tree_visitor.file_output,
-        )
+        self.assertEqual(
+            resolve(lambda command: next(outputs)),
+            ("echo", ["a", "unittests/*.txt"], None),
+            )
+        with open("unittests/new.txt", "w"):
+            pass
+        self.assertEqual(
+            resolve(lambda command: next(outputs)),
+            ("echo", ["b", "unittests/new.txt"], None),
+            )
+
+    def test_static_plan_is_resolved_once(self):
+        resolve = call_plan("echo a 'b c' > out.txt").compile()
+        args = resolve(None)[1]
+        args.append("d")
+        self.assertEqual(
+            resolve(None), ("echo", ["a", "b c"], "out.txt")
+            )
+
+    def test_plan_is_cached(self):
+        self.assertIs(call_plan("echo foo"), call_plan("echo foo"))
+
+    def test_argument_templates_are_shared(self):
+        cat = call_plan("cat a.txt")
+        self.assertIs(call_plan("cat b.txt").application, cat.application)
+        self.assertIs(call_plan("echo 'x' a.txt").args[1], cat.args[0])
+
+
+class TestRedirection(unittest.TestCase):
+
+    def setUp(self):
+        self.out = deque()
+
+    def _resolve(self, cmd):
+        # backquoted commands are left as they are
+        return call_plan(cmd).resolve(lambda command: command)
 
-    def test_redirection_visitor_input(self):
-        application, args, file_output = self._call_tree_visitor(
+    def test_redirection_input(self):
+        application, args, file_output = self._resolve(
             "echo < file.txt"
             )
 
@@ -258,8 +290,8 @@ class TestRedirectionVisitor(unittest.TestCase):
         self.assertEqual(args[0], "file.txt")
         self.assertEqual(file_output, None)
 
-    def test_redirection_visitor_output(self):
-        application, args, file_output = self._call_tree_visitor(
+    def test_redirection_output(self):
+        application, args, file_output = self._resolve(
             "echo foo > file.txt"
             )
 
@@ -268,8 +300,8 @@ class TestRedirectionVisitor(unittest.TestCase):
         self.assertEqual(args[0], "foo")
         self.assertEqual(file_output, "file.txt")
 
-    def test_redirection_visitor_with_single_quoted_file_name(self):
-        application, args, file_output = self._call_tree_visitor(
+    def test_redirection_with_single_quoted_file_name(self):
+        application, args, file_output = self._resolve(
             "echo < 'file.txt'"
             )
 
@@ -278,8 +310,8 @@ class TestRedirectionVisitor(unittest.TestCase):
         self.assertEqual(args[0], "file.txt")
         self.assertEqual(file_output, None)
 
-    def test_redirection_visitor_with_double_quoted_file_name(self):
-        application, args, file_output = self._call_tree_visitor(
+    def test_redirection_with_double_quoted_file_name(self):
+        application, args, file_output = self._resolve(
             'echo < "file.txt"'
             )
 
@@ -288,8 +320,8 @@ class TestRedirectionVisitor(unittest.TestCase):
         self.assertEqual(args[0], "file.txt")
         self.assertEqual(file_output, None)
 
-    def test_redirection_visitor_with_back_quoted_file_name(self):
-        application, args, file_output = self._call_tree_visitor(
+    def test_redirection_with_back_quoted_file_name(self):
+        application, args, file_output = self._resolve(
             "echo < `echo file.txt`"
         )
 
@@ -298,10 +330,8 @@ class TestRedirectionVisitor(unittest.TestCase):
         self.assertEqual(args[0], "echo file.txt")
         self.assertEqual(file_output, None)
 
-    def test_redirection_visitor_with_nested_back_quoted_file_in_double_quotes(
-        self,
-    ):
-        application, args, file_output = self._call_tree_visitor(
+    def test_redirection_with_nested_back_quoted_file_in_double_quotes(self):
+        application, args, file_output = self._resolve(
             'echo < "`echo file.txt`"'
         )
 
@@ -310,8 +340,8 @@ class TestRedirectionVisitor(unittest.TestCase):
         self.assertEqual(args[0], "echo file.txt")
         self.assertEqual(file_output, None)
 
-    def test_redirection_visitor_with_empty_quoted_file_name(self):
-        application, args, file_output = self._call_tree_visitor("echo < ''")
+    def test_redirection_with_empty_quoted_file_name(self):
+        application, args, file_output = self._resolve("echo < ''")
 
         self.assertEqual(application, "echo")
         self.assertEqual(len(args), 1)
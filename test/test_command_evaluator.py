@@ -1,27 +1,32 @@
+import sys
+import inspect
 import unittest
-from parser import Parser
-from command_evaluator import extract_raw_commands
+from collections import deque
+from command_evaluator import parse, compile_command_line
 from commands import Call, Pipe
 
 
 class TestCommandEvaluator(unittest.TestCase):
-    def setUp(self):
-        self.parser = Parser()
-
     def _get_raw_commands(self, cmd):
-        command_tree = self.parser.command_level_parse(cmd)
-        raw_commands = extract_raw_commands(command_tree)
-        return raw_commands
+        return parse(cmd).commands
 
     def test_pipe(self):
         raw_commands = self._get_raw_commands("echo foo | echo")
 
         self.assertEqual(len(raw_commands), 1)
         self.assertEqual(type(raw_commands[0]), Pipe)
-        self.assertEqual(type(raw_commands[0].lhs()), Call)
-        self.assertEqual(type(raw_commands[0].rhs()), Call)
-        self.assertEqual(raw_commands[0].lhs().raw_command.strip(), "echo foo")
-        self.assertEqual(raw_commands[0].rhs().raw_command.strip(), "echo")
+        lhs, rhs = raw_commands[0].calls
+        self.assertEqual(type(lhs), Call)
+        self.assertEqual(type(rhs), Call)
+        self.assertEqual(lhs.raw_command.strip(), "echo foo")
+        self.assertEqual(rhs.raw_command.strip(), "echo")
+
+    def test_pipes_are_flat(self):
+        for cmd in ["echo a | cut -b 1 | cut -b 1", "echo a | cut -b '1' | b"]:
+            pipe = self._get_raw_commands(cmd)[0]
+            self.assertEqual(
+                [type(call) for call in pipe.calls], [Call, Call, Call]
+                )
 
     def test_extract_quoted_content_with_content_between_quotes(self):
         raw_commands = self._get_raw_commands("'foo'")
@@ -72,6 +77,104 @@ class TestCommandEvaluator(unittest.TestCase):
         self.assertEqual(type(raw_commands[0]), Call)
         self.assertEqual(raw_commands[0].raw_command, "echo bar")
 
+    def test_call_with_redirections(self):
+        raw_commands = self._get_raw_commands(" < in.txt  cat >out.txt ; ")
+
+        self.assertEqual(len(raw_commands), 2)
+        self.assertEqual(raw_commands[0].raw_command, "< in.txt  cat >out.txt")
+        application, args, file_output = raw_commands[0].plan.resolve(
+            lambda command: command
+            )
+        self.assertEqual(application, "cat")
+        self.assertEqual(args, ["in.txt"])
+        self.assertEqual(file_output, "out.txt")
+
+    def test_empty_calls(self):
+        raw_commands = self._get_raw_commands(";")
+
+        self.assertEqual(len(raw_commands), 2)
+        for call in raw_commands:
+            self.assertEqual(call.raw_command, "")
+            self.assertIsNone(call.plan)
+
+    def test_separators_in_quotes(self):
+        raw_commands = self._get_raw_commands("echo 'a;b' \"c|d\"")
+
+        self.assertEqual(len(raw_commands), 1)
+        self.assertEqual(raw_commands[0].raw_command, "echo 'a;b' \"c|d\"")
+
+    def test_invalid_call(self):
+        self.assertFalse(parse("echo foo; echo AAA >> file.txt"))
+
+
+class TestCompileCommandLine(unittest.TestCase):
+    def test_compile_command_line(self):
+        seq = compile_command_line("echo foo; echo bar")
+        out = deque()
+        seq.eval(out)
+        self.assertEqual(list(out), ["foo\n", "bar\n"])
+
+    def test_unrecognized_command_line(self):
+        self.assertIsNone(compile_command_line('echo "'))
+
+    def test_plans_are_cached(self):
+        cmdline = "echo cached | cut -b 1"
+        before = compile_command_line.cache_info()
+        seq = compile_command_line(cmdline)
+        self.assertIs(compile_command_line(cmdline), seq)
+        after = compile_command_line.cache_info()
+        self.assertEqual(after.misses - before.misses, 1)
+        self.assertEqual(after.hits - before.hits, 1)
+
+
+class TestLongCommandLines(unittest.TestCase):
+
+    """
+    Lines of many commands are parsed and evaluated iteratively, so they
+    run with little room left on the stack.
+    """
+
+    def setUp(self):
+        self.recursion_limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(len(inspect.stack(0)) + 100)
+
+    def tearDown(self):
+        sys.setrecursionlimit(self.recursion_limit)
+
+    def _seq(self, call, commands):
+        return "; ".join([call] * commands)
+
+    def _pipe(self, call, stages):
+        return "echo a" + f" | {call}" * (stages - 1)
+
+    def test_seq_of_10k_commands(self):
+        for call in ["echo a", "echo 'a'"]:
+            seq = parse(self._seq(call, 10_000))
+            self.assertEqual(len(seq.commands), 10_000)
+            out = deque()
+            seq.eval(out)
+            self.assertEqual(len(out), 10_000)
+
+    def test_pipe_of_10k_commands(self):
+        for call in ["cut -b 1", "cut -b '1'"]:
+            pipe = parse(self._pipe(call, 10_000)).commands[0]
+            self.assertEqual(len(list(pipe)), 10_000)
+            out = deque()
+            pipe.eval(out)
+            self.assertEqual(list(out), ["a"])
+
+    def test_seq_of_100k_commands(self):
+        for call in ["echo a", "'a'"]:
+            seq = parse(self._seq(call, 100_000))
+            self.assertEqual(len(seq.commands), 100_000)
+
+    def test_pipe_of_100k_commands(self):
+        pipe = parse(self._pipe("cut -b 1", 100_000)).commands[0]
+        self.assertEqual(len(list(pipe)), 100_000)
+        out = deque()
+        pipe.eval(out)
+        self.assertEqual(list(out), ["a"])
+
 
 if __name__ == "__main__":
     unittest.main()
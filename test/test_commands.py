@@ -1,4 +1,8 @@
 from commands import Call, Pipe, Seq
+import os
+import pickle
+import tempfile
+import tracemalloc
 import unittest
 from collections import deque
 
@@ -11,9 +15,10 @@ class TestCommands(unittest.TestCase):
     def test_call(self):
         call = Call("echo foo")
         call.eval(self.out)
-        self.assertEquals(call.application, "echo")
-        self.assertEquals(len(call.args), 1)
-        self.assertEquals(call.args[0], "foo")
+        application, args, _ = call.plan.resolve(lambda command: command)
+        self.assertEquals(application, "echo")
+        self.assertEquals(len(args), 1)
+        self.assertEquals(args[0], "foo")
         self.assertEquals(self.out.pop().strip(), "foo")
 
     def test_invalid_call(self):
@@ -33,7 +38,8 @@ class TestCommands(unittest.TestCase):
         call = Call("'' foo")
         call.eval(self.out)
         self.assertEquals(len(self.out), 0)
-        self.assertEquals(call.application, "")
+        application, _, _ = call.plan.resolve(lambda command: command)
+        self.assertEquals(application, "")
 
     def test_pipe(self):
         pipe = Pipe(Call("echo abc"), Call("cut -b 1"))
@@ -41,18 +47,114 @@ class TestCommands(unittest.TestCase):
         self.assertEquals(len(self.out), 1)
         self.assertEquals(self.out.pop().strip(), "a")
 
-    def test_nested_pipe(self):
+    def test_pipe_of_three_calls(self):
         pipe = Pipe(
-            Pipe(
-                Call("echo abc"),
-                Call("cut -b -1,2-")
-                ),
+            Call("echo abc"),
+            Call("cut -b -1,2-"),
             Call("cut -b 1")
             )
         pipe.eval(self.out)
         self.assertEquals(len(self.out), 1)
         self.assertEquals(self.out.pop().strip(), "a")
 
+    def test_pipe_streams_stdin(self):
+        pipe = Pipe(Call("echo abc"), Call("cat"), Call("head -n 1"))
+        pipe.eval(self.out)
+        self.assertEquals(list(self.out), ["abc\n"])
+
+    def test_pipe_memory_is_bounded_by_lines(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "big.txt")
+            with open(file_name, "w") as f:
+                for i in range(100_000):
+                    f.write(f"line {i:08} of the file\n")
+            file_size = os.path.getsize(file_name)
+            pipe = Pipe(
+                Call(f"cat {file_name}"),
+                Call("grep .*99999"),
+                Call("cut -b 6-"),
+                )
+            tracemalloc.start()
+            try:
+                pipe.eval(self.out)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+        self.assertEquals(list(self.out), ["00099999 of the file"])
+        self.assertLess(peak, file_size // 20)
+
+    def test_call_reads_bytes_as_a_pipe_does(self):
+        with tempfile.TemporaryDirectory() as directory:
+            latin_1 = os.path.join(directory, "l1.txt")
+            with open(latin_1, "wb") as f:
+                f.write(b"caf\xe9\n")
+            utf_8 = os.path.join(directory, "u.txt")
+            with open(utf_8, "wb") as f:
+                f.write("café\ns\n".encode())
+            for call, piped in [
+                (f"cat {latin_1}", f"cat {latin_1} | cat"),
+                (f"_cat {latin_1}", f"cat {latin_1} | _cat"),
+                (f"cut -b 1-4 {utf_8}", f"cat {utf_8} | cut -b 1-4"),
+                (f"grep ^caf.s {utf_8}", f"cat {utf_8} | grep ^caf.s"),
+                (f"sort -r {latin_1}", f"cat {latin_1} | sort -r"),
+            ]:
+                out = deque()
+                Call(call).eval(out)
+                Pipe(*map(Call, piped.split(" | "))).eval(self.out)
+                self.assertEqual(list(out), list(self.out), call)
+                self.out.clear()
+
+    def test_call_is_not_modified_by_eval(self):
+        call = Call("echo `echo foo`")
+        plan = call.plan
+        call.eval(self.out)
+        call.eval(self.out)
+        self.assertIs(call.plan, plan)
+        self.assertEquals(self.out.pop().strip(), "foo")
+        self.assertEquals(self.out.pop().strip(), "foo")
+
+    def test_call_is_compiled_once(self):
+        call = Call("echo foo")
+        call.eval(self.out)
+        compiled = call.compiled
+        call.eval(self.out)
+        self.assertIs(call.compiled, compiled)
+        self.assertEquals(list(self.out), ["foo\n", "foo\n"])
+
+    def test_substituted_application_is_resolved_afresh(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "app.txt")
+            call = Call(f"`cat {file_name}` foo")
+            for app in ["echo", "_foo"]:
+                with open(file_name, "w") as f:
+                    f.write(app)
+                call.eval(self.out)
+        self.assertEquals(
+            list(self.out), ["foo\n", "Unsupported Application: foo\n"]
+            )
+
+    def test_unsupported_application_is_reported_every_time(self):
+        call = Call("_foo bar")
+        for _ in range(2):
+            call.eval(self.out)
+            self.out.append(b"".join(call.stream()).decode())
+        self.assertEquals(
+            list(self.out), ["Unsupported Application: foo\n"] * 4
+            )
+
+    def test_compiled_call_is_pickled_without_its_closures(self):
+        call = Call("echo foo")
+        call.eval(self.out)
+        copy = pickle.loads(pickle.dumps(call))
+        self.assertIsNone(copy.compiled)
+        copy.eval(self.out)
+        self.assertEquals(list(self.out), ["foo\n", "foo\n"])
+
+    def test_commands_have_no_instance_dicts(self):
+        call = Call("echo foo")
+        for command in [call, Pipe(call, call), Seq([call])]:
+            self.assertFalse(hasattr(command, "__dict__"))
+
     def test_seq(self):
         seq = Seq([Call("echo foo"), Call("echo bar")])
         seq.eval(self.out)
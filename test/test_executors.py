@@ -0,0 +1,214 @@
+import os
+import time
+import tempfile
+import unittest
+import multiprocessing
+import applications
+import commands
+import executors
+from collections import deque
+from command_evaluator import compile_command_line
+from commands import Call
+from executors import ThreadedStage, processes, sequential, threaded
+
+
+def joined(chunks):
+    """the bytes of chunks"""
+    return b"".join(map(bytes, chunks))
+
+
+class TestExecutors(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, "lines.txt")
+        with open(self.file_name, "w") as f:
+            for i in range(5000):
+                f.write(f"{i % 7} line {i}\n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _calls(self, *calls):
+        return [Call(call.format(file=self.file_name)) for call in calls]
+
+    def test_executors_are_sequential(self):
+        for calls in [
+            ["cat {file}", "grep 3", "cut -b 3-"],
+            ["cat {file}", "sort", "uniq", "tail -n 3"],
+            ["echo foo", "cat"],
+            ["cat {file}", "_uniq x y"],
+        ]:
+            expected = joined(sequential(self._calls(*calls)))
+            for executor in [threaded, processes]:
+                self.assertEqual(
+                    joined(executor(self._calls(*calls))),
+                    expected,
+                    (executor, calls),
+                    )
+
+    def test_long_pipe_is_spread_over_threads(self):
+        calls = self._calls("echo abc", *["cut -b 1-"] * 1000)
+        self.assertEqual(joined(threaded(calls, threads=4)), b"abc")
+
+    def test_segment_of_a_long_pipe_is_within_the_recursion_limit(self):
+        calls = self._calls(
+            "cat {file}", *["_grep .*line"] * executors.STREAM_DEPTH
+            )
+        self.assertEqual(joined(sequential(calls)).count(b"\n"), 4999)
+
+    def test_errors_are_raised_by_the_reader(self):
+        for executor in [threaded, processes]:
+            calls = self._calls("cat missing.txt", "grep 3", "cut -b 1")
+            with self.assertRaises(FileNotFoundError):
+                joined(executor(calls))
+
+    def test_slow_reader_throttles_the_stage(self):
+        produced = []
+
+        def stream():
+            for i in range(1000):
+                produced.append(i)
+                yield str(i).encode()
+
+        stage = ThreadedStage(stream(), queue_size=2, batch_size=1)
+        chunks = iter(stage)
+        self.assertEqual(next(chunks), b"0")
+        time.sleep(0.1)
+        # a batch read, two queued and one waiting to be queued
+        self.assertLessEqual(len(produced), 4)
+        chunks.close()
+        stage.thread.join()
+        self.assertLess(len(produced), 1000)
+
+    def test_closed_stage_closes_its_stream(self):
+        closed = []
+
+        def stream():
+            try:
+                while True:
+                    yield b"chunk"
+            finally:
+                closed.append(True)
+
+        stage = ThreadedStage(stream(), queue_size=1)
+        stage.close()
+        stage.thread.join()
+        self.assertEqual(closed, [True])
+
+    def test_executors_are_named(self):
+        self.assertEqual(
+            set(executors.EXECUTORS), {"sequential", "threaded", "processes"}
+            )
+
+
+class TestEarlyTermination(unittest.TestCase):
+
+    """a call which stops reading its stdin stops the calls before it"""
+
+    LINES = 200_000
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, "huge.log")
+        with open(self.file_name, "w") as f:
+            for i in range(self.LINES):
+                level = "ERROR" if i % 10 == 0 else "INFO"
+                f.write(f"{level} request {i}\n")
+        self.size = os.path.getsize(self.file_name)
+        self.reads = []
+        self.read_blocks = applications.read_blocks
+        applications.read_blocks = self._read_blocks
+        self.read_line_batches = applications.read_line_batches
+        applications.read_line_batches = self._read_line_batches
+
+    def tearDown(self):
+        applications.read_blocks = self.read_blocks
+        applications.read_line_batches = self.read_line_batches
+        self.directory.cleanup()
+
+    def _read_blocks(self, file_name):
+        """read_blocks, recording how much of the file was read"""
+        f = open(file_name, "rb", buffering=0)
+        try:
+            while True:
+                block = f.read(applications.BLOCK_SIZE)
+                if not block:
+                    return
+                yield block
+        finally:
+            self.reads.append(f.tell())
+            f.close()
+
+    def _read_line_batches(self, file_name):
+        """read_line_batches, recording how much of the file was read"""
+        f = open(file_name, "rb")
+        try:
+            while True:
+                lines = f.readlines(applications.BLOCK_SIZE)
+                if not lines:
+                    return
+                yield applications.Lines(lines)
+        finally:
+            self.reads.append(f.tell())
+            f.close()
+
+    def _calls(self):
+        return [
+            Call(f"cat {self.file_name}"),
+            Call("grep ERROR"),
+            Call("head -n 5"),
+        ]
+
+    def test_upstream_file_is_not_read_to_the_end(self):
+        for executor in [sequential, threaded]:
+            self.reads.clear()
+            output = joined(executor(self._calls()))
+            self.assertEqual(output.count(b"ERROR"), 5, executor)
+            self.assertEqual(len(self.reads), 1, executor)
+            self.assertLess(self.reads[0], self.size // 10, executor)
+
+    def test_long_pipe_is_not_read_to_the_end(self):
+        self.assertGreaterEqual(executors.STREAM_DEPTH, 100)
+        calls = [
+            Call(f"cat {self.file_name}"),
+            *[Call("grep .*request")] * 50,
+            Call("head -n 1"),
+        ]
+        self.assertEqual(joined(sequential(calls)), b"ERROR request 0\n")
+        self.assertEqual(len(self.reads), 1)
+        self.assertLess(self.reads[0], self.size // 10)
+
+    def test_command_line_stops_reading_its_file(self):
+        # cat is rewritten away, so grep reads the file itself
+        cmdline = f"cat {self.file_name} | grep ERROR | head -n 5"
+        pipe_executor = commands.PIPE_EXECUTOR
+        try:
+            for executor in ["sequential", "threaded"]:
+                commands.PIPE_EXECUTOR = executor
+                self.reads.clear()
+                out = deque()
+                compile_command_line(cmdline).eval(out)
+                self.assertEqual("".join(out).count("ERROR"), 5, executor)
+                self.assertEqual(len(self.reads), 1, executor)
+                self.assertLess(self.reads[0], self.size // 10, executor)
+        finally:
+            commands.PIPE_EXECUTOR = pipe_executor
+
+    def test_upstream_file_is_closed_when_reader_stops(self):
+        for executor in [sequential, threaded]:
+            self.reads.clear()
+            calls = [Call(f"cat {self.file_name}"), Call("grep ERROR")]
+            stream = iter(executor(calls))
+            self.assertIn(b"ERROR", bytes(next(stream)))
+            stream.close()
+            self.assertEqual(len(self.reads), 1, executor)
+            self.assertLess(self.reads[0], self.size // 10, executor)
+
+    def test_upstream_worker_is_stopped(self):
+        calls = self._calls()
+        start = time.perf_counter()
+        output = joined(processes(calls))
+        self.assertEqual(output.count(b"ERROR"), 5)
+        self.assertEqual(multiprocessing.active_children(), [])
+        self.assertLess(time.perf_counter() - start, 5)
@@ -0,0 +1,147 @@
+import os
+import pickle
+import tempfile
+import unittest
+from collections import deque
+from autocomplete import APPLICATIONS
+from command_evaluator import compile_command_line, parse
+from explain import PARALLEL_EXECUTORS, Explain, explain_command, explain_line
+from settings import PIPE_EXECUTOR
+
+
+class TestExplain(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = self.directory.name
+        for name, size in [("a.txt", 2048), ("b.txt", 3)]:
+            with open(os.path.join(self.path, name), "w") as f:
+                f.write("x" * (size - 1) + "\n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _explain(self, cmdline):
+        out = deque()
+        compile_command_line(
+            "explain " + cmdline.format(path=self.path)
+            ).eval(out)
+        self.assertEqual(len(out), 1)
+        return out.pop()
+
+    def test_explain_is_a_command(self):
+        self.assertIsNone(explain_command("echo explain"))
+        self.assertIsNone(explain_command("explained"))
+        seq = parse("explain cat a.txt | grep a; echo b")
+        (command,) = seq.commands
+        self.assertIs(type(command), Explain)
+        self.assertEqual(command.cmdline, "cat a.txt | grep a; echo b")
+        self.assertEqual(
+            pickle.loads(pickle.dumps(command)).cmdline, command.cmdline
+            )
+
+    def test_nothing_is_run(self):
+        self._explain(
+            "echo `echo x > {path}/made.txt` > {path}/out.txt; "
+            "cat {path}/a.txt | sort > {path}/sorted.txt"
+            )
+        for name in ["made.txt", "out.txt", "sorted.txt"]:
+            self.assertFalse(os.path.exists(os.path.join(self.path, name)))
+
+    def test_pipe(self):
+        explained = self._explain(
+            "cat {path}/a.txt | grep x | sort -r > {path}/out.txt"
+            )
+        path = self.path
+        parallel = PARALLEL_EXECUTORS.get(PIPE_EXECUTOR)
+        streaming, in_memory = (
+            f"{strategy}, {parallel}" if parallel else strategy
+            for strategy in ["streaming", "in-memory"]
+            )
+        self.assertEqual(
+            explained.splitlines(),
+            [
+                f"explain cat {path}/a.txt | grep x | sort -r > "
+                f"{path}/out.txt",
+                f"command 1: pipe of 3 calls, run {PIPE_EXECUTOR}",
+                f"  rewrite cat_file: cat {path}/a.txt | grep x -> "
+                f"grep x {path}/a.txt",
+                f"  1. grep x {path}/a.txt",
+                "     application: Grep",
+                "     arguments: 2",
+                "     output: the next call",
+                f"     input files: {path}/a.txt (2.0 KiB)",
+                f"     strategy: {streaming}",
+                f"  2. sort -r > {path}/out.txt",
+                "     application: Sort",
+                "     arguments: 1",
+                f"     output: {path}/out.txt",
+                f"     strategy: {in_memory}",
+                "  input read: 2.0 KiB",
+            ],
+            )
+
+    def test_globbing_and_substitution(self):
+        explained = self._explain("_cat {path}/*.txt `echo c.txt`")
+        self.assertIn("application: UnsafeDecorator(Cat)", explained)
+        self.assertIn("arguments: 2", explained)
+        self.assertIn(f"{self.path}/*.txt: 2 matches", explained)
+        self.assertIn("`echo c.txt`: substituted when run", explained)
+        self.assertIn("input read: 2.0 KiB", explained)
+        self.assertIn("strategy: streaming", explained)
+
+    def test_unresolved_applications(self):
+        explained = self._explain("`echo cat` a | foo b")
+        self.assertIn("application: substituted when run", explained)
+        self.assertIn("application: unsupported (foo)", explained)
+
+    def test_background_commands(self):
+        explained = self._explain(
+            "sort {path}/a.txt | uniq & echo a"
+            ).splitlines()
+        self.assertIn(
+            "command 1: pipe of 2 calls, run "
+            f"{PIPE_EXECUTOR}, in the background",
+            explained,
+            )
+        self.assertIn("command 2: call", explained)
+
+    def test_single_calls_stream(self):
+        explained = self._explain(
+            "cat {path}/a.txt; sort {path}/a.txt; echo a"
+            ).splitlines()
+        strategies = [line.strip().split(",")[0] for line in explained
+                      if "strategy:" in line]
+        self.assertEqual(strategies, [
+            "strategy: streaming",
+            "strategy: in-memory",
+            "strategy: in-memory (executed whole)",
+        ])
+
+    def test_last_background_command(self):
+        explained = self._explain("sort {path}/a.txt &")
+        self.assertNotIn("unrecognized", explained)
+        self.assertEqual(explained.count("\ncommand "), 1)
+
+    def test_explain_after_other_commands(self):
+        out = deque()
+        compile_command_line(
+            f"echo hi; explain cat {self.path}/b.txt"
+            ).eval(out)
+        self.assertEqual(out.popleft(), "hi\n")
+        self.assertEqual(out.pop(), explain_line(f"cat {self.path}/b.txt"))
+        self.assertIn("explain", APPLICATIONS)
+        for cmdline, expected in [
+            ("echo a | _explain echo x",
+             "Explain Can Not Take Arguments From stdin: _explain echo x\n"),
+            ("echo a; _explain", "a\nInvalid Arguments: _explain\n"),
+        ]:
+            out = deque()
+            compile_command_line(cmdline).eval(out)
+            self.assertEqual("".join(out), expected, cmdline)
+
+    def test_invalid_command_lines(self):
+        self.assertEqual(explain_line(""), "Invalid Arguments: explain\n")
+        self.assertEqual(
+            explain_line("echo a >> b"), "Unrecognized Input: echo a >> b\n"
+            )
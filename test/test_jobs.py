@@ -0,0 +1,105 @@
+import os
+import tempfile
+import threading
+import unittest
+from collections import deque
+import jobs
+from command_evaluator import compile_command_line, parse
+from commands import Background, Call
+from command_interface import Command
+from exceptions import ApplicationExcecutionError
+
+
+class Blocked(Command):
+
+    """outputs text once released"""
+
+    def __init__(self, text):
+        self.text = text
+        self.released = threading.Event()
+
+    def eval(self, out, in_pipe=False):
+        self.released.wait(10)
+        out.append(self.text)
+
+
+class TestJobs(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = self.directory.name
+        with open(os.path.join(self.path, "a.txt"), "w") as f:
+            f.write("b\na\nc\n")
+
+    def tearDown(self):
+        jobs.wait([], deque())
+        self.directory.cleanup()
+
+    def _eval(self, cmdline):
+        out = deque()
+        compile_command_line(cmdline.format(path=self.path)).eval(out)
+        return "".join(out)
+
+    def test_background_commands(self):
+        seq = parse("sort a.txt | uniq & echo a; echo b &")
+        background, call, _, empty = seq.commands
+        self.assertIs(type(background), Background)
+        self.assertEqual(background.raw_command, "sort a.txt | uniq")
+        self.assertIs(type(call), Call)
+        self.assertEqual(empty.raw_command, "")
+        for cmdline in ["&", "echo a && echo b", "echo a; & echo b"]:
+            self.assertIsNone(compile_command_line(cmdline), cmdline)
+
+    def test_output_is_collected_by_the_job(self):
+        self.assertEqual(self._eval("sort {path}/a.txt & echo x"), "x\n")
+        self.assertEqual(self._eval("wait"), "a\nb\nc\n")
+        self.assertEqual(jobs.jobs(), [])
+
+    def test_jobs_are_listed_until_waited_for(self):
+        blocked = Blocked("x\n")
+        jobs.start("blocked", blocked)
+        self._eval("echo y > {path}/y.txt &")
+        second = jobs.jobs()[1]
+        second.future.result()
+        self.assertEqual(
+            self._eval("jobs"),
+            "[1] Running blocked &\n"
+            f"[2] Done    echo y > {self.path}/y.txt &\n",
+            )
+        self.assertEqual(jobs.finished(), [second])
+        self.assertEqual(jobs.finished(), [])
+        blocked.released.set()
+        self.assertEqual(self._eval("fg %1"), "x\n")
+        self.assertEqual(jobs.jobs(), [second])
+        self.assertEqual(jobs.finished(), [])
+
+    def test_fg_waits_for_the_last_job(self):
+        self._eval("echo a & echo b &")
+        self.assertEqual(self._eval("fg"), "b\n")
+        self.assertEqual(self._eval("fg"), "a\n")
+        with self.assertRaises(ApplicationExcecutionError):
+            self._eval("fg")
+        self.assertEqual(self._eval("_fg"), "No Such Job: _fg\n")
+
+    def test_wait_for_numbered_jobs(self):
+        self._eval("echo a & echo b & echo c &")
+        self.assertEqual(self._eval("wait 3 %1 3"), "c\na\n")
+        self.assertEqual(self._eval("_wait 1"), "No Such Job: _wait 1\n")
+        self.assertEqual(self._eval("_wait x"), "Invalid Arguments: _wait x\n")
+        self.assertEqual(self._eval("wait"), "b\n")
+
+    def test_errors_are_raised_by_wait(self):
+        self._eval("cat {path}/missing.txt & echo a & _cat missing.txt &")
+        out = deque()
+        with self.assertRaises(FileNotFoundError):
+            compile_command_line("wait").eval(out)
+        self.assertEqual("".join(out), "a\nOS Error: _cat missing.txt\n")
+        self.assertEqual(jobs.jobs(), [])
+
+    def test_a_job_does_not_wait_for_itself(self):
+        self._eval("echo a & wait &")
+        self.assertEqual(self._eval("wait"), "a\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+from io import BytesIO, StringIO, TextIOWrapper
+from commands import Call, Pipe, Seq
+from output import BUFFER_SIZE, Output, Sink
+
+
+class Buffer(BytesIO):
+
+    """a binary stdout recording its writes"""
+
+    def __init__(self, tty=False):
+        super().__init__()
+        self.tty = tty
+        self.writes = []
+
+    def isatty(self):
+        return self.tty
+
+    def write(self, data):
+        self.writes.append(bytes(data))
+        return super().write(data)
+
+
+class TestOutput(unittest.TestCase):
+
+    def setUp(self):
+        self.stream = StringIO()
+        self.out = Output(self.stream)
+
+    def test_flush(self):
+        self.out.extend(["foo\n", "bar\n"])
+        self.out.flush()
+        self.assertEqual(self.stream.getvalue(), "foo\nbar\n")
+        self.assertEqual(len(self.out), 0)
+
+    def test_commands_are_written_as_they_run(self):
+        seq = Seq([Call("echo foo"), Call("cat missing.txt")])
+        with self.assertRaises(FileNotFoundError):
+            seq.eval(self.out)
+        self.assertEqual(self.stream.getvalue(), "foo\n")
+
+    def test_stream_is_written_while_produced(self):
+        written = []
+
+        def chunks():
+            yield b"foo\n"
+            written.append(self.stream.getvalue())
+            yield b"bar\n"
+
+        self.out.append("before\n")
+        self.out.write_stream(chunks())
+        self.assertEqual(written, ["before\nfoo\n"])
+        self.assertEqual(self.stream.getvalue(), "before\nfoo\nbar\n")
+
+    def test_pipe_is_written_to_output(self):
+        Pipe(Call("echo foo"), Call("cut -b 1")).eval(self.out)
+        self.assertEqual(len(self.out), 0)
+        self.assertEqual(self.stream.getvalue(), "f")
+
+
+class TestSink(unittest.TestCase):
+
+    def _stdout(self, tty=False):
+        return TextIOWrapper(Buffer(tty), encoding="utf-8")
+
+    def test_text_is_gathered_into_large_writes(self):
+        stdout = self._stdout()
+        sink = Sink(stdout)
+        for i in range(10_000):
+            sink.write(f"line {i} é\n")
+        sink.flush()
+        writes = stdout.buffer.writes
+        self.assertLessEqual(len(writes), 10_000 * 10 // BUFFER_SIZE + 1)
+        self.assertEqual(
+            b"".join(writes).decode(),
+            "".join(f"line {i} é\n" for i in range(10_000)),
+            )
+
+    def test_lines_are_written_on_a_terminal(self):
+        stdout = self._stdout(tty=True)
+        sink = Sink(stdout)
+        sink.write("foo")
+        self.assertEqual(stdout.buffer.writes, [])
+        sink.write("\nbar\n")
+        self.assertEqual(stdout.buffer.writes, [b"foo\nbar\n"])
+
+    def test_text_written_before_comes_first(self):
+        stdout = self._stdout()
+        stdout.write("prompt> ")
+        sink = Sink(stdout)
+        sink.write("foo\n")
+        sink.flush()
+        self.assertEqual(stdout.buffer.getvalue(), b"prompt> foo\n")
+
+    def test_bytes_are_written_as_they_are(self):
+        stdout = self._stdout()
+        sink = Sink(stdout)
+        sink.write_bytes(b"\xff\xfe\n")
+        sink.flush()
+        self.assertEqual(stdout.buffer.getvalue(), b"\xff\xfe\n")
+
+    def test_bytes_are_encoded_for_stdout(self):
+        stdout = TextIOWrapper(Buffer(), encoding="latin-1")
+        sink = Sink(stdout)
+        sink.write_bytes("é\n".encode())
+        sink.flush()
+        self.assertEqual(stdout.buffer.getvalue(), b"\xe9\n")
+
+    def test_invalid_bytes_are_written_as_they_are_for_stdout(self):
+        stdout = TextIOWrapper(Buffer(), encoding="latin-1")
+        sink = Sink(stdout)
+        sink.write_bytes(b"caf\xe9\n" + "é\n".encode())
+        sink.write("\udcff\n")  # decoded from the bytes of a pipe
+        sink.flush()
+        self.assertEqual(stdout.buffer.getvalue(), b"caf\xe9\n\xe9\n\xff\n")
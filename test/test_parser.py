@@ -0,0 +1,95 @@
+import os
+import unittest
+import subprocess
+import standalone_parser
+from parser import Lark, Parser, _parse_tables, grammar_digest
+from parser import build_parse_tables
+
+
+class TestParserCache(unittest.TestCase):
+    def setUp(self):
+        p = subprocess.run(["mkdir", "unittests"], stdout=subprocess.DEVNULL)
+        if p.returncode != 0:
+            print("error: failed to create unittest directory")
+            exit(1)
+        self.cache_dir = os.path.join("unittests", "cache")
+
+    def tearDown(self):
+        p = subprocess.run(
+            ["rm", "-r", "unittests"], stdout=subprocess.DEVNULL
+            )
+        if p.returncode != 0:
+            print("error: failed to remove unittests directory")
+            exit(1)
+
+    def _cache_files(self):
+        return os.listdir(self.cache_dir)
+
+    def _parser(self, cache_dir):
+        return Lark._load_from_dict(*_parse_tables(cache_dir))
+
+    def test_cache_is_written(self):
+        _parse_tables(self.cache_dir)
+        files = self._cache_files()
+        self.assertEqual(len(files), 1)
+        self.assertTrue(files[0].startswith("shell_grammar-"))
+
+    def test_cached_parser_parses_like_built_parser(self):
+        cmd = "echo 'foo' \"a`echo b`\" < in.txt > out.txt"
+        _parse_tables(self.cache_dir)
+        cached = self._parser(self.cache_dir)
+        self.assertEqual(
+            cached.parse(cmd, start="call"), Parser().parse(cmd, "call")
+            )
+
+    def test_corrupt_cache_is_rebuilt(self):
+        _parse_tables(self.cache_dir)
+        cache_file = os.path.join(self.cache_dir, self._cache_files()[0])
+        with open(cache_file, "wb") as f:
+            f.write(b"not a parser")
+        parser = self._parser(self.cache_dir)
+        self.assertTrue(parser.parse("echo foo", start="command"))
+        self.assertGreater(os.path.getsize(cache_file), len(b"not a parser"))
+
+    def test_stale_cache_is_replaced(self):
+        os.makedirs(self.cache_dir)
+        stale = os.path.join(self.cache_dir, "shell_grammar-stale")
+        with open(stale, "wb") as f:
+            f.write(b"tables of an older grammar")
+        _parse_tables(self.cache_dir)
+        files = self._cache_files()
+        self.assertEqual(len(files), 1)
+        self.assertNotEqual(files[0], "shell_grammar-stale")
+
+    def test_unwritable_cache_dir(self):
+        with open(os.path.join("unittests", "file.txt"), "w") as f:
+            f.write("a file, not a directory")
+        cache_dir = os.path.join("unittests", "file.txt", "cache")
+        parser = self._parser(cache_dir)
+        self.assertTrue(parser.parse("echo foo", start="command"))
+
+    def test_cache_disabled(self):
+        parser = self._parser("")
+        self.assertTrue(parser.parse("echo foo", start="command"))
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+
+class TestStandaloneParser(unittest.TestCase):
+    def test_standalone_parser_is_up_to_date(self):
+        # run tools/generate_parser after changing a grammar
+        self.assertEqual(standalone_parser.GRAMMAR_DIGEST, grammar_digest())
+
+    def test_standalone_parser_parses_like_lark(self):
+        lark_parser = Lark._load_from_dict(*build_parse_tables())
+        standalone = standalone_parser.Lark._load_from_dict(
+            *standalone_parser.PARSE_TABLES
+            )
+        cmd = "echo 'a;b' | cut -b 1; echo \"`echo c`\" > out.txt"
+        self.assertEqual(
+            standalone.parse(cmd, start="command"),
+            lark_parser.parse(cmd, start="command"),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
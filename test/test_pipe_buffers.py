@@ -0,0 +1,149 @@
+import random
+import tempfile
+import unittest
+from functools import partial
+import applications
+import executors
+from application_interface import Lines
+from commands import Call
+from pipe_buffers import PipeBuffer, SortBuffer, counters
+
+
+class TestPipeBuffer(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _buffer(self, threshold):
+        return PipeBuffer(threshold=threshold, directory=self.directory.name)
+
+    def test_small_output_is_kept_in_memory(self):
+        buffer = self._buffer(1024)
+        buffer.extend([b"abc\n", Lines([b"de\n", b"f"])])
+        self.assertFalse(buffer.spilled)
+        self.assertEqual(
+            b"".join(map(bytes, buffer)), b"abc\nde\nf"
+            )
+
+    def test_large_output_is_spilled_and_read_back(self):
+        chunks = [f"line {i}\n".encode() for i in range(1000)]
+        spilled_bytes = counters["spilled_bytes"]
+        buffer = self._buffer(64)
+        buffer.extend(chunks[:500])
+        buffer.append(Lines(chunks[500:]))
+        self.assertTrue(buffer.spilled)
+        self.assertEqual(b"".join(buffer), b"".join(chunks))
+        self.assertEqual(
+            counters["spilled_bytes"] - spilled_bytes, len(b"".join(chunks))
+            )
+
+    def test_lines_are_counted_with_their_objects(self):
+        lines = Lines([b"%d\n" % i for i in range(1000)])
+        buffer = self._buffer(len(bytes(lines)) * 2)
+        buffer.append(lines)
+        self.assertTrue(buffer.spilled)
+        self.assertEqual(b"".join(buffer), bytes(lines))
+
+    def test_views_are_copied(self):
+        data = bytearray(b"abc\n")
+        buffer = self._buffer(0)
+        buffer.append(memoryview(data))
+        data[:] = b"xyz\n"
+        self.assertEqual(b"".join(map(bytes, buffer)), b"abc\n")
+
+    def test_threshold_of_zero_keeps_output_in_memory(self):
+        buffer = self._buffer(0)
+        buffer.extend([b"x" * 1024] * 64)
+        self.assertFalse(buffer.spilled)
+
+    def test_file_is_closed_once_read(self):
+        buffer = self._buffer(4)
+        buffer.extend([b"abc\n", b"def\n"])
+        self.assertTrue(buffer.spilled)
+        for chunk in buffer:
+            self.assertFalse(buffer.file.closed)
+        self.assertTrue(buffer.file.closed)
+
+    def test_file_is_closed_when_reader_stops(self):
+        buffer = self._buffer(4)
+        buffer.extend([b"abc\n"] * 100)
+        chunks = iter(buffer)
+        next(chunks)
+        chunks.close()
+        self.assertTrue(buffer.file.closed)
+
+
+class TestSpilledPipe(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.pipe_buffer = executors.PipeBuffer
+        executors.PipeBuffer = self._pipe_buffer
+
+    def tearDown(self):
+        executors.PipeBuffer = self.pipe_buffer
+        self.directory.cleanup()
+
+    def _pipe_buffer(self):
+        return PipeBuffer(threshold=16, directory=self.directory.name)
+
+    def test_long_pipe_spills_its_segments(self):
+        spilled_buffers = counters["spilled_buffers"]
+        calls = [
+            Call("echo abc def ghi jkl mno pqr"),
+            *[Call("cut -b 1-")] * (executors.STREAM_DEPTH * 2),
+            ]
+        output = b"".join(map(bytes, executors.sequential(calls)))
+        self.assertEqual(output, b"abc def ghi jkl mno pqr")
+        self.assertEqual(counters["spilled_buffers"] - spilled_buffers, 2)
+
+
+class TestSpilledSort(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.sort_buffer = applications.SortBuffer
+
+    def tearDown(self):
+        applications.SortBuffer = self.sort_buffer
+        self.directory.cleanup()
+
+    def _sort(self, data, args, threshold):
+        applications.SortBuffer = partial(
+            SortBuffer, threshold=threshold, directory=self.directory.name
+            )
+        chunks = [data[i:i + 7] for i in range(0, len(data), 7)]
+        return b"".join(map(bytes, applications.Sort().stream(args, chunks)))
+
+    def test_spilled_runs_are_merged(self):
+        generator = random.Random(11)
+        for _ in range(50):
+            lines = [
+                "".join(generator.choices("abAB", k=generator.randrange(5)))
+                for _ in range(generator.randrange(1, 60))
+                ]
+            data = "\n".join(lines).encode() + generator.choice([b"\n", b""])
+            for args in [[], ["-r"]]:
+                spilled_buffers = counters["spilled_buffers"]
+                self.assertEqual(
+                    self._sort(data, args, 256), self._sort(data, args, 0),
+                    (data, args),
+                    )
+                if len(lines) > 10:
+                    self.assertGreater(
+                        counters["spilled_buffers"], spilled_buffers
+                        )
+
+    def test_runs_are_closed_when_reader_stops(self):
+        buffer = SortBuffer(threshold=64, directory=self.directory.name)
+        for _ in range(10):
+            buffer.extend([b"b\n", b"a\n"])
+        runs = list(buffer.runs)
+        self.assertTrue(buffer.spilled)
+        lines = buffer.sorted()
+        self.assertEqual(next(lines), b"a\n")
+        lines.close()
+        self.assertTrue(all(run.closed for run in runs))
@@ -0,0 +1,157 @@
+import os
+import random
+import tempfile
+import unittest
+from commands import Call
+from executors import sequential
+from pipe_rewrites import RULES, rewrite
+
+
+def output(calls):
+    return b"".join(map(bytes, sequential(calls)))
+
+
+class TestPipeRewrites(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.files = []
+        generator = random.Random(7)
+        contents = ["", "a", "b\n", "ab\nb\nab\na\nb", "a\n\n\nb\n"]
+        for _ in range(40):
+            lines = [
+                "".join(generator.choices("aAb", k=generator.randrange(4)))
+                for _ in range(generator.randrange(1, 12))
+                ]
+            end = generator.choice(["\n", ""])
+            contents.append("\n".join(lines) + end)
+        for i, content in enumerate(contents):
+            file_name = os.path.join(self.directory.name, f"{i}.txt")
+            with open(file_name, "w") as f:
+                f.write(content)
+            self.files.append(file_name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _calls(self, pipe, file_name):
+        return [
+            Call(call.format(file=file_name)) for call in pipe.split(" | ")
+            ]
+
+    def assertEquivalent(self, pipe, rules):
+        for file_name in self.files:
+            calls = self._calls(pipe, file_name)
+            rewritten, rewrites = rewrite(calls, frozenset(RULES))
+            self.assertEqual(
+                [rule for rule, _, _ in rewrites], rules, pipe
+                )
+            self.assertEqual(
+                output(rewritten),
+                output(self._calls(pipe, file_name)),
+                (pipe, file_name),
+                )
+
+    def test_cat_file(self):
+        for app in [
+            "grep a", "head -n 2", "head", "tail -n 3", "cut -b 1-2",
+            "uniq", "uniq -i", "sort", "sort -r", "cat",
+        ]:
+            self.assertEquivalent(f"cat {{file}} | {app}", ["cat_file"])
+        for app in ["grep ''", "grep 'a*'", "grep '.*'"]:
+            self.assertEquivalent(f"cat {{file}} | {app}", [])
+
+    def test_sort_head(self):
+        for pipe in [
+            "sort {file} | head -n 3",
+            "sort -r {file} | head -n 1",
+            "sort {file} | head -n 0",
+            "sort {file} | head",
+            "head -n 100 {file} | sort | head -n 2",
+            "head -n 100 {file} | sort -r | head -n 4",
+        ]:
+            self.assertEquivalent(pipe, ["sort_head"])
+
+    def test_sort_uniq(self):
+        for pipe in [
+            "sort {file} | uniq",
+            "sort -r {file} | uniq",
+            "head -n 100 {file} | sort | uniq",
+            "head -n 100 {file} | sort -r | uniq",
+        ]:
+            self.assertEquivalent(pipe, ["sort_uniq"])
+
+    def test_sort_grep(self):
+        for pipe in [
+            "sort {file} | grep a",
+            "sort -r {file} | grep b",
+            "sort {file} | grep 'a*'",
+            "sort {file} | grep ''",
+            "head -n 100 {file} | sort | grep A",
+            "head -n 100 {file} | sort -r | grep 'a|b'",
+            "head -n 100 {file} | sort | grep 'b$'",
+        ]:
+            self.assertEquivalent(pipe, ["sort_grep"])
+
+    def test_rewrites_are_chained(self):
+        self.assertEquivalent(
+            "cat {file} | cat | sort | head -n 2",
+            ["cat_file", "cat_file", "sort_head"],
+            )
+        self.assertEquivalent(
+            "cat {file} | sort -r | uniq | head -n 2",
+            ["cat_file", "sort_uniq"],
+            )
+
+    def test_calls_which_differ_are_not_rewritten(self):
+        for pipe in [
+            "cat {file} {file} | grep a",
+            "cat ' {file}' | grep a",
+            "cat {file} > out.txt | grep a",
+            "cat `echo {file}` | grep a",
+            "cat {file} | grep",
+            "cat {file} | head -n x",
+            "cat {file} | _grep a",
+            "echo a | cat {file} | grep a",
+            "sort | head",
+            "sort {file} | head -n 1 {file}",
+            "sort {file} | uniq -i",
+            "sort {file} | grep a {file}",
+            "sort {file} > out.txt | uniq",
+            "head {file} | sort {file} | uniq",
+        ]:
+            _, rewrites = rewrite(self._calls(pipe, "a.txt"))
+            self.assertEqual(rewrites, [], pipe)
+
+    def test_errors_are_those_of_the_pipe(self):
+        missing = os.path.join(self.directory.name, "missing.txt")
+        for pipe in [
+            "cat {file} | grep a",
+            "sort {file} | head -n 2",
+            "sort {file} | uniq",
+            "sort {file} | grep a",
+        ]:
+            rewritten, _ = rewrite(self._calls(pipe, missing))
+            with self.assertRaises(FileNotFoundError):
+                output(rewritten)
+
+    def test_rules_can_be_switched_off(self):
+        calls = self._calls("cat {file} | sort | head", "a.txt")
+        rewritten, rewrites = rewrite(calls, frozenset())
+        self.assertEqual((rewritten, rewrites), (calls, []))
+        _, rewrites = rewrite(calls, frozenset(["sort_uniq"]))
+        self.assertEqual(rewrites, [])
+        _, rewrites = rewrite(calls, frozenset(["cat_file"]))
+        self.assertEqual(
+            rewrites, [("cat_file", "cat a.txt | sort", "sort a.txt")]
+            )
+
+    def test_rewrites_are_logged(self):
+        calls = self._calls("sort {file} | head -n 2", "a.txt")
+        with self.assertLogs("pipe_rewrites", "INFO") as logs:
+            rewrite(calls, frozenset(RULES))
+        self.assertEqual(
+            logs.output,
+            ["INFO:pipe_rewrites:sort_head: sort a.txt | head -n 2 -> "
+             "SortedHead(sort a.txt | head -n 2)"],
+            )
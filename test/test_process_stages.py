@@ -0,0 +1,118 @@
+import unittest
+import applications
+from commands import Invocation
+from process_stages import ProcessStage, Ring, read_chunks, write_chunks
+
+
+def upper(stdin):
+    for chunk in stdin:
+        yield chunk.upper()
+
+
+def numbers(count, stdin):
+    for i in range(count):
+        yield f"{i}\n".encode()
+
+
+def forever(stdin):
+    while True:
+        yield b"line\n"
+
+
+def failing(stdin):
+    yield b"partial\n"
+    raise FileNotFoundError("missing.txt")
+
+
+class TestRing(unittest.TestCase):
+
+    def setUp(self):
+        self.ring = Ring(slots=8, slot_size=16)
+
+    def tearDown(self):
+        self.ring.unlink()
+
+    def test_chunks_are_split_over_slots(self):
+        data = "héllo wörld, ".encode() * 3
+        write_chunks(self.ring, iter([data]))
+        self.assertEqual(b"".join(read_chunks(self.ring)), data)
+
+    def test_errors_are_read_back(self):
+        ring = Ring(slots=4, slot_size=1024)
+        self.addCleanup(ring.unlink)
+        write_chunks(ring, failing(None))
+        chunks = read_chunks(ring)
+        self.assertEqual(next(chunks), b"partial\n")
+        with self.assertRaises(FileNotFoundError):
+            next(chunks)
+
+    def test_full_ring_gives_up_once_reader_is_gone(self):
+        self.assertFalse(
+            write_chunks(self.ring, forever(None), alive=lambda: False)
+            )
+
+
+class TestProcessStage(unittest.TestCase):
+
+    def test_stage(self):
+        stage = ProcessStage(numbers, (3,), None)
+        self.assertEqual(b"".join(stage), b"0\n1\n2\n")
+        self.assertFalse(stage.process.is_alive())
+
+    def test_stage_reads_stdin(self):
+        stage = ProcessStage(upper, (), iter([b"abc\n", b"def\n"]))
+        self.assertEqual(b"".join(stage), b"ABC\nDEF\n")
+
+    def test_stage_reads_ring_of_stage(self):
+        first = ProcessStage(numbers, (10_000,), None)
+        second = ProcessStage(upper, (), first)
+        self.assertIs(second.upstream, first)
+        self.assertIsNone(second.input)
+        self.assertEqual(
+            b"".join(second),
+            "".join(f"{i}\n" for i in range(10_000)).encode(),
+            )
+
+    def test_errors_are_raised_by_the_reader(self):
+        stage = ProcessStage(upper, (), ProcessStage(failing, (), None))
+        with self.assertRaises(FileNotFoundError):
+            b"".join(stage)
+
+    def test_closed_stage_stops_its_workers(self):
+        first = ProcessStage(forever, (), None)
+        second = ProcessStage(upper, (), first)
+        chunks = iter(second)
+        self.assertTrue(next(chunks).startswith(b"LINE\n"))
+        chunks.close()
+        self.assertFalse(first.process.is_alive())
+        self.assertFalse(second.process.is_alive())
+
+    def test_process_applications(self):
+        process_applications = applications.PROCESS_APPLICATIONS
+        applications.PROCESS_APPLICATIONS = frozenset(["cut"])
+        try:
+            stage = applications.stream_application(
+                Invocation("cut -b 1", "cut", ["-b", "1"], None),
+                iter([b"abc\n", b"def\n"]),
+                )
+        finally:
+            applications.PROCESS_APPLICATIONS = process_applications
+        self.assertIs(type(stage), ProcessStage)
+        self.assertEqual(b"".join(stage), b"a\nd")
+
+    def test_stage_read_by_unsupported_application_is_closed(self):
+        process_applications = applications.PROCESS_APPLICATIONS
+        applications.PROCESS_APPLICATIONS = frozenset(["cut"])
+        try:
+            stage = applications.stream_application(
+                Invocation("cut -b 1", "cut", ["-b", "1"], None),
+                iter([b"abc\n"]),
+                )
+            output = applications.stream_application(
+                Invocation("_foo x", "_foo", ["x"], None), stage
+                )
+        finally:
+            applications.PROCESS_APPLICATIONS = process_applications
+        self.assertEqual(b"".join(output), b"Unsupported Application: foo\n")
+        self.assertTrue(stage.closed.is_set())
+        self.assertFalse(stage.process.is_alive())
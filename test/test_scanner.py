@@ -0,0 +1,77 @@
+import random
+import unittest
+from command_evaluator import lark_parse, parse
+from commands import Background, Pipe, Seq
+from scanner import is_unquoted, scan
+
+
+def _describe(command):
+    if type(command) is Seq:
+        return ("seq", tuple(_describe(c) for c in command.commands))
+    if type(command) is Pipe:
+        return ("pipe", tuple(_describe(c) for c in command.calls))
+    if type(command) is Background:
+        return ("background", _describe(command.command))
+    return ("call", command.raw_command, command.plan)
+
+
+def _random_lines(number, seed=0):
+    pieces = [
+        "echo", "cat", "a", "file.txt", "*.txt", "dir/*", "-n", " ", "  ",
+        "\t", ";", "&", "|", "<", ">", "\n", "\r", "x<", ">y",
+    ]
+    rand = random.Random(seed)
+    for _ in range(number):
+        yield "".join(rand.choice(pieces) for _ in range(rand.randint(0, 12)))
+
+
+class TestScanner(unittest.TestCase):
+    def assertScansLikeParser(self, text, start="command"):
+        scanned = scan(text, start)
+        parsed = lark_parse(text, start)
+        if start == "call" or not parsed:
+            self.assertEqual(scanned, parsed, repr(text))
+        else:
+            self.assertEqual(_describe(scanned), _describe(parsed), repr(text))
+
+    def test_simple_lines(self):
+        for text in [
+            "echo foo",
+            "  cat a.txt b.txt > out.txt ",
+            "< in.txt sort | uniq | head -n 2; echo *.txt",
+            "cat <in.txt >out.txt x",
+            "",
+            " ; ;",
+            "| echo",
+            "find . -name x > found.txt & sort a.txt &",
+            "sort a.txt | uniq & echo a; echo b &",
+        ]:
+            self.assertScansLikeParser(text)
+
+    def test_invalid_lines(self):
+        for text in [
+            "echo a>b", "echo a >> b", "< in.txt", "echo\na", "&", "a && b",
+            "a; & b",
+        ]:
+            self.assertFalse(scan(text))
+            self.assertScansLikeParser(text)
+
+    def test_calls(self):
+        for text in ["echo foo", "", "< f cat > g", "echo a | b", "echo a>b"]:
+            self.assertScansLikeParser(text, start="call")
+
+    def test_differential(self):
+        for text in _random_lines(5000):
+            self.assertScansLikeParser(text)
+            self.assertScansLikeParser(text, start="call")
+
+    def test_quoted_lines_are_parsed(self):
+        self.assertFalse(is_unquoted("echo 'a'"))
+        self.assertFalse(is_unquoted('echo "a"'))
+        self.assertFalse(is_unquoted("echo `echo a`"))
+        text = "echo 'a|b' | cut -b 1"
+        self.assertEqual(_describe(parse(text)), _describe(lark_parse(text)))
+
+
+if __name__ == "__main__":
+    unittest.main()
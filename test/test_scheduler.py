@@ -0,0 +1,137 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from collections import deque
+import session
+from command_evaluator import parse
+from scheduler import NO_EFFECTS, Effects, batches, effects, scheduled
+
+SHELL = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "src", "shell.py"
+    )
+
+
+class TestScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.realpath(self.directory.name)
+        os.mkdir(os.path.join(self.path, "d"))
+        for name, content in [
+            ("big1", "A\nB\nAB\n"), ("big2", "B\nb\n"), ("big3", "c\na\nb\n"),
+            ("d/f", "f\n"),
+        ]:
+            with open(os.path.join(self.path, name), "w") as f:
+                f.write(content)
+        self.session = session.Session(self.path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _paths(self, *names):
+        return tuple(os.path.join(self.path, name) for name in names)
+
+    def _batches(self, cmdline):
+        with session.using(self.session):
+            return [
+                [command.raw_command for command, _ in batch]
+                for batch in batches(parse(cmdline).commands)
+            ]
+
+    def _run(self, cmdline, executor):
+        out = deque()
+        with session.using(session.Session(self.path)):
+            if executor == "sequential":
+                parse(cmdline).eval(out)
+            else:
+                scheduled(parse(cmdline).commands, out, executor)
+        return "".join(out)
+
+    def test_effects(self):
+        with session.using(self.session):
+            for cmdline, expected in [
+                ("grep A big1 > out", Effects(self._paths("big1"),
+                                              self._paths("out"))),
+                ("cat d/../big1 | sort -r | head -n 2 > d/out",
+                 Effects(self._paths("big1"), self._paths("d/out"))),
+                ("sort < big3", Effects(self._paths("big3"), ())),
+                ("find d -name '*'", Effects(self._paths("d"), ())),
+                ("find -name f", Effects((self.path,), ())),
+                ("ls", Effects((self.path,), ())),
+                ("_uniq -i big2", Effects(self._paths("big2"), ())),
+                ("echo a", NO_EFFECTS),
+                ("echo a | cut -b 1 > out", Effects((), self._paths("out"))),
+            ]:
+                (command,) = parse(cmdline).commands
+                self.assertEqual(effects(command), expected, cmdline)
+            for cmdline in [
+                "cd d", "cat *", "cat `echo big1`", "echo a > `echo out`",
+                "exit", "wait", "foo big1", "cat big1 | cd d",
+                "sort big1 &", "explain cat big1",
+            ]:
+                command = parse(cmdline).commands[0]
+                self.assertIsNone(effects(command), cmdline)
+
+    def test_batches(self):
+        self.assertEqual(
+            self._batches("grep A big1; grep B big2; sort big3 > out"),
+            [["grep A big1", "grep B big2"], ["sort big3 > out"]],
+            )
+        self.assertEqual(
+            self._batches("sort big3 > out; grep A big1; echo a; cat out"),
+            [["sort big3 > out", "grep A big1", "echo a"], ["cat out"]],
+            )
+        self.assertEqual(
+            self._batches("echo a > d/g; cat big1; find d -name g; ls"),
+            [["echo a > d/g", "cat big1"], ["find d -name g", "ls"]],
+            )
+        self.assertEqual(
+            self._batches("cat big1; cd d; cat f; cat big2 *"),
+            [["cat big1"], ["cd d"], ["cat f"], ["cat big2 *"]],
+            )
+
+    def test_output_is_in_order(self):
+        for cmdline in [
+            "grep A big1; grep B big2; sort big3 > out; cat out",
+            "echo a; cat big1 | uniq; echo b > d/g; cat d/g; find d -name g",
+            "cat big3; cd d; cat f; sort ../big3; cd ..; ls d",
+            "_cat missing; sort -r big1; echo c",
+            "cat big2; cat big1; cat big3; cat big2 | head -n 1",
+        ]:
+            expected = self._run(cmdline, "sequential")
+            for executor in ["threaded", "processes"]:
+                self.assertEqual(
+                    self._run(cmdline, executor), expected,
+                    (cmdline, executor)
+                    )
+
+    def test_errors_stop_the_sequence(self):
+        for executor in ["threaded", "processes"]:
+            out = deque()
+            with session.using(session.Session(self.path)):
+                commands = parse(
+                    "echo a; cat missing; cat big2; echo b > out"
+                    ).commands
+                with self.assertRaises(FileNotFoundError):
+                    scheduled(commands, out, executor)
+            self.assertEqual("".join(out), "a\n")
+            self.assertFalse(os.path.exists(self._paths("out")[0]))
+
+    def test_shell(self):
+        cmdline = "grep A big1; grep B big2; sort big3 > out; cat out big2"
+        outputs = [
+            subprocess.run(
+                [sys.executable, SHELL, "-c", cmdline],
+                cwd=self.path,
+                env=dict(os.environ, PYSHELL_SEQ_EXECUTOR=executor),
+                capture_output=True,
+                ).stdout
+            for executor in ["sequential", "threaded", "processes"]
+        ]
+        self.assertEqual(outputs, [b"A\nABBa\nb\nc\nB\nb\n"] * 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
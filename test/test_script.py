@@ -0,0 +1,130 @@
+import io
+import os
+import pickle
+import unittest
+import subprocess
+from collections import deque
+import script
+from script import compile_script
+
+
+class TestCompileScript(unittest.TestCase):
+    def setUp(self):
+        p = subprocess.run(["mkdir", "unittests"], stdout=subprocess.DEVNULL)
+        if p.returncode != 0:
+            print("error: failed to create unittest directory")
+            exit(1)
+        self.cache_dir = os.path.join("unittests", "cache")
+        self.script = "\n".join(
+            [
+                "#!/comp0010/sh",
+                "echo foo | cut -b 1",
+                "",
+                "   # indented comment",
+                "echo 'bar'; echo `echo baz`",
+                "echo '",
+            ]
+        )
+
+    def tearDown(self):
+        p = subprocess.run(
+            ["rm", "-r", "unittests"], stdout=subprocess.DEVNULL
+            )
+        if p.returncode != 0:
+            print("error: failed to remove unittests directory")
+            exit(1)
+
+    def _eval(self, compiled):
+        out = deque()
+        for cmdline, seq in compiled:
+            if seq:
+                seq.eval(out)
+            else:
+                out.append(f"unrecognized {cmdline}")
+        return list(out)
+
+    def test_compile_script(self):
+        compiled, cached = compile_script(self.script, "")
+        self.assertFalse(cached)
+        self.assertEqual(
+            [cmdline for cmdline, _ in compiled],
+            [
+                "echo foo | cut -b 1",
+                "echo 'bar'; echo `echo baz`",
+                "echo '",
+            ],
+        )
+        self.assertEqual(
+            self._eval(compiled),
+            ["f", "bar\n", "baz\n", "unrecognized echo '"],
+            )
+
+    def test_compiled_script_is_cached(self):
+        compiled, cached = compile_script(self.script, self.cache_dir)
+        self.assertFalse(cached)
+        self.assertEqual(len(os.listdir(self.cache_dir + "/scripts")), 1)
+
+        cached_compiled, cached = compile_script(self.script, self.cache_dir)
+        self.assertTrue(cached)
+        self.assertEqual(self._eval(cached_compiled), self._eval(compiled))
+
+    def test_changed_script_is_compiled(self):
+        compile_script(self.script, self.cache_dir)
+        compiled, cached = compile_script(
+            self.script + "\necho new", self.cache_dir
+            )
+        self.assertFalse(cached)
+        self.assertEqual(compiled[-1][0], "echo new")
+        self.assertEqual(len(os.listdir(self.cache_dir + "/scripts")), 2)
+
+    def test_corrupt_cache_is_recompiled(self):
+        compile_script(self.script, self.cache_dir)
+        scripts = os.path.join(self.cache_dir, "scripts")
+        cache_file = os.path.join(scripts, os.listdir(scripts)[0])
+        with open(cache_file, "wb") as f:
+            f.write(b"not a script")
+        compiled, cached = compile_script(self.script, self.cache_dir)
+        self.assertFalse(cached)
+        self.assertEqual(len(compiled), 3)
+
+    def test_cache_is_keyed_by_the_modules_of_its_commands(self):
+        modules = set()
+
+        class Pickler(pickle.Pickler):
+            def persistent_id(self, obj):
+                if not isinstance(obj, type):
+                    obj = type(obj)
+                modules.add(obj.__module__)
+
+        compiled, _ = compile_script(
+            self.script + "\nsort a & echo b | cat > c\nexplain cat a",
+            "",
+            )
+        Pickler(io.BytesIO()).dump(compiled)
+        keyed = {module[:-3] for module in script.COMPILED_MODULES}
+        self.assertLessEqual(modules - {"builtins"}, keyed)
+        self.assertIn("explain", modules)
+
+    def test_least_recently_used_scripts_are_removed(self):
+        cached_scripts = script.CACHED_SCRIPTS
+        script.CACHED_SCRIPTS = 2
+        try:
+            names = []
+            for i in range(2):
+                compile_script(f"echo {i}", self.cache_dir)
+                cache_file = script._cache_file(f"echo {i}", self.cache_dir)
+                os.utime(cache_file, (1000 + i, 1000 + i))
+                names.append(os.path.basename(cache_file))
+            _, cached = compile_script("echo 0", self.cache_dir)
+            self.assertTrue(cached)
+            compile_script("echo 2", self.cache_dir)
+        finally:
+            script.CACHED_SCRIPTS = cached_scripts
+        kept = os.listdir(os.path.join(self.cache_dir, "scripts"))
+        self.assertEqual(len(kept), 2)
+        self.assertIn(names[0], kept)
+        self.assertNotIn(names[1], kept)
+
+
+if __name__ == "__main__":
+    unittest.main()
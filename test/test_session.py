@@ -0,0 +1,125 @@
+import os
+import pickle
+import tempfile
+import threading
+import unittest
+from collections import deque
+import session
+from autocomplete import APPLICATIONS, Completer
+from command_evaluator import compile_command_line
+from commands import Call
+from executors import processes, threaded
+
+
+def evaluate(cmdline):
+    out = deque()
+    compile_command_line(cmdline).eval(out)
+    return "".join(out)
+
+
+class TestSession(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.realpath(self.directory.name)
+        for name in ["a", "b[1]"]:
+            os.mkdir(os.path.join(self.path, name))
+            with open(os.path.join(self.path, name, "x.txt"), "w") as f:
+                f.write(f"{name}\n")
+        self.session = session.Session(os.path.join(self.path, "a"))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_commands_run_in_the_session(self):
+        cwd = os.getcwd()
+        with session.using(self.session):
+            self.assertEqual(evaluate("pwd"), f"{self.path}/a\n")
+            self.assertEqual(evaluate("cat x.txt; ls"), "a\nx.txt\n")
+            evaluate("echo y > y.txt; cd ..")
+            self.assertEqual(evaluate("cat a/y*"), "y\n")
+            self.assertEqual(self.session.cwd, self.path)
+            self.assertEqual(
+                evaluate("find a -name '*.txt' | sort"),
+                "a/x.txt\na/y.txt",
+                )
+        self.assertEqual(os.getcwd(), cwd)
+        self.assertNotEqual(session.current(), self.session)
+
+    def test_cd(self):
+        self.session.chdir("../b[1]")
+        self.assertEqual(self.session.cwd, f"{self.path}/b[1]")
+        self.assertEqual(self.session.glob("*.txt"), ["x.txt"])
+        self.assertEqual(self.session.glob(f"{self.path}/a/*"),
+                         [f"{self.path}/a/x.txt"])
+        with self.assertRaises(FileNotFoundError):
+            self.session.chdir("missing")
+        with self.assertRaises(NotADirectoryError):
+            self.session.chdir("x.txt")
+        self.assertEqual(self.session.cwd, f"{self.path}/b[1]")
+
+    def test_files_are_opened_in_the_directory(self):
+        with self.session.open("x.txt") as f:
+            self.assertEqual(f.read(), "a\n")
+        if session.DIR_FD:
+            os.rename(os.path.join(self.path, "a"),
+                      os.path.join(self.path, "c"))
+            with self.session.open("x.txt") as f:
+                self.assertEqual(f.read(), "a\n")
+
+    def test_sessions_run_side_by_side(self):
+        sessions = [
+            session.Session(os.path.join(self.path, name))
+            for name in ["a", "b[1]"]
+        ]
+        outputs = {}
+
+        def run(current):
+            with session.using(current):
+                outputs[current.cwd] = [
+                    evaluate("cat x.txt | uniq; cd .; cat *.txt")
+                    for _ in range(50)
+                ]
+
+        threads = [
+            threading.Thread(target=run, args=(current,))
+            for current in sessions
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(outputs[f"{self.path}/a"], ["a\na\n"] * 50)
+        self.assertEqual(outputs[f"{self.path}/b[1]"], ["b[1]\nb[1]\n"] * 50)
+
+    def test_pipes_run_in_the_session(self):
+        calls = [Call("cat x.txt"), Call("sort"), Call("uniq")]
+        with session.using(self.session):
+            for executor in [threaded, processes]:
+                self.assertEqual(
+                    b"".join(map(bytes, executor(calls))), b"a\n"
+                    )
+
+    def test_jobs_run_in_a_copy_of_the_session(self):
+        with session.using(self.session):
+            self.assertEqual(evaluate("cd .. & wait; pwd"),
+                             f"{self.path}/a\n")
+            self.assertEqual(self.session.cwd, f"{self.path}/a")
+            self.assertEqual(evaluate("cd ..; pwd & wait"), f"{self.path}\n")
+
+    def test_sessions_are_pickled_with_their_path(self):
+        copy = pickle.loads(pickle.dumps(self.session))
+        self.assertEqual(copy.cwd, self.session.cwd)
+        self.assertIsNot(copy.directory, self.session.directory)
+
+    def test_autocomplete(self):
+        completer = Completer(APPLICATIONS.keys())
+        with session.using(self.session):
+            self.assertEqual(
+                completer.autocomplete_files_and_folders(["cat", "x"], "x", 0),
+                "x.txt",
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,11 @@
+import os
 import subprocess
+import sys
 import unittest
+from io import StringIO
+from contextlib import redirect_stdout
 from collections import deque
-from shell import eval as shell_evaluator
+from shell import eval as shell_evaluator, run_script
 
 
 class TestShell(unittest.TestCase):
@@ -56,6 +60,34 @@ class TestShell(unittest.TestCase):
         self.assertEqual(out.popleft(), "Unrecognized Input: echo '''\n")
         self.assertEqual(len(out), 0)
 
+    def test_run_script(self):
+        with open("unittests/script.psh", "w") as f:
+            f.write("# a comment\n\necho foo\necho '\necho bar\n")
+        stdout = StringIO()
+        with redirect_stdout(stdout):
+            run_script("unittests/script.psh", cache_dir="")
+        self.assertEqual(
+            stdout.getvalue(), "foo\nUnrecognized Input: echo '\nbar\n"
+            )
+
+    def test_scripts_wait_for_their_jobs(self):
+        with open("unittests/script.psh", "w") as f:
+            f.write("cat unittests/test2.txt &\necho foo &\necho bar\n")
+        stdout = StringIO()
+        with redirect_stdout(stdout):
+            run_script("unittests/script.psh", cache_dir="")
+        self.assertEqual(stdout.getvalue(), "bar\nBBB\nfoo\n")
+
+    def test_c_without_a_command_line(self):
+        shell = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "..", "src", "shell.py"
+            )
+        p = subprocess.run([sys.executable, shell, "-c"], capture_output=True)
+        self.assertNotEqual(p.returncode, 0)
+        self.assertIn(
+            b"ValueError: wrong number of command line arguments", p.stderr
+            )
+
 
 if __name__ == "__main__":
     unittest.main()